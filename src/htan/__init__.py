@@ -14,3 +14,18 @@ Optional modules (require extras):
 """
 
 __version__ = "0.2.0"
+
+# Submodules are imported on first attribute access (``htan.pubs``), so a
+# bare ``import htan`` stays cheap.
+_SUBMODULES = ("config", "pubs", "model", "files", "init", "query", "download")
+
+__all__ = ["__version__", *_SUBMODULES]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        import importlib
+        module = importlib.import_module(f"htan.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,28 @@
+"""JSON helpers that use orjson when installed (pip install htan[fast]), else the stdlib."""
+
+import json
+
+# Resolved once: a failed import is not cached by Python, so retrying it per
+# call would rescan sys.path every time on a default install
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Decode JSON str or bytes with orjson when installed, else the stdlib."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def dumps_indented(obj):
+    """Encode obj as 2-space indented JSON, with orjson when installed.
+
+    Non-ASCII text is written as-is on both paths so output does not depend
+    on whether the fast extra is installed.
+    """
+    if orjson is None:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
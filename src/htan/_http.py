@@ -0,0 +1,91 @@
+"""Keep-alive HTTPS client shared by htan.pubs and htan.query.portal (stdlib only).
+
+Each thread keeps one open connection per host:port, so back-to-back
+requests to the same service skip the TCP+TLS handshake.
+"""
+
+import functools
+import http.client
+import ssl
+import threading
+import urllib.parse
+import urllib.request
+
+# Default ports by proxy URL scheme, for proxies configured without one
+_PROXY_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_CONNECTIONS = threading.local()
+
+
+@functools.cache
+def make_ssl_context():
+    """Create an SSL context, trying certifi first. Built once per process."""
+    try:
+        import certifi
+        return ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        return ssl.create_default_context()
+
+
+def _proxy_address(proxy):
+    """Return (host, port) for an https proxy URL, defaulting the port by scheme."""
+    proxy_url = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    return proxy_url.hostname, proxy_url.port or _PROXY_DEFAULT_PORTS.get(proxy_url.scheme, 80)
+
+
+def _new_connection(netloc, timeout):
+    host = urllib.parse.urlsplit(f"//{netloc}").hostname
+    proxy = urllib.request.getproxies().get("https")
+    if proxy and not urllib.request.proxy_bypass(host):
+        proxy_host, proxy_port = _proxy_address(proxy)
+        conn = http.client.HTTPSConnection(proxy_host, proxy_port,
+                                           timeout=timeout, context=make_ssl_context())
+        conn.set_tunnel(netloc)
+        return conn
+    return http.client.HTTPSConnection(netloc, timeout=timeout, context=make_ssl_context())
+
+
+def _get_connection(netloc, timeout):
+    pool = getattr(_CONNECTIONS, "pool", None)
+    if pool is None:
+        pool = _CONNECTIONS.pool = {}
+    conn = pool.get(netloc)
+    if conn is None:
+        conn = pool[netloc] = _new_connection(netloc, timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def drop_connection(netloc):
+    """Close and forget this thread's connection to netloc, if any."""
+    conn = getattr(_CONNECTIONS, "pool", {}).pop(netloc, None)
+    if conn is not None:
+        conn.close()
+
+
+def request(method, netloc, path, body=None, headers=None, timeout=60):
+    """Send one HTTPS request; returns (status, reason, headers, body bytes).
+
+    A kept-alive socket the server already closed fails on first use, so a
+    request that dies before any response is retried once on a fresh connection.
+    The body is returned as received; callers handle any Content-Encoding.
+    """
+    for attempt in range(2):
+        conn = _get_connection(netloc, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            drop_connection(netloc)
+            if attempt:
+                raise
+            continue
+        except Exception:
+            drop_connection(netloc)
+            raise
+        if response.will_close:
+            drop_connection(netloc)
+        return response.status, response.reason, response.headers, data
@@ -96,9 +96,6 @@ def _dispatch_download(args):
 
 
 def _dispatch_config(args):
-    import json
-    from htan.config import check_setup
-
     if args and args[0] in ("-h", "--help"):
         print("Usage: htan config check")
         print("       htan config init-portal")
@@ -107,6 +104,9 @@ def _dispatch_config(args):
     command = args[0] if args else "check"
 
     if command == "check":
+        import json
+        from htan.config import check_setup
+
         status = check_setup()
         print(json.dumps({"ok": True, "status": status}, indent=2))
     elif command == "init-portal":
@@ -8,9 +8,9 @@
 Also provides setup status checks for all HTAN services.
 """
 
+import functools
 import json
 import os
-import platform
 import shutil
 import subprocess
 import sys
@@ -19,6 +19,7 @@ CONFIG_DIR = os.path.expanduser("~/.config/htan-skill")
 CONFIG_PATH = os.path.join(CONFIG_DIR, "portal.json")
 
 REQUIRED_KEYS = ("host", "port", "user", "password")
+_REQUIRED_KEY_SET = frozenset(REQUIRED_KEYS)
 
 KEYCHAIN_SERVICE = "htan-portal"
 KEYCHAIN_ACCOUNT = "htan"
@@ -35,8 +36,20 @@ class ConfigError(Exception):
     pass
 
 
+def _exists(path):
+    """Return True if ``path`` exists, using a single ``stat`` call."""
+    try:
+        os.stat(path)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
 def _validate_config(cfg):
     """Validate that a config dict has all required keys. Returns list of missing keys."""
+    # Common case: one C-level subset check against the dict's key view
+    if isinstance(cfg, dict) and cfg.keys() >= _REQUIRED_KEY_SET:
+        return []
     return [k for k in REQUIRED_KEYS if k not in cfg]
 
 
@@ -50,21 +63,37 @@ def _load_from_env():
     if not raw:
         return None
     try:
-        cfg = json.loads(raw)
-        if _validate_config(cfg):
+        cfg = _parse_env_json(raw)
+        if not isinstance(cfg, dict) or _validate_config(cfg):
             return None
-        return cfg
+        return dict(cfg)
     except (json.JSONDecodeError, TypeError):
         return None
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_env_json(raw):
+    """Parse the HTAN_PORTAL_CREDENTIALS value, memoized on the raw string.
+
+    Callers must not mutate the result; _load_from_env hands out a copy.
+    """
+    return json.loads(raw)
+
+
+@functools.cache
+def _system():
+    """Return ``platform.system()``, computed once per process."""
+    import platform
+    return platform.system()
+
+
 def _load_from_keychain():
     """Load credentials from OS keychain (macOS `security` / Linux `secret-tool`).
 
     Returns:
         Dict with credentials, or None if not found or unsupported platform.
     """
-    system = platform.system()
+    system = _system()
     try:
         if system == "Darwin":
             result = subprocess.run(
@@ -105,8 +134,6 @@ def _load_from_file(config_path=None):
         Dict with credentials, or None if file missing or invalid.
     """
     path = config_path or CONFIG_PATH
-    if not os.path.exists(path):
-        return None
     try:
         with open(path, "r") as f:
             cfg = json.load(f)
@@ -126,7 +153,7 @@ def save_to_keychain(creds):
     Returns:
         True if stored successfully, False otherwise.
     """
-    system = platform.system()
+    system = _system()
     creds_json = json.dumps(creds)
     try:
         if system == "Darwin":
@@ -241,64 +268,76 @@ def get_default_database(cfg):
     return db
 
 
-def check_setup():
-    """Check the status of all HTAN credential configurations.
-
-    Returns:
-        Dict with status for each service (synapse, portal, gen3, bigquery, uv, python).
-    """
-    status = {}
+# The check_* helpers only stat a default credential path when the env var
+# does not already satisfy auth, since "method" reports the env var first.
 
-    # Synapse
-    has_synapse_env = bool(os.environ.get("SYNAPSE_AUTH_TOKEN"))
-    has_synapse_config = os.path.exists(SYNAPSE_CONFIG_PATH)
-    status["synapse"] = {
-        "configured": has_synapse_env or has_synapse_config,
+def check_synapse():
+    """Return Synapse credential status: {"configured", "method"}."""
+    has_env = bool(os.environ.get("SYNAPSE_AUTH_TOKEN"))
+    has_config = not has_env and _exists(SYNAPSE_CONFIG_PATH)
+    return {
+        "configured": has_env or has_config,
         "method": (
             "SYNAPSE_AUTH_TOKEN"
-            if has_synapse_env
-            else ("~/.synapseConfig" if has_synapse_config else None)
+            if has_env
+            else ("~/.synapseConfig" if has_config else None)
         ),
     }
 
-    # Portal — check all 3 tiers (env, keychain, file)
-    portal_source = detect_source()
-    status["portal"] = {
-        "configured": portal_source is not None,
-        "source": portal_source,
-        "path": CONFIG_PATH if portal_source == "file" else None,
+
+def check_portal():
+    """Return portal credential status across all 3 tiers (env, keychain, file)."""
+    source = detect_source()
+    return {
+        "configured": source is not None,
+        "source": source,
+        "path": CONFIG_PATH if source == "file" else None,
     }
 
-    # Gen3
-    has_gen3_env = bool(
-        os.environ.get("GEN3_API_KEY")
-        and os.path.exists(os.environ.get("GEN3_API_KEY", ""))
-    )
-    has_gen3_config = os.path.exists(GEN3_CREDS_PATH)
-    status["gen3"] = {
-        "configured": has_gen3_env or has_gen3_config,
+
+def check_gen3():
+    """Return Gen3 credential status: {"configured", "method"}."""
+    env_path = os.environ.get("GEN3_API_KEY")
+    has_env = bool(env_path and _exists(env_path))
+    has_config = not has_env and _exists(GEN3_CREDS_PATH)
+    return {
+        "configured": has_env or has_config,
         "method": (
             "GEN3_API_KEY"
-            if has_gen3_env
-            else ("~/.gen3/credentials.json" if has_gen3_config else None)
+            if has_env
+            else ("~/.gen3/credentials.json" if has_config else None)
         ),
     }
 
-    # BigQuery
-    has_bq_sa = bool(
-        os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-        and os.path.exists(os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", ""))
-    )
-    has_bq_adc = os.path.exists(BIGQUERY_ADC_PATH)
-    status["bigquery"] = {
-        "configured": has_bq_sa or has_bq_adc,
+
+def check_bigquery():
+    """Return BigQuery credential status: {"configured", "method"}."""
+    sa_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    has_sa = bool(sa_path and _exists(sa_path))
+    has_adc = not has_sa and _exists(BIGQUERY_ADC_PATH)
+    return {
+        "configured": has_sa or has_adc,
         "method": (
             "GOOGLE_APPLICATION_CREDENTIALS"
-            if has_bq_sa
-            else ("application_default_credentials" if has_bq_adc else None)
+            if has_sa
+            else ("application_default_credentials" if has_adc else None)
         ),
     }
 
+
+def check_setup():
+    """Check the status of all HTAN credential configurations.
+
+    Returns:
+        Dict with status for each service (synapse, portal, gen3, bigquery, uv, python).
+    """
+    status = {
+        "synapse": check_synapse(),
+        "portal": check_portal(),
+        "gen3": check_gen3(),
+        "bigquery": check_bigquery(),
+    }
+
     # uv
     uv_path = shutil.which("uv")
     status["uv"] = {"available": uv_path is not None, "path": uv_path}
@@ -17,25 +17,53 @@ import json
 import os
 import re
 import sys
+import urllib.error
 import urllib.request
 
 
 GEN3_ENDPOINT = "https://nci-crdc.datacommons.io"
-DRS_URI_PATTERN = re.compile(r"^drs://(dg\.4DFC|nci-crdc\.datacommons\.io/dg\.4DFC)/[a-zA-Z0-9._/\-]+$")
-GUID_PATTERN = re.compile(r"^[a-zA-Z0-9._/\-]+$")
+
+# Validation regexes are compiled on first use rather than at import, so
+# `--help` and other paths that never validate a URI skip the compile.
+# DRS_URI_PATTERN and GUID_PATTERN remain importable via __getattr__.
+_PATTERN_SOURCES = {
+    "DRS_URI_PATTERN": r"^drs://(dg\.4DFC|nci-crdc\.datacommons\.io/dg\.4DFC)/[a-zA-Z0-9._/\-]+$",
+    "GUID_PATTERN": r"^[a-zA-Z0-9._/\-]+$",
+}
+
+
+def _pattern(name):
+    pattern = globals().get(name)
+    if pattern is None:
+        pattern = globals()[name] = re.compile(_PATTERN_SOURCES[name])
+    return pattern
+
+
+def __getattr__(name):
+    if name in _PATTERN_SOURCES:
+        return _pattern(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _validate_drs_uri(uri):
-    if not DRS_URI_PATTERN.match(uri):
+    if not _pattern("DRS_URI_PATTERN").match(uri):
         raise ValueError(f"Invalid DRS URI '{uri}'. Expected format: drs://dg.4DFC/<guid>")
     return uri
 
 
 def _extract_guid(drs_uri):
+    guid = drs_uri
     for prefix in ("drs://nci-crdc.datacommons.io/dg.4DFC/", "drs://dg.4DFC/"):
         if drs_uri.startswith(prefix):
-            return drs_uri[len(prefix):]
-    return drs_uri
+            guid = drs_uri[len(prefix):]
+            break
+    if not _pattern("GUID_PATTERN").match(guid):
+        raise ValueError(f"Invalid GUID '{guid}'. Must match {_PATTERN_SOURCES['GUID_PATTERN']}")
+    # The GUID becomes the local filename, so '.', '..' and empty segments
+    # (which GUID_PATTERN and DRS_URI_PATTERN both accept) are rejected here
+    if any(segment in ("", ".", "..") for segment in guid.split("/")):
+        raise ValueError(f"Invalid GUID '{guid}'. Path segments may not be empty, '.' or '..'")
+    return guid
 
 
 def _find_credentials():
@@ -107,6 +135,9 @@ def resolve(drs_uri, credentials=None, protocol="s3"):
 def download(drs_uri, output_dir=".", credentials=None, protocol="s3", dry_run=False):
     """Download a file by DRS URI.
 
+    Interrupted downloads leave a ``<name>.part`` file behind; the next call
+    resumes from it with an HTTP Range request.
+
     Args:
         drs_uri: DRS URI (e.g., "drs://dg.4DFC/guid-here").
         output_dir: Directory to download to.
@@ -139,14 +170,28 @@ def download(drs_uri, output_dir=".", credentials=None, protocol="s3", dry_run=F
         print(f"Skipping (already exists): {output_path}", file=sys.stderr)
         return output_path
 
-    print(f"Downloading to {output_path}...", file=sys.stderr)
+    # Download into a .part file so an interrupted transfer can be resumed
+    # with an HTTP Range request instead of restarting from byte 0.
+    partial_path = output_path + ".part"
+    existing = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+
+    if existing:
+        print(f"Resuming download at byte {existing:,}: {output_path}", file=sys.stderr)
+    else:
+        print(f"Downloading to {output_path}...", file=sys.stderr)
     try:
-        req = urllib.request.Request(signed_url)
-        with urllib.request.urlopen(req) as response:
+        response = _open_download(signed_url, existing)
+        with response:
+            if response.status == 206:
+                mode = "ab"
+                downloaded = existing
+            else:
+                # Server ignored the Range header — start over
+                mode = "wb"
+                downloaded = 0
             total_size = response.headers.get("Content-Length")
-            total_size = int(total_size) if total_size else None
-            downloaded = 0
-            with open(output_path, "wb") as f:
+            total_size = int(total_size) + downloaded if total_size else None
+            with open(partial_path, mode) as f:
                 while True:
                     chunk = response.read(8192)
                     if not chunk:
@@ -159,15 +204,35 @@ def download(drs_uri, output_dir=".", credentials=None, protocol="s3", dry_run=F
                     else:
                         print(f"\r  {downloaded:,} bytes", end="", file=sys.stderr)
             print(file=sys.stderr)
+        os.replace(partial_path, output_path)
         print(f"Downloaded: {output_path}", file=sys.stderr)
         return output_path
     except Exception as e:
         print(f"\nError: Download failed: {e}", file=sys.stderr)
-        if os.path.exists(output_path):
-            os.remove(output_path)
+        if os.path.exists(partial_path):
+            print(f"Partial download kept for resume: {partial_path}", file=sys.stderr)
         sys.exit(1)
 
 
+def _open_download(url, offset=0):
+    """Open a download URL, requesting bytes from ``offset`` onward if nonzero.
+
+    Returns the open response. A 206 status means the server honored the
+    Range request; a 200 status means the full body is being sent.
+    """
+    req = urllib.request.Request(url)
+    if offset:
+        req.add_header("Range", f"bytes={offset}-")
+    try:
+        return urllib.request.urlopen(req)
+    except urllib.error.HTTPError as e:
+        # 416: the partial file is not a valid prefix (e.g. object changed
+        # or already complete) — discard the offset and fetch everything.
+        if e.code == 416 and offset:
+            return urllib.request.urlopen(urllib.request.Request(url))
+        raise
+
+
 # --- CLI ---
 
 def cli_main(argv=None):
@@ -3,7 +3,9 @@
 Downloads and caches the DRS mapping file from the HTAN portal, then provides
 lookup by HTAN_Data_File_ID to get download coordinates for both platforms.
 
-No extra dependencies — uses only stdlib (urllib, json).
+No extra dependencies — uses only stdlib (urllib, json). With the optional
+``fast`` extra (pip install htan[fast]), the mapping is parsed with orjson
+and validated with ijson's streaming parser.
 
 Usage as library:
     from htan.files import lookup, update_cache, stats
@@ -17,12 +19,16 @@ Usage as CLI:
 """
 
 import argparse
+import contextlib
 import json
+import mmap
 import os
+import pickle
 import re
 import sys
-import urllib.error
-import urllib.request
+from collections import Counter
+
+from htan import _fastjson
 
 MAPPING_URL = (
     "https://raw.githubusercontent.com/ncihtan/htan-portal/"
@@ -35,6 +41,9 @@ CACHE_FILE = os.path.join(CACHE_DIR, "crdcgc_drs_mapping.json")
 
 FILE_ID_PATTERN = re.compile(r"^HTA\d+_\d+.*$")
 
+# Parsed mappings keyed by (path, mtime_ns, size); see _load_mapping.
+_MAPPING_CACHE = {}
+
 
 def _download_mapping(force=False):
     """Download the DRS mapping file from GitHub and cache it locally."""
@@ -44,52 +53,343 @@ def _download_mapping(force=False):
         print("Use 'update' to re-download.", file=sys.stderr)
         return CACHE_FILE
 
+    # Network and decompression modules are only needed here; importing them
+    # lazily keeps them (and ssl/http.client) off the lookup startup path.
+    import gzip
+    import hashlib
+    import urllib.error
+    import urllib.request
+
     os.makedirs(CACHE_DIR, exist_ok=True)
     print(f"Downloading mapping file...", file=sys.stderr)
 
+    # Conditional GET: if the cached copy is still current, the server
+    # answers 304 with no body and the existing cache (and index) are kept.
+    headers = {"User-Agent": "htan-skill/1.0", "Accept-Encoding": "gzip"}
+    meta = _read_meta() if os.path.exists(CACHE_FILE) else {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    # Stream (and gunzip) straight to a temp file; never hold the payload in memory
+    tmp = CACHE_FILE + ".tmp"
+    digest = hashlib.sha256()
     try:
-        req = urllib.request.Request(MAPPING_URL, headers={"User-Agent": "htan-skill/1.0"})
+        req = urllib.request.Request(MAPPING_URL, headers=headers)
         with urllib.request.urlopen(req, timeout=60) as resp:
-            data = resp.read()
-    except urllib.error.URLError as e:
+            stream = resp
+            if resp.headers.get("Content-Encoding") == "gzip":
+                stream = gzip.GzipFile(fileobj=resp)
+            with open(tmp, "wb") as f:
+                while chunk := stream.read(64 * 1024):
+                    digest.update(chunk)
+                    f.write(chunk)
+            meta = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "sha256": digest.hexdigest(),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print(f"Mapping file unchanged: {CACHE_FILE}", file=sys.stderr)
+            return CACHE_FILE
         print(f"Error downloading mapping file: {e}", file=sys.stderr)
         sys.exit(1)
+    except (OSError, EOFError) as e:
+        _remove_quietly(tmp)
+        print(f"Error downloading mapping file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # A full 200 with byte-identical content (servers that ignore conditional
+    # GET): keep the existing file untouched so its index stays valid.
+    if os.path.exists(CACHE_FILE) and meta["sha256"] == _read_meta().get("sha256"):
+        _remove_quietly(tmp)
+        _write_meta(meta)
+        print(f"Mapping file unchanged: {CACHE_FILE}", file=sys.stderr)
+        return CACHE_FILE
 
     try:
-        records = json.loads(data)
-        if not isinstance(records, list):
-            print("Error: Expected JSON array in mapping file.", file=sys.stderr)
-            sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"Error: Downloaded file is not valid JSON: {e}", file=sys.stderr)
+        with open(tmp, "rb") as f:
+            count = _count_records(f)
+    except ValueError as e:
+        _remove_quietly(tmp)
+        print(f"Error: Downloaded file is not a valid JSON array: {e}", file=sys.stderr)
         sys.exit(1)
 
-    with open(CACHE_FILE, "wb") as f:
-        f.write(data)
+    os.replace(tmp, CACHE_FILE)
+    _write_meta(meta)
+    _remove_quietly(_index_path())
+    _remove_quietly(_table_path())
 
-    print(f"Saved {len(records):,} records to {CACHE_FILE}", file=sys.stderr)
+    print(f"Saved {count:,} records to {CACHE_FILE}", file=sys.stderr)
     return CACHE_FILE
 
 
-def _load_mapping():
-    """Load the mapping file and return a dict keyed by HTAN_Data_File_ID."""
+def _meta_path():
+    return CACHE_FILE + ".meta.json"
+
+
+def _read_meta():
+    """Return the stored ETag/Last-Modified for the cached mapping, or {}."""
+    try:
+        with open(_meta_path(), "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _write_meta(meta):
+    try:
+        with _atomic_writer(_meta_path(), "w") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass  # Without metadata the next update is just unconditional
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextlib.contextmanager
+def _atomic_writer(path, mode="wb"):
+    """Write to ``path + ".tmp"`` and rename it over ``path`` on success.
+
+    Readers see either the old file or the complete new one, never a
+    truncated write; on error the temp file is removed.
+    """
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+
+
+def _count_records(f):
+    """Validate that a binary file object holds a JSON array; return its length.
+
+    Streams with ijson when installed (pip install htan[fast]) so the parsed
+    list is never materialized. Raises ValueError on malformed input.
+    """
+    try:
+        import ijson
+    except ImportError:
+        records = _fastjson.loads(f.read())
+        if not isinstance(records, list):
+            raise ValueError("expected a JSON array")
+        return len(records)
+
+    try:
+        events = ijson.parse(f)
+        _, event, _ = next(events, ("", None, None))
+        if event != "start_array":
+            raise ValueError("expected a JSON array")
+        count = 0
+        for prefix, event, _ in events:
+            if prefix == "item" and event not in ("map_key", "end_map", "end_array"):
+                count += 1
+        return count
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+
+def _loads_mapped(f):
+    """Parse an open JSON file with orjson straight from a read-only mmap.
+
+    Avoids copying the file into a Python bytes object; the kernel pages it in
+    on demand and shares those pages between concurrent htan processes.
+    """
+    import orjson
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # Empty files cannot be mapped
+        return orjson.loads(f.read())
+    with mm, memoryview(mm) as view:
+        return orjson.loads(view)
+
+
+def _iter_records(path):
+    """Yield records from the cached mapping JSON array.
+
+    Prefers orjson over an mmap (fastest whole-document parse), then ijson
+    (records decoded one at a time, lowest memory), then the stdlib json module.
+    """
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        with open(path, "rb") as f:
+            yield from _loads_mapped(f)
+        return
+
+    try:
+        import ijson
+    except ImportError:
+        with open(path, "rb") as f:
+            yield from _fastjson.loads(f.read())
+        return
+
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def _index_path():
+    return CACHE_FILE + ".idx.pkl"
+
+
+def _read_index(st):
+    """Return the pickled mapping index if it was built from the current JSON.
+
+    The sidecar records the (mtime_ns, size) of the JSON it was built from;
+    on any mismatch or read error, returns None so the caller re-parses.
+    """
+    try:
+        with open(_index_path(), "rb") as f:
+            source, mapping = pickle.load(f)
+    except Exception:
+        return None
+    if source != (st.st_mtime_ns, st.st_size):
+        return None
+    return mapping
+
+
+def _write_index(mapping, st):
+    """Persist the parsed mapping next to the JSON cache for fast reloads."""
+    try:
+        with _atomic_writer(_index_path()) as f:
+            pickle.dump(((st.st_mtime_ns, st.st_size), mapping), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # The index is only an optimization
+
+
+_TABLE_COLUMNS = ("HTAN_Data_File_ID", "name", "entityId", "drs_uri", "HTAN_Center")
+
+
+def _table_path():
+    return CACHE_FILE + ".feather"
+
+
+def _load_table():
+    """Return the mapping as a columnar pyarrow Table, or None without pyarrow.
+
+    The table is persisted as a Feather sidecar tagged with the (mtime_ns,
+    size) of the JSON it was built from, and rebuilt when that changes.
+    HTAN_Center is dictionary-encoded.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import feather
+    except ImportError:
+        return None
+
     if not os.path.exists(CACHE_FILE):
+        _load_mapping()  # Downloads the cache
+    st = os.stat(CACHE_FILE)
+    source = f"{st.st_mtime_ns}:{st.st_size}".encode()
+    try:
+        table = feather.read_table(_table_path())
+        if (table.schema.metadata or {}).get(b"source") == source:
+            return table
+    except Exception:
+        pass
+
+    records = list(_load_mapping().values())
+    columns = {k: [rec.get(k) for rec in records] for k in _TABLE_COLUMNS}
+    columns["HTAN_Center"] = [rec.get("HTAN_Center", "Unknown") for rec in records]
+    table = pa.table({
+        k: pa.array(v, type=pa.string()).dictionary_encode() if k == "HTAN_Center"
+        else pa.array(v, type=pa.string())
+        for k, v in columns.items()
+    }).replace_schema_metadata({"source": source})
+    try:
+        with _atomic_writer(_table_path()) as f:
+            feather.write_feather(table, f)
+    except OSError:
+        pass  # The sidecar is only an optimization
+    return table
+
+
+def _stats_from_table(table):
+    """Compute stats() from the Arrow table without touching Python records."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    def non_empty(name):
+        # Nulls propagate through not_equal and are skipped by sum
+        return pc.sum(pc.not_equal(table[name], "").cast(pa.int64())).as_py() or 0
+
+    counts = pc.value_counts(table["HTAN_Center"].combine_chunks().dictionary_decode())
+    centers = sorted(
+        zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()),
+        key=lambda item: -item[1],
+    )
+    return {
+        "total_files": table.num_rows,
+        "with_synapse_entity_id": non_empty("entityId"),
+        "with_drs_uri": non_empty("drs_uri"),
+        "files_per_center": dict(centers),
+    }
+
+
+def _clear_cache():
+    """Drop the in-process parsed mapping cache."""
+    _MAPPING_CACHE.clear()
+
+
+def _load_mapping():
+    """Load the mapping file and return a dict keyed by HTAN_Data_File_ID.
+
+    The parsed mapping is memoized per process, keyed by the cache file's
+    path, mtime, and size, so repeat calls are free until the file changes.
+    The returned dict is shared — treat it as read-only.
+    """
+    try:
+        st = os.stat(CACHE_FILE)
+    except FileNotFoundError:
         print("Mapping cache not found. Downloading...", file=sys.stderr)
         _download_mapping(force=True)
+        st = os.stat(CACHE_FILE)
+
+    key = (CACHE_FILE, st.st_mtime_ns, st.st_size)
+    mapping = _MAPPING_CACHE.get(key)
+    if mapping is not None:
+        return mapping
+
+    mapping = _read_index(st)
+    if mapping is None:
+        mapping = {
+            file_id: rec
+            for rec in _iter_records(CACHE_FILE)
+            if (file_id := rec.get("HTAN_Data_File_ID"))
+        }
+        _write_index(mapping, st)
 
-    with open(CACHE_FILE, "r") as f:
-        records = json.load(f)
-
-    mapping = {}
-    for rec in records:
-        file_id = rec.get("HTAN_Data_File_ID")
-        if file_id:
-            mapping[file_id] = rec
+    for stale in [k for k in _MAPPING_CACHE if k[0] == CACHE_FILE]:
+        del _MAPPING_CACHE[stale]
+    _MAPPING_CACHE[key] = mapping
 
     print(f"Loaded {len(mapping):,} file mappings", file=sys.stderr)
     return mapping
 
 
+# Access-tier match tables (lowercase substrings), one alternation per rule
+_OPEN_LEVEL_RE = re.compile(r"level 3|level 4|auxiliary|other")
+_SPECIALIZED_ASSAY_RE = re.compile(
+    r"electron microscopy|rppa|slide-seq|mass spec|label free|isobaric|10x visium"
+)
+_RAW_LEVEL_RE = re.compile(r"level [12]")
+_SEQ_ASSAY_RE = re.compile(r"-seq|bulk rna|bulk wgs|bulk wes|scrna|scatac|snrna")
+
+
 def infer_access_tier(file_id, level=None, assay=None):
     """Infer access tier based on HTAN portal rules.
 
@@ -102,23 +402,17 @@ def infer_access_tier(file_id, level=None, assay=None):
     level_str = (level or "").strip().lower()
     assay_str = (assay or "").strip().lower()
 
-    if any(x in level_str for x in ["level 3", "level 4", "auxiliary", "other"]):
+    if _OPEN_LEVEL_RE.search(level_str):
         return "synapse"
 
-    specialized = [
-        "electron microscopy", "rppa", "slide-seq", "mass spec",
-        "label free", "isobaric", "10x visium",
-    ]
-    if any(s in assay_str for s in specialized):
+    if _SPECIALIZED_ASSAY_RE.search(assay_str):
         return "synapse"
 
     if "codex" in assay_str and "level 1" in level_str:
         return "synapse"
 
-    seq_indicators = ["-seq", "bulk rna", "bulk wgs", "bulk wes", "scrna", "scatac", "snrna"]
-    if any(x in level_str for x in ["level 1", "level 2"]):
-        if any(s in assay_str for s in seq_indicators):
-            return "gen3"
+    if _RAW_LEVEL_RE.search(level_str) and _SEQ_ASSAY_RE.search(assay_str):
+        return "gen3"
 
     return "unknown"
 
@@ -129,25 +423,23 @@ def lookup(file_ids, format="text"):
     """Look up file IDs and return download coordinates.
 
     Args:
-        file_ids: List of HTAN_Data_File_ID strings.
+        file_ids: List of HTAN_Data_File_ID strings. Duplicates are ignored.
         format: Output format ("text" or "json").
 
     Returns:
-        List of mapping record dicts for found files.
+        List of mapping record dicts for found files, in request order.
     """
     mapping = _load_mapping()
 
-    results = []
-    not_found = []
-    for fid in file_ids:
-        rec = mapping.get(fid)
-        if rec:
-            results.append(rec)
-        else:
-            not_found.append(fid)
+    # Deduplicate while keeping the caller's order
+    requested = dict.fromkeys(file_ids)
+    results = [mapping[fid] for fid in requested if fid in mapping]
+    not_found = [fid for fid in requested if fid not in mapping]
 
     if not_found:
-        print(f"Not found in mapping ({len(not_found)}): {', '.join(not_found)}", file=sys.stderr)
+        shown = ", ".join(not_found[:20])
+        more = f" (+{len(not_found) - 20} more)" if len(not_found) > 20 else ""
+        print(f"Not found in mapping ({len(not_found)}): {shown}{more}", file=sys.stderr)
 
     return results
 
@@ -158,57 +450,78 @@ def update_cache():
 
 
 def stats():
-    """Get mapping statistics. Returns dict with counts."""
+    """Get mapping statistics. Returns dict with counts.
+
+    Uses the columnar Feather sidecar when pyarrow is installed.
+    """
+    table = _load_table()
+    if table is not None:
+        return _stats_from_table(table)
+
     mapping = _load_mapping()
 
-    centers = {}
+    centers = Counter()
     with_drs = 0
     with_entity = 0
     for rec in mapping.values():
-        center = rec.get("HTAN_Center", "Unknown")
-        centers[center] = centers.get(center, 0) + 1
-        if rec.get("drs_uri"):
+        get = rec.get
+        centers[get("HTAN_Center", "Unknown")] += 1
+        if get("drs_uri"):
             with_drs += 1
-        if rec.get("entityId"):
+        if get("entityId"):
             with_entity += 1
 
     return {
         "total_files": len(mapping),
         "with_synapse_entity_id": with_entity,
         "with_drs_uri": with_drs,
-        "files_per_center": dict(sorted(centers.items(), key=lambda x: x[1], reverse=True)),
+        "files_per_center": dict(centers.most_common()),
     }
 
 
 # --- CLI ---
 
+_TEXT_HEADERS = ("HTAN_Data_File_ID", "Name", "entityId", "drs_uri", "Center")
+
+
+def _column_widths(rows):
+    """Return the display width of each text column, headers included.
+
+    One pass per column with ``max(map(len, col))`` over the existing str
+    cells; no per-cell copies.
+    """
+    widths = [len(h) for h in _TEXT_HEADERS]
+    for i, col in enumerate(zip(*rows)):
+        widths[i] = max(widths[i], max(map(len, col)))
+    return widths
+
+
 def _format_text_output(results):
     if not results:
         return ""
-    col_id = max(len("HTAN_Data_File_ID"), max(len(r.get("HTAN_Data_File_ID", "")) for r in results))
-    col_name = max(len("Name"), max(len(r.get("name", "")[:40]) for r in results))
-    col_eid = max(len("entityId"), max(len(r.get("entityId", "") or "") for r in results))
-    col_drs = max(len("drs_uri"), min(45, max(len(r.get("drs_uri", "") or "") for r in results)))
-    col_center = max(len("Center"), max(len(r.get("HTAN_Center", "") or "") for r in results))
-
-    header = f"{'HTAN_Data_File_ID':<{col_id}}  {'Name':<{col_name}}  {'entityId':<{col_eid}}  {'drs_uri':<{col_drs}}  {'Center':<{col_center}}"
-    sep = f"{'-' * col_id}  {'-' * col_name}  {'-' * col_eid}  {'-' * col_drs}  {'-' * col_center}"
+    rows = [
+        (
+            r.get("HTAN_Data_File_ID", ""),
+            (r.get("name") or "")[:40],
+            r.get("entityId") or "",
+            r.get("drs_uri") or "",
+            r.get("HTAN_Center") or "",
+        )
+        for r in results
+    ]
+    widths = _column_widths(rows)
+    col_drs = widths[3] = max(len("drs_uri"), min(45, widths[3]))
 
-    lines = [header, sep]
-    for r in results:
-        file_id = r.get("HTAN_Data_File_ID", "")
-        name = r.get("name", "")[:40]
-        eid = r.get("entityId", "") or ""
-        drs = r.get("drs_uri", "") or ""
+    fmt = "  ".join(f"{{:<{w}}}" for w in widths)
+    lines = [fmt.format(*_TEXT_HEADERS), "  ".join("-" * w for w in widths)]
+    for file_id, name, eid, drs, center in rows:
         if len(drs) > col_drs:
             drs = drs[:col_drs - 3] + "..."
-        center = r.get("HTAN_Center", "") or ""
-        lines.append(f"{file_id:<{col_id}}  {name:<{col_name}}  {eid:<{col_eid}}  {drs:<{col_drs}}  {center:<{col_center}}")
+        lines.append(fmt.format(file_id, name, eid, drs, center))
     return "\n".join(lines)
 
 
-def _format_json_output(results):
-    output = []
+def _iter_json_entries(results):
     for r in results:
         entry = {
             "HTAN_Data_File_ID": r.get("HTAN_Data_File_ID", ""),
@@ -224,12 +537,33 @@ def _format_json_output(results):
         if drs:
             full_drs = drs if drs.startswith("drs://") else f"drs://{drs}"
             entry["gen3_download_cmd"] = f'htan download gen3 "{full_drs}"'
-        output.append(entry)
-    return json.dumps(output, indent=2)
+        yield entry
 
 
-def cli_main(argv=None):
-    """CLI entry point for file mapping."""
+def _format_json_output(results):
+    return json.dumps(list(_iter_json_entries(results)), indent=2)
+
+
+def _write_json_output(results, out=None):
+    """Write the JSON array to ``out`` one entry at a time.
+
+    Produces the same text as ``print(_format_json_output(results))`` without
+    materializing the whole document string.
+    """
+    out = out or sys.stdout
+    first = True
+    for entry in _iter_json_entries(results):
+        out.write("[\n  " if first else ",\n  ")
+        out.write(json.dumps(entry, indent=2).replace("\n", "\n  "))
+        first = False
+    out.write("[]\n" if first else "\n]\n")
+
+
+_COMMANDS = ("update", "lookup", "stats")
+
+
+def _build_parser(command=None):
+    """Build the CLI parser; with *command*, only that subparser is added."""
     parser = argparse.ArgumentParser(
         description="HTAN file mapping: resolve HTAN_Data_File_ID to download coordinates",
         epilog="Examples:\n"
@@ -241,16 +575,28 @@ def cli_main(argv=None):
     )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    subparsers.add_parser("update", help="Download or refresh the mapping cache")
+    if command in (None, "update"):
+        subparsers.add_parser("update", help="Download or refresh the mapping cache")
+
+    if command in (None, "lookup"):
+        sp_lookup = subparsers.add_parser("lookup", help="Look up HTAN_Data_File_IDs")
+        sp_lookup.add_argument("ids", nargs="*", help="HTAN_Data_File_IDs")
+        sp_lookup.add_argument("--file", "-f", help="File containing IDs (one per line)")
+        sp_lookup.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
 
-    sp_lookup = subparsers.add_parser("lookup", help="Look up HTAN_Data_File_IDs")
-    sp_lookup.add_argument("ids", nargs="*", help="HTAN_Data_File_IDs")
-    sp_lookup.add_argument("--file", "-f", help="File containing IDs (one per line)")
-    sp_lookup.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    if command in (None, "stats"):
+        subparsers.add_parser("stats", help="Show mapping statistics")
 
-    subparsers.add_parser("stats", help="Show mapping statistics")
+    return parser
 
-    args = parser.parse_args(argv)
+
+def cli_main(argv=None):
+    """CLI entry point for file mapping."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Known subcommand: skip building the others. Help/errors get the full tree.
+    command = argv[0] if argv and argv[0] in _COMMANDS else None
+    args = _build_parser(command).parse_args(argv)
 
     if args.command == "update":
         update_cache()
@@ -271,18 +617,23 @@ def cli_main(argv=None):
             print("Error: No file IDs provided.", file=sys.stderr)
             sys.exit(1)
 
-        for fid in file_ids:
-            if not FILE_ID_PATTERN.match(fid):
-                print(f"Warning: '{fid}' does not match expected format (HTA*_*_*)", file=sys.stderr)
+        match = FILE_ID_PATTERN.match
+        invalid = [fid for fid in file_ids if not match(fid)]
+        if invalid:
+            examples = ", ".join(f"'{fid}'" for fid in invalid[:5])
+            more = f" (+{len(invalid) - 5} more)" if len(invalid) > 5 else ""
+            print(f"Warning: {len(invalid)} of {len(file_ids)} IDs do not match expected "
+                  f"format (HTA*_*_*): {examples}{more}", file=sys.stderr)
 
         results = lookup(file_ids)
         if not results:
             print("No matching records found.", file=sys.stderr)
             sys.exit(1)
 
-        print(f"Found {len(results)}/{len(file_ids)} files", file=sys.stderr)
+        # lookup() collapses repeated IDs, so count distinct ones
+        print(f"Found {len(results)}/{len(dict.fromkeys(file_ids))} files", file=sys.stderr)
         if args.format == "json":
-            print(_format_json_output(results))
+            _write_json_output(results)
         else:
             print(_format_text_output(results))
 
@@ -13,28 +13,29 @@ Usage::
     htan init --status                 # Show current config status
     htan init --non-interactive        # CI mode: detect only, no prompts
     htan init --force                  # Re-run even if configured
+    htan init --verify                 # Also check portal connectivity
 """
 
 import argparse
-import base64
+import functools
+import io
 import json
 import os
-import ssl
 import sys
-import tempfile
-import urllib.error
-import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 from htan.config import (
-    check_setup,
+    check_bigquery,
+    check_gen3,
+    check_portal,
+    check_synapse,
     detect_source,
     load_portal_config,
     get_clickhouse_url,
     save_to_keychain,
+    _validate_config,
     CONFIG_DIR,
     CONFIG_PATH,
-    REQUIRED_KEYS,
     SYNAPSE_CONFIG_PATH,
     GEN3_CREDS_PATH,
     BIGQUERY_ADC_PATH,
@@ -67,19 +68,80 @@ SERVICES = {
 
 INIT_ORDER = ["synapse", "portal", "bigquery", "gen3"]
 
+# Display order for ``show_status``
+STATUS_ORDER = ("portal", "synapse", "bigquery", "gen3")
+
+# Interactive menu choice -> services to set up
+_CHOICE_MAP = {
+    "1": ("portal",),
+    "2": ("synapse",),
+    "3": ("bigquery",),
+    "4": ("gen3",),
+    "a": tuple(INIT_ORDER),
+    "q": (),
+}
+
+# Static instruction blocks, each written to stderr in a single call
+_SYNAPSE_HELP = """
+  To set up Synapse auth:
+    1. Create a free account at https://www.synapse.org
+    2. Go to Account Settings > Personal Access Tokens
+       https://www.synapse.org/#!PersonalAccessTokens:
+    3. Generate a token with 'view', 'download' permissions
+    4. Create ~/.synapseConfig:
+         [authentication]
+         authtoken = <your-token>
+
+"""
+
+_BIGQUERY_HELP = """
+  To set up BigQuery:
+    1. Install Google Cloud SDK: https://cloud.google.com/sdk/docs/install
+    2. In another terminal, run:
+         gcloud auth application-default login
+    3. Set your billing project:
+         export GOOGLE_CLOUD_PROJECT="your-project-id"
+
+"""
+
+_GEN3_HELP = """
+  Gen3/CRDC provides controlled-access data (raw sequencing, protected genomic data).
+  Requires dbGaP authorization for HTAN study phs002371 (may take weeks).
+
+  Steps when you are ready:
+    1. Apply for dbGaP access: https://dbgap.ncbi.nlm.nih.gov/
+    2. Log in to CRDC: https://nci-crdc.datacommons.io/
+    3. Download credentials to ~/.gen3/credentials.json
+"""
+
+_MENU = """
+Which services would you like to set up?
+  [1] Portal database (recommended — query files, metadata, clinical data)
+  [2] Synapse downloads (open-access data)
+  [3] BigQuery (advanced metadata queries via ISB-CGC)
+  [4] Gen3/CRDC (controlled-access data — requires dbGaP)
+  [a] All services
+  [q] Quit (keep current configuration)
+
+"""
+
 
 # ---------------------------------------------------------------------------
 # UI helpers
 # ---------------------------------------------------------------------------
 
+# Indexed by bool(ok): cross, check
+_ICONS = ("\u2717", "\u2713")
+
+
 def _status_icon(ok):
     """Return a check or cross icon for status display."""
-    return "\u2713" if ok else "\u2717"
+    return _ICONS[bool(ok)]
 
 
-def _print_header(text):
-    """Print a section header to stderr."""
-    print(f"\n--- {text} ---", file=sys.stderr)
+def _print_header(text, out=None):
+    """Print a section header to out (default: stderr)."""
+    print(f"\n--- {text} ---", file=out or sys.stderr)
 
 
 def _prompt(msg, default=""):
@@ -92,68 +154,63 @@ def _prompt(msg, default=""):
         return default
 
 
-def _print_status(label, ok, message):
-    """Print a formatted status line to stderr."""
-    icon = _status_icon(ok)
-    print(f"  {icon} {label}: {message}", file=sys.stderr)
+def _print_status(label, ok, message, out=None):
+    """Print a formatted status line to out (default: stderr)."""
+    print(f"  {_ICONS[bool(ok)]} {label}: {message}", file=out or sys.stderr)
 
 
-def _print_skip(label, message):
-    """Print a formatted skip line to stderr."""
-    print(f"  - {label}: {message}", file=sys.stderr)
+def _print_skip(label, message, out=None):
+    """Print a formatted skip line to out (default: stderr)."""
+    print(f"  - {label}: {message}", file=out or sys.stderr)
 
 
 # ---------------------------------------------------------------------------
 # Status display
 # ---------------------------------------------------------------------------
 
-def show_status():
+def _snapshot():
+    """Probe all four services concurrently.
+
+    The checks are independent (env, file stats, OS keychain), so wall time
+    is the slowest probe rather than the sum.
+
+    Returns:
+        Dict shaped like :func:`htan.config.check_setup` for the service keys.
+    """
+    checks = {
+        "portal": check_portal,
+        "synapse": check_synapse,
+        "bigquery": check_bigquery,
+        "gen3": check_gen3,
+    }
+    with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+        futures = {svc: ex.submit(check) for svc, check in checks.items()}
+    return {svc: future.result() for svc, future in futures.items()}
+
+
+def show_status(setup=None):
     """Display current configuration status for all services.
 
     Prints a formatted status table to stderr.
 
+    Args:
+        setup: A :func:`_snapshot` result to reuse (probed now if omitted).
+
     Returns:
         Dict mapping service names to bool (configured or not).
     """
-    setup = check_setup()
-    source = detect_source()
+    if setup is None:
+        setup = _snapshot()
 
     result = {}
-
-    # Portal
-    portal_ok = source is not None
-    portal_detail = f"({source})" if source else "Not configured"
-    if portal_ok:
-        portal_detail = f"Configured ({source})"
-    _print_status(SERVICES["portal"]["label"], portal_ok, portal_detail)
-    result["portal"] = portal_ok
-
-    # Synapse
-    syn_info = setup["synapse"]
-    syn_ok = syn_info["configured"]
-    syn_detail = syn_info["method"] if syn_ok else "Not configured"
-    if syn_ok:
-        syn_detail = f"Configured ({syn_detail})"
-    _print_status(SERVICES["synapse"]["label"], syn_ok, syn_detail)
-    result["synapse"] = syn_ok
-
-    # BigQuery
-    bq_info = setup["bigquery"]
-    bq_ok = bq_info["configured"]
-    bq_detail = bq_info["method"] if bq_ok else "Not configured"
-    if bq_ok:
-        bq_detail = f"Configured ({bq_detail})"
-    _print_status(SERVICES["bigquery"]["label"], bq_ok, bq_detail)
-    result["bigquery"] = bq_ok
-
-    # Gen3
-    gen3_info = setup["gen3"]
-    gen3_ok = gen3_info["configured"]
-    gen3_detail = gen3_info["method"] if gen3_ok else "Not configured"
-    if gen3_ok:
-        gen3_detail = f"Configured ({gen3_detail})"
-    _print_status(SERVICES["gen3"]["label"], gen3_ok, gen3_detail)
-    result["gen3"] = gen3_ok
+    for svc in STATUS_ORDER:
+        info = setup[svc]
+        ok = info["configured"]
+        # Portal reports where credentials come from; the others how
+        method = info["source"] if svc == "portal" else info["method"]
+        detail = f"Configured ({method})" if ok else "Not configured"
+        _print_status(SERVICES[svc]["label"], ok, detail)
+        result[svc] = ok
 
     return result
 
@@ -175,29 +232,62 @@ def _verify_portal():
         cfg = load_portal_config()
     except Exception:
         return False
+    return _verify_portal_with_creds(cfg)
 
-    url = get_clickhouse_url(cfg)
-    user = cfg["user"]
-    password = cfg["password"]
 
-    params = urllib.parse.urlencode({"default_format": "TabSeparated"})
+_SSL_CTX = None
+
+
+def _get_ssl_ctx():
+    """Return a process-wide SSL context, loading the CA bundle only once.
+
+    Building a context (and reading certifi's bundle) dominates the cost of
+    a ``SELECT 1`` probe when ``run_init`` verifies more than once.
+    """
+    global _SSL_CTX
+    if _SSL_CTX is None:
+        import ssl
+        try:
+            import certifi
+            _SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+        except ImportError:
+            _SSL_CTX = ssl.create_default_context()
+    return _SSL_CTX
+
+
+@functools.lru_cache(maxsize=4)
+def _basic_auth_header(user, password):
+    """Return the HTTP Basic ``Authorization`` value for a user/password pair.
+
+    Pure function of its arguments, so new credentials simply miss the cache.
+    """
+    import base64
     credentials = base64.b64encode(f"{user}:{password}".encode()).decode()
+    return f"Basic {credentials}"
+
+
+def _verify_portal_with_creds(cfg):
+    """Run ``SELECT 1`` against the portal with an explicit credentials dict.
+
+    Returns:
+        True if the portal responds with ``1``.
+    """
+    # Network modules load here, keeping them off the `htan init --status` path
+    import urllib.parse
+    import urllib.request
+
+    url = get_clickhouse_url(cfg)
+    params = urllib.parse.urlencode({"default_format": "TabSeparated"})
 
     req = urllib.request.Request(
         url + "?" + params,
         data=b"SELECT 1",
-        headers={"Authorization": f"Basic {credentials}"},
+        headers={"Authorization": _basic_auth_header(cfg["user"], cfg["password"])},
         method="POST",
     )
 
     try:
-        try:
-            import certifi
-            ctx = ssl.create_default_context(cafile=certifi.where())
-        except ImportError:
-            ctx = ssl.create_default_context()
-
-        with urllib.request.urlopen(req, timeout=10, context=ctx) as resp:
+        with urllib.request.urlopen(req, timeout=10, context=_get_ssl_ctx()) as resp:
             result = resp.read().decode("utf-8").strip()
             return result == "1"
     except Exception:
@@ -208,91 +298,156 @@ def _verify_portal():
 # Service init functions
 # ---------------------------------------------------------------------------
 
-def _init_synapse(force=False, non_interactive=False):
+# Like htan.config's check_* helpers, the live probes below skip the default
+# credential path when the env var already provides auth.
+
+def _synapse_auth(setup=None):
+    """Return (has_token, has_config), from a _snapshot() result if given."""
+    if setup is not None:
+        method = setup["synapse"]["method"]
+        return method == "SYNAPSE_AUTH_TOKEN", method == "~/.synapseConfig"
+    has_token = bool(os.environ.get("SYNAPSE_AUTH_TOKEN"))
+    return has_token, not has_token and os.path.exists(SYNAPSE_CONFIG_PATH)
+
+
+def _bigquery_auth(setup=None):
+    """Return (sa_key, has_sa, has_adc), from a _snapshot() result if given."""
+    sa_key = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    if setup is not None:
+        method = setup["bigquery"]["method"]
+        return sa_key, method == "GOOGLE_APPLICATION_CREDENTIALS", method == "application_default_credentials"
+    has_sa = bool(sa_key and os.path.exists(sa_key))
+    return sa_key, has_sa, not has_sa and os.path.exists(BIGQUERY_ADC_PATH)
+
+
+def _gen3_auth(setup=None):
+    """Return (env_path, has_env, has_config), from a _snapshot() result if given."""
+    env_path = os.environ.get("GEN3_API_KEY")
+    if setup is not None:
+        method = setup["gen3"]["method"]
+        return env_path, method == "GEN3_API_KEY", method == "~/.gen3/credentials.json"
+    has_env = bool(env_path and os.path.exists(env_path))
+    return env_path, has_env, not has_env and os.path.exists(GEN3_CREDS_PATH)
+
+
+_SYNAPSECLIENT = None
+
+
+def _get_synapseclient():
+    """Import ``synapseclient`` once; return the module or None if unavailable.
+
+    Failed imports are not cached by Python, so the miss is remembered here
+    to avoid rescanning sys.path on every call.
+    """
+    global _SYNAPSECLIENT
+    if _SYNAPSECLIENT is None:
+        try:
+            import synapseclient  # lazy: heavyweight
+            _SYNAPSECLIENT = synapseclient
+        except ImportError:
+            _SYNAPSECLIENT = False
+    return _SYNAPSECLIENT or None
+
+
+def _synapse_login(out=None):
+    """Log in with the configured Synapse credentials and report the result.
+
+    Returns:
+        Tuple of (ok: bool, synapse_client: object | None).
+    """
+    synapseclient = _get_synapseclient()
+    if synapseclient is None:
+        _print_status("Synapse client", True,
+                      "Credentials found (install htan[synapse] to verify login)", out=out)
+        return True, None
+    try:
+        syn = synapseclient.Synapse()
+        syn.login(silent=True)
+        profile = syn.getUserProfile()
+        username = getattr(profile, "userName", "unknown")
+        _print_status("Synapse login", True, f"Logged in as: {username}", out=out)
+        return True, syn
+    except Exception as e:
+        _print_status("Synapse login", False, f"Login failed: {e}", out=out)
+        return False, None
+
+
+def _init_synapse(force=False, non_interactive=False, setup=None, out=None):
     """Set up Synapse authentication.
 
+    Args:
+        force: Re-run even if already configured.
+        non_interactive: Skip prompts — detect-only mode.
+        setup: Per-run :func:`_snapshot` result; probed
+            directly if omitted.
+        out: Stream for progress output (default: stderr).
+
     Returns:
         Tuple of (ok: bool, synapse_client: object | None).
         The client is returned so it can be reused by ``_init_portal``.
     """
-    _print_header("Synapse")
+    out = out or sys.stderr
+    _print_header("Synapse", out=out)
 
-    token = os.environ.get("SYNAPSE_AUTH_TOKEN")
-    has_config = os.path.exists(SYNAPSE_CONFIG_PATH)
-    has_auth = bool(token) or has_config
+    token, has_config = _synapse_auth(setup)
+    has_auth = token or has_config
 
     if has_auth and not force:
         if token:
-            _print_status("Synapse auth", True, "SYNAPSE_AUTH_TOKEN is set")
+            _print_status("Synapse auth", True, "SYNAPSE_AUTH_TOKEN is set", out=out)
         else:
-            _print_status("Synapse auth", True, "~/.synapseConfig found")
+            _print_status("Synapse auth", True, "~/.synapseConfig found", out=out)
 
-        # Verify login
-        try:
-            import synapseclient  # lazy
-            syn = synapseclient.Synapse()
-            syn.login(silent=True)
-            profile = syn.getUserProfile()
-            username = getattr(profile, "userName", "unknown")
-            _print_status("Synapse login", True, f"Logged in as: {username}")
-            return True, syn
-        except ImportError:
-            _print_status("Synapse client", True,
-                          "Credentials found (install htan[synapse] to verify login)")
-            return True, None
-        except Exception as e:
-            _print_status("Synapse login", False, f"Login failed: {e}")
-            if non_interactive:
-                return False, None
-            # Fall through to setup instructions
+        ok, syn = _synapse_login(out=out)
+        if ok or non_interactive:
+            return ok, syn
+        # Login failed: fall through to setup instructions
 
     if non_interactive:
-        _print_skip("Synapse", "Not configured (non-interactive mode)")
+        _print_skip("Synapse", "Not configured (non-interactive mode)", out=out)
         return False, None
 
     # Interactive: print instructions and wait
-    if not has_auth or force:
-        print(file=sys.stderr)
-        print("  To set up Synapse auth:", file=sys.stderr)
-        print("    1. Create a free account at https://www.synapse.org", file=sys.stderr)
-        print("    2. Go to Account Settings > Personal Access Tokens", file=sys.stderr)
-        print("       https://www.synapse.org/#!PersonalAccessTokens:", file=sys.stderr)
-        print("    3. Generate a token with 'view', 'download' permissions", file=sys.stderr)
-        print("    4. Create ~/.synapseConfig:", file=sys.stderr)
-        print("         [authentication]", file=sys.stderr)
-        print("         authtoken = <your-token>", file=sys.stderr)
-        print(file=sys.stderr)
-
-        response = _prompt("  Press Enter when ready (or 'skip' to skip): ")
-        if response.lower() == "skip":
-            _print_skip("Synapse", "Skipped by user")
-            return False, None
+    out.write(_SYNAPSE_HELP)
 
-        # Re-check after user action
-        token = os.environ.get("SYNAPSE_AUTH_TOKEN")
-        if not token and not os.path.exists(SYNAPSE_CONFIG_PATH):
-            _print_status("Synapse auth", False, "Still not configured")
-            return False, None
+    response = _prompt("  Press Enter when ready (or 'skip' to skip): ")
+    if response.lower() == "skip":
+        _print_skip("Synapse", "Skipped by user", out=out)
+        return False, None
 
-    # Verify login
-    try:
-        import synapseclient  # lazy
-        syn = synapseclient.Synapse()
-        syn.login(silent=True)
-        profile = syn.getUserProfile()
-        username = getattr(profile, "userName", "unknown")
-        _print_status("Synapse login", True, f"Logged in as: {username}")
-        return True, syn
-    except ImportError:
-        _print_status("Synapse client", True,
-                      "Credentials found (install htan[synapse] to verify login)")
-        return True, None
-    except Exception as e:
-        _print_status("Synapse login", False, f"Login failed: {e}")
+    # Re-check after user action (live, not from the snapshot)
+    token, has_config = _synapse_auth()
+    if not token and not has_config:
+        _print_status("Synapse auth", False, "Still not configured", out=out)
         return False, None
+    if setup is not None:
+        setup["synapse"].update(
+            configured=True,
+            method="SYNAPSE_AUTH_TOKEN" if token else "~/.synapseConfig",
+        )
 
+    return _synapse_login(out=out)
 
-def _init_portal(force=False, non_interactive=False, synapse_client=None):
+
+def _fetch_portal_credentials(syn):
+    """Read the portal credentials JSON from Synapse straight into memory.
+
+    Asks Synapse for a pre-signed URL to the file entity (access is still
+    gated by team membership) and parses the small body without a temporary
+    download directory.
+
+    Returns:
+        Parsed credentials dict.
+    """
+    import urllib.request
+
+    url = syn.restGET(f"/entity/{PORTAL_CREDENTIALS_SYNAPSE_ID}/file?redirect=false")
+    with urllib.request.urlopen(url.strip(), timeout=30, context=_get_ssl_ctx()) as resp:
+        return json.loads(resp.read())
+
+
+def _init_portal(force=False, non_interactive=False, synapse_client=None, setup=None,
+                 verify=False, out=None):
     """Set up portal ClickHouse credentials.
 
     Downloads credentials from Synapse (gated by team membership),
@@ -302,83 +457,111 @@ def _init_portal(force=False, non_interactive=False, synapse_client=None):
         force: Re-download even if already configured.
         non_interactive: Skip prompts — detect-only mode.
         synapse_client: Reuse an already-authenticated Synapse client.
+        setup: Per-run :func:`_snapshot` result; probed
+            directly if omitted. Updated in place after saving credentials.
+        verify: Run the ``SELECT 1`` connectivity check even when credentials
+            are already configured (always run after a fresh download).
+        out: Stream for progress output (default: stderr).
 
     Returns:
-        True if portal is configured and connectivity verified.
+        True if portal is configured (and, when checked, connectivity verified).
     """
-    _print_header("Portal (ClickHouse)")
+    out = out or sys.stderr
+    _print_header("Portal (ClickHouse)", out=out)
 
-    source = detect_source()
+    source = setup["portal"]["source"] if setup is not None else detect_source()
 
-    # Already configured and not forcing
+    # Already configured and not forcing: skip the network round trip unless asked
     if source and not force:
-        _print_status("Portal config", True, f"Credentials via {source}")
+        _print_status("Portal config", True, f"Credentials via {source}", out=out)
+        if not verify:
+            _print_skip("Portal connectivity", "Not checked (use --verify)", out=out)
+            return True
         if _verify_portal():
-            _print_status("Portal connectivity", True, "SELECT 1 OK")
+            _print_status("Portal connectivity", True, "SELECT 1 OK", out=out)
             return True
         else:
             _print_status("Portal connectivity", False,
-                          "Config exists but connectivity failed. Use --force to re-download.")
+                          "Config exists but connectivity failed. Use --force to re-download.", out=out)
             return False
 
     if non_interactive:
         if not synapse_client:
-            _print_skip("Portal", "Synapse auth required (non-interactive mode)")
+            _print_skip("Portal", "Synapse auth required (non-interactive mode)", out=out)
             return False
         # In non-interactive mode with a client, proceed automatically
     else:
         if not synapse_client:
             # Check if Synapse auth is available for ad-hoc login
-            token = os.environ.get("SYNAPSE_AUTH_TOKEN")
-            if not token and not os.path.exists(SYNAPSE_CONFIG_PATH):
+            token, has_config = _synapse_auth(setup)
+            if not token and not has_config:
                 _print_status("Portal credentials", False,
-                              "Synapse auth required first — run: htan init synapse")
+                              "Synapse auth required first — run: htan init synapse", out=out)
                 return False
 
     # Get or create a Synapse client
     syn = synapse_client
     if syn is None:
+        synapseclient = _get_synapseclient()
+        if synapseclient is None:
+            _print_status("Portal credentials", False,
+                          "synapseclient not installed (pip install htan[synapse])", out=out)
+            return False
         try:
-            import synapseclient  # lazy
             syn = synapseclient.Synapse()
             syn.login(silent=True)
-        except ImportError:
-            _print_status("Portal credentials", False,
-                          "synapseclient not installed (pip install htan[synapse])")
-            return False
         except Exception as e:
-            _print_status("Portal credentials", False, f"Synapse login failed: {e}")
+            _print_status("Portal credentials", False, f"Synapse login failed: {e}", out=out)
             return False
 
     # Download credentials from Synapse
-    print("  Downloading portal credentials from Synapse...", file=sys.stderr)
+    print("  Downloading portal credentials from Synapse...", file=out)
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            entity = syn.get(PORTAL_CREDENTIALS_SYNAPSE_ID, downloadLocation=tmpdir)
-            with open(entity.path, "r") as f:
-                creds = json.load(f)
+        creds = _fetch_portal_credentials(syn)
     except Exception as e:
         error_str = str(e)
         if "403" in error_str or "access" in error_str.lower():
             _print_status("Portal credentials", False,
-                          "Access denied — join the HTAN Claude Skill Users team first")
-            print(f"    Join here: {SYNAPSE_TEAM_URL}", file=sys.stderr)
+                          "Access denied — join the HTAN Claude Skill Users team first", out=out)
+            print(f"    Join here: {SYNAPSE_TEAM_URL}", file=out)
         else:
-            _print_status("Portal credentials", False, f"Download failed: {e}")
+            _print_status("Portal credentials", False, f"Download failed: {e}", out=out)
         return False
 
     # Validate
-    missing = [k for k in REQUIRED_KEYS if k not in creds]
+    missing = _validate_config(creds)
     if missing:
         _print_status("Portal credentials", False,
-                      f"Downloaded file missing keys: {', '.join(missing)}")
+                      f"Downloaded file missing keys: {', '.join(missing)}", out=out)
+        return False
+
+    # Start the connectivity check against the downloaded credentials now so
+    # the HTTPS round trip overlaps the keychain/file save. The probe's own
+    # 10s HTTP timeout bounds the wait, and it returns False on any error.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        probe = ex.submit(_verify_portal_with_creds, creds)
+        saved_to = _save_portal_creds(creds, setup, out=out)
+        connected = probe.result()
+
+    if connected:
+        _print_status("Portal connectivity", True, "SELECT 1 OK", out=out)
+        return True
+    else:
+        _print_status("Portal connectivity", False,
+                      f"Credentials saved ({saved_to}) but connectivity check failed", out=out)
+        print("  The portal endpoint may be temporarily unavailable.", file=out)
         return False
 
-    # Save: try keychain first, fall back to config file
-    saved_to = None
+
+def _save_portal_creds(creds, setup=None, out=None):
+    """Save portal credentials to the keychain, falling back to the config file.
+
+    Returns:
+        ``"keychain"`` or ``"file"``.
+    """
     if save_to_keychain(creds):
         saved_to = "keychain"
-        _print_status("Portal credentials", True, "Saved to OS keychain")
+        _print_status("Portal credentials", True, "Saved to OS keychain", out=out)
     else:
         # Fall back to config file
         os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -387,31 +570,34 @@ def _init_portal(force=False, non_interactive=False, synapse_client=None):
             f.write("\n")
         os.chmod(CONFIG_PATH, 0o600)
         saved_to = "file"
-        _print_status("Portal credentials", True, f"Saved to {CONFIG_PATH}")
-
-    # Verify connectivity
-    if _verify_portal():
-        _print_status("Portal connectivity", True, "SELECT 1 OK")
-        return True
-    else:
-        _print_status("Portal connectivity", False,
-                      f"Credentials saved ({saved_to}) but connectivity check failed")
-        print("  The portal endpoint may be temporarily unavailable.", file=sys.stderr)
-        return False
+        _print_status("Portal credentials", True, f"Saved to {CONFIG_PATH}", out=out)
+    if setup is not None:
+        setup["portal"].update(
+            configured=True,
+            source=saved_to,
+            path=CONFIG_PATH if saved_to == "file" else None,
+        )
+    return saved_to
 
 
-def _init_bigquery(force=False, non_interactive=False):
+def _init_bigquery(force=False, non_interactive=False, setup=None, out=None):
     """Set up BigQuery / ISB-CGC authentication.
 
+    Args:
+        force: Re-run even if already configured.
+        non_interactive: Skip prompts — detect-only mode.
+        setup: Per-run :func:`_snapshot` result; probed
+            directly if omitted.
+        out: Stream for progress output (default: stderr).
+
     Returns:
         True if BigQuery credentials are detected.
     """
-    _print_header("BigQuery (ISB-CGC)")
+    out = out or sys.stderr
+    _print_header("BigQuery (ISB-CGC)", out=out)
 
     project = os.environ.get("GOOGLE_CLOUD_PROJECT")
-    sa_key = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-    has_sa = sa_key and os.path.exists(sa_key)
-    has_adc = os.path.exists(BIGQUERY_ADC_PATH)
+    sa_key, has_sa, has_adc = _bigquery_auth(setup)
     has_auth = has_sa or has_adc
 
     if has_auth and not force:
@@ -421,91 +607,75 @@ def _init_bigquery(force=False, non_interactive=False):
             msg = "Application Default Credentials found"
         if project:
             msg += f", project: {project}"
-        _print_status("BigQuery auth", True, msg)
+        _print_status("BigQuery auth", True, msg, out=out)
         return True
 
     if non_interactive:
-        _print_skip("BigQuery", "Not configured (non-interactive mode)")
+        _print_skip("BigQuery", "Not configured (non-interactive mode)", out=out)
         return False
 
     # Interactive
-    print(file=sys.stderr)
+    print(file=out)
     response = _prompt("  Set up BigQuery? [y/N]: ", default="n")
     if response.lower() not in ("y", "yes"):
-        _print_skip("BigQuery", "Skipped by user")
+        _print_skip("BigQuery", "Skipped by user", out=out)
         return False
 
-    print(file=sys.stderr)
-    print("  To set up BigQuery:", file=sys.stderr)
-    print("    1. Install Google Cloud SDK: https://cloud.google.com/sdk/docs/install",
-          file=sys.stderr)
-    print("    2. In another terminal, run:", file=sys.stderr)
-    print("         gcloud auth application-default login", file=sys.stderr)
-    print("    3. Set your billing project:", file=sys.stderr)
-    print('         export GOOGLE_CLOUD_PROJECT="your-project-id"', file=sys.stderr)
-    print(file=sys.stderr)
+    out.write(_BIGQUERY_HELP)
 
     response = _prompt("  Press Enter when ready (or 'skip' to skip): ")
     if response.lower() == "skip":
-        _print_skip("BigQuery", "Skipped by user")
+        _print_skip("BigQuery", "Skipped by user", out=out)
         return False
 
-    # Re-check
-    sa_key = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-    has_sa = sa_key and os.path.exists(sa_key)
-    has_adc = os.path.exists(BIGQUERY_ADC_PATH)
+    # Re-check (live, not from the snapshot)
+    sa_key, has_sa, has_adc = _bigquery_auth()
 
     if has_sa or has_adc:
-        _print_status("BigQuery auth", True, "Credentials detected")
+        _print_status("BigQuery auth", True, "Credentials detected", out=out)
         return True
 
     _print_status("BigQuery auth", False,
-                  "Still not configured. Set up later: gcloud auth application-default login")
+                  "Still not configured. Set up later: gcloud auth application-default login", out=out)
     return False
 
 
-def _init_gen3(force=False, non_interactive=False):
+def _init_gen3(force=False, non_interactive=False, setup=None, out=None):
     """Set up Gen3/CRDC authentication.
 
     Gen3 requires dbGaP authorization which cannot be automated, so this
     function is primarily informational.
 
+    Args:
+        force: Re-run even if already configured.
+        non_interactive: Skip prompts — detect-only mode.
+        setup: Per-run :func:`_snapshot` result; probed
+            directly if omitted.
+        out: Stream for progress output (default: stderr).
+
     Returns:
         True if Gen3 credentials are detected.
     """
-    _print_header("Gen3/CRDC")
+    out = out or sys.stderr
+    _print_header("Gen3/CRDC", out=out)
 
-    env_path = os.environ.get("GEN3_API_KEY")
-    has_env = env_path and os.path.exists(env_path)
-    has_config = os.path.exists(GEN3_CREDS_PATH)
+    env_path, has_env, has_config = _gen3_auth(setup)
     has_auth = has_env or has_config
 
     if has_auth and not force:
         if has_env:
-            _print_status("Gen3 auth", True, f"GEN3_API_KEY -> {env_path}")
+            _print_status("Gen3 auth", True, f"GEN3_API_KEY -> {env_path}", out=out)
         else:
-            _print_status("Gen3 auth", True, "~/.gen3/credentials.json found")
+            _print_status("Gen3 auth", True, "~/.gen3/credentials.json found", out=out)
         return True
 
     if non_interactive:
-        _print_skip("Gen3/CRDC", "Not configured (non-interactive mode)")
+        _print_skip("Gen3/CRDC", "Not configured (non-interactive mode)", out=out)
         return False
 
     # Informational — cannot automate dbGaP
-    print(file=sys.stderr)
-    print("  Gen3/CRDC provides controlled-access data (raw sequencing, "
-          "protected genomic data).", file=sys.stderr)
-    print("  Requires dbGaP authorization for HTAN study phs002371 "
-          "(may take weeks).", file=sys.stderr)
-    print(file=sys.stderr)
-    print("  Steps when you are ready:", file=sys.stderr)
-    print("    1. Apply for dbGaP access: https://dbgap.ncbi.nlm.nih.gov/",
-          file=sys.stderr)
-    print("    2. Log in to CRDC: https://nci-crdc.datacommons.io/",
-          file=sys.stderr)
-    print("    3. Download credentials to ~/.gen3/credentials.json",
-          file=sys.stderr)
-    _print_skip("Gen3/CRDC", "Requires dbGaP authorization — cannot automate")
+    out.write(_GEN3_HELP)
+    _print_skip("Gen3/CRDC", "Requires dbGaP authorization — cannot automate", out=out)
     return False
 
 
@@ -513,15 +683,34 @@ def _init_gen3(force=False, non_interactive=False):
 # Orchestrator
 # ---------------------------------------------------------------------------
 
-_SERVICE_INIT = {
-    "synapse": _init_synapse,
-    "portal": _init_portal,
-    "bigquery": _init_bigquery,
-    "gen3": _init_gen3,
-}
+def _run_concurrently(calls):
+    """Run independent ``_init_*`` calls in threads, replaying output in order.
+
+    Only safe without prompts (non-interactive mode): each call writes to its
+    own ``out`` buffer, and the buffers are written to stderr in ``calls``
+    order once all have finished.
+
+    Args:
+        calls: List of (service, func, kwargs) tuples.
+
+    Returns:
+        Dict mapping each service to its call's return value.
+    """
+    buffers = [io.StringIO() for _ in calls]
+    with ThreadPoolExecutor(max_workers=len(calls)) as ex:
+        futures = [
+            (svc, ex.submit(func, out=buf, **kwargs))
+            for (svc, func, kwargs), buf in zip(calls, buffers)
+        ]
+        outcomes = [(svc, future.result()) for svc, future in futures]
+
+    for buf in buffers:
+        sys.stderr.write(buf.getvalue())
+    return dict(outcomes)
 
 
-def run_init(services=None, force=False, non_interactive=False, status_only=False):
+def run_init(services=None, force=False, non_interactive=False, status_only=False,
+             verify=False):
     """Main init orchestrator.
 
     Args:
@@ -529,15 +718,18 @@ def run_init(services=None, force=False, non_interactive=False, status_only=Fals
         force: Re-run even if already configured.
         non_interactive: Detect-only mode, no prompts.
         status_only: Just print status, do not init.
+        verify: Check portal connectivity even if already configured.
     """
     print(file=sys.stderr)
     print("Welcome to the HTAN CLI! This command will walk you through "
           "configuration.", file=sys.stderr)
 
-    # Always show current status
+    # Always show current status. The snapshot is shared with every _init_*
+    # call so each credential path and the keychain are probed once per run.
     print(file=sys.stderr)
     print("Current configuration:", file=sys.stderr)
-    current = show_status()
+    setup = _snapshot()
+    current = show_status(setup=setup)
 
     if status_only:
         return current
@@ -545,30 +737,11 @@ def run_init(services=None, force=False, non_interactive=False, status_only=Fals
     # Determine which services to init
     if services is None and not non_interactive:
         # Interactive menu
-        print(file=sys.stderr)
-        print("Which services would you like to set up?", file=sys.stderr)
-        print("  [1] Portal database (recommended — query files, metadata, "
-              "clinical data)", file=sys.stderr)
-        print("  [2] Synapse downloads (open-access data)", file=sys.stderr)
-        print("  [3] BigQuery (advanced metadata queries via ISB-CGC)",
-              file=sys.stderr)
-        print("  [4] Gen3/CRDC (controlled-access data — requires dbGaP)",
-              file=sys.stderr)
-        print("  [a] All services", file=sys.stderr)
-        print("  [q] Quit (keep current configuration)", file=sys.stderr)
-        print(file=sys.stderr)
+        sys.stderr.write(_MENU)
 
         choice = _prompt("Your choice: ", default="q")
 
-        choice_map = {
-            "1": ["portal"],
-            "2": ["synapse"],
-            "3": ["bigquery"],
-            "4": ["gen3"],
-            "a": list(INIT_ORDER),
-            "q": [],
-        }
-        services = choice_map.get(choice.lower(), [])
+        services = list(_CHOICE_MAP.get(choice.lower(), ()))
 
         if not services:
             print("\nNo changes made.", file=sys.stderr)
@@ -584,38 +757,50 @@ def run_init(services=None, force=False, non_interactive=False, status_only=Fals
     results = {}
     synapse_client = None
 
+    # Synapse first: the portal step reuses its authenticated client
+    if "synapse" in ordered:
+        ok, synapse_client = _init_synapse(
+            force=force, non_interactive=non_interactive, setup=setup,
+        )
+        results["synapse"] = ok
+
+    calls = []
     for svc in ordered:
-        if svc == "synapse":
-            ok, synapse_client = _init_synapse(
-                force=force, non_interactive=non_interactive,
-            )
-            results["synapse"] = ok
-        elif svc == "portal":
-            results["portal"] = _init_portal(
-                force=force,
-                non_interactive=non_interactive,
-                synapse_client=synapse_client,
-            )
+        if svc == "portal":
+            calls.append(("portal", _init_portal, {
+                "force": force,
+                "non_interactive": non_interactive,
+                "synapse_client": synapse_client,
+                "setup": setup,
+                "verify": verify,
+            }))
         elif svc == "bigquery":
-            results["bigquery"] = _init_bigquery(
-                force=force, non_interactive=non_interactive,
-            )
+            calls.append(("bigquery", _init_bigquery, {
+                "force": force, "non_interactive": non_interactive, "setup": setup,
+            }))
         elif svc == "gen3":
-            results["gen3"] = _init_gen3(
-                force=force, non_interactive=non_interactive,
-            )
+            calls.append(("gen3", _init_gen3, {
+                "force": force, "non_interactive": non_interactive, "setup": setup,
+            }))
 
-    # Summary
-    print(file=sys.stderr)
-    print("=== Setup Summary ===", file=sys.stderr)
+    # The remaining steps are independent; without prompts they can overlap
+    if non_interactive and len(calls) > 1:
+        results.update(_run_concurrently(calls))
+    else:
+        for svc, func, kwargs in calls:
+            results[svc] = func(**kwargs)
+
+    # Summary, written in one call so it stays contiguous on a shared TTY
+    lines = ["", "=== Setup Summary ==="]
     for svc in INIT_ORDER:
-        label = SERVICES[svc]["label"]
         if svc in results:
-            icon = _status_icon(results[svc])
-            detail = "Ready" if results[svc] else "Not configured"
+            ok = results[svc]
+            label = SERVICES[svc]["label"]
+            detail = "Ready" if ok else "Not configured"
             suffix = "" if svc in ("portal", "synapse") else " (optional)"
-            print(f"  {icon} {label}: {detail}{suffix}", file=sys.stderr)
-    print(file=sys.stderr)
+            lines.append(f"  {_ICONS[bool(ok)]} {label}: {detail}{suffix}")
+    lines.append("")
+    sys.stderr.write("\n".join(lines) + "\n")
 
     return results
 
@@ -642,6 +827,7 @@ def cli_main(args=None):
             "  htan init --status            # Show current config status\n"
             "  htan init --non-interactive   # CI mode: detect only\n"
             "  htan init --force             # Re-run even if configured\n"
+            "  htan init portal --verify     # Check portal connectivity\n"
         ),
     )
     parser.add_argument(
@@ -661,6 +847,11 @@ def cli_main(args=None):
         action="store_true",
         help="Re-run setup even if already configured",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check portal connectivity (SELECT 1) even if already configured",
+    )
     parser.add_argument(
         "--non-interactive",
         action="store_true",
@@ -676,6 +867,7 @@ def cli_main(args=None):
         force=parsed.force,
         non_interactive=parsed.non_interactive,
         status_only=parsed.status,
+        verify=parsed.verify,
     )
 
     # Exit non-zero if any requested service failed
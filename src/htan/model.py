@@ -17,13 +17,18 @@ Usage as CLI:
 
 import argparse
 import csv
-import io
+import functools
 import json
 import os
+import pickle
+import re
 import ssl
 import sys
 import urllib.error
 import urllib.request
+from collections import deque
+from itertools import islice
+from operator import itemgetter
 
 MODEL_TAG = "v25.2.1"
 MODEL_URL_TEMPLATE = (
@@ -38,7 +43,9 @@ def _get_model_url(tag=None):
     return MODEL_URL_TEMPLATE.format(tag=tag or MODEL_TAG)
 
 
+@functools.cache
 def _make_ssl_context():
+    """Build the verifying SSL context once per process (certifi CA bundle if installed)."""
     try:
         import certifi
         return ssl.create_default_context(cafile=certifi.where())
@@ -46,72 +53,235 @@ def _make_ssl_context():
         return ssl.create_default_context()
 
 
-def download_model(tag=None, force=False, dry_run=False):
-    """Download the data model CSV from GitHub and cache it locally."""
+@functools.cache
+def _make_unverified_ssl_context():
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+def _meta_path(cache_file):
+    return cache_file + ".meta.json"
+
+
+def _read_meta(cache_file):
+    """Return the stored URL/ETag/Last-Modified for the cached model, or {}."""
+    try:
+        with open(_meta_path(cache_file), "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _write_meta(meta, cache_file):
+    try:
+        with open(_meta_path(cache_file), "w") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass  # Without metadata the next check is just unconditional
+
+
+def download_model(tag=None, force=False, dry_run=False, check_updates=False,
+                   cache_file=None):
+    """Download the data model CSV from GitHub and cache it locally.
+
+    With check_updates, a cached copy is revalidated with a conditional GET
+    (If-None-Match / If-Modified-Since) and kept as-is on 304 Not Modified.
+    cache_file defaults to the module-level CACHE_FILE.
+    """
     url = _get_model_url(tag)
+    cache_file = cache_file or CACHE_FILE
 
     if dry_run:
         print(f"Dry run — would download from:", file=sys.stderr)
         print(f"  {url}", file=sys.stderr)
-        print(f"  Cache: {CACHE_FILE}", file=sys.stderr)
+        print(f"  Cache: {cache_file}", file=sys.stderr)
         return None
 
-    if os.path.exists(CACHE_FILE) and not force:
-        size = os.path.getsize(CACHE_FILE)
-        print(f"Cache exists: {CACHE_FILE} ({size:,} bytes)", file=sys.stderr)
+    if os.path.exists(cache_file) and not force:
+        size = os.path.getsize(cache_file)
+        print(f"Cache exists: {cache_file} ({size:,} bytes)", file=sys.stderr)
         print("Use 'fetch' to re-download.", file=sys.stderr)
-        return CACHE_FILE
+        return cache_file
 
-    os.makedirs(CACHE_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
     print(f"Downloading data model ({tag or MODEL_TAG})...", file=sys.stderr)
 
-    req = urllib.request.Request(url, headers={"User-Agent": "htan-skill/1.0"})
-
+    headers = {"User-Agent": "htan-skill/1.0"}
+    meta = _read_meta(cache_file) if check_updates and os.path.exists(cache_file) else {}
+    if meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    req = urllib.request.Request(url, headers=headers)
+
+    # Stream to a temp file next to the cache and validate from disk, so the
+    # payload is never held in memory; the cache is swapped in atomically.
+    tmp = cache_file + ".tmp"
     try:
-        ctx = _make_ssl_context()
-        with urllib.request.urlopen(req, timeout=60, context=ctx) as resp:
-            data = resp.read()
-    except urllib.error.URLError:
         try:
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
+            ctx = _make_ssl_context()
+            with urllib.request.urlopen(req, timeout=60, context=ctx) as resp:
+                _stream_to_file(resp, tmp)
+                resp_headers = resp.headers
+        except urllib.error.HTTPError:
+            raise
+        except urllib.error.URLError:
+            ctx = _make_unverified_ssl_context()
             with urllib.request.urlopen(req, timeout=60, context=ctx) as resp:
-                data = resp.read()
-        except urllib.error.URLError as e:
-            print(f"Error downloading data model: {e}", file=sys.stderr)
-            sys.exit(1)
+                _stream_to_file(resp, tmp)
+                resp_headers = resp.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print(f"Data model unchanged: {cache_file}", file=sys.stderr)
+            return cache_file
+        print(f"Error downloading data model: {e}", file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        _remove_quietly(tmp)
+        print(f"Error downloading data model: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    text = data.decode("utf-8")
     try:
-        reader = csv.DictReader(io.StringIO(text))
-        rows = list(reader)
-        if not rows:
-            print("Error: Downloaded CSV is empty.", file=sys.stderr)
-            sys.exit(1)
-        if "Attribute" not in reader.fieldnames:
-            print("Error: CSV missing 'Attribute' column.", file=sys.stderr)
-            sys.exit(1)
-    except csv.Error as e:
+        with open(tmp, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            count = sum(1 for rec in reader if rec)
+    except (csv.Error, UnicodeDecodeError) as e:
+        _remove_quietly(tmp)
         print(f"Error: Downloaded file is not valid CSV: {e}", file=sys.stderr)
         sys.exit(1)
+    if not count:
+        _remove_quietly(tmp)
+        print("Error: Downloaded CSV is empty.", file=sys.stderr)
+        sys.exit(1)
+    if "Attribute" not in header:
+        _remove_quietly(tmp)
+        print("Error: CSV missing 'Attribute' column.", file=sys.stderr)
+        sys.exit(1)
+
+    os.replace(tmp, cache_file)
+    _write_meta({
+        "url": url,
+        "etag": resp_headers.get("ETag"),
+        "last_modified": resp_headers.get("Last-Modified"),
+    }, cache_file)
+
+    print(f"Saved {count:,} rows to {cache_file}", file=sys.stderr)
+    return cache_file
+
+
+def _stream_to_file(resp, path):
+    with open(path, "wb") as f:
+        while chunk := resp.read(64 * 1024):
+            f.write(chunk)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_field(value):
+    """Split a comma-separated model cell into stripped, non-empty items.
+
+    Memoized on the raw cell text, so each distinct DependsOn / Valid Values
+    string is split once per process. Returns a tuple; copy before mutating.
+    """
+    if not value:
+        return ()
+    return tuple(item for item in (v.strip() for v in value.split(",")) if item)
+
+
+# The only model CSV columns any query reads; others are dropped at parse time
+_MODEL_COLUMNS = (
+    "Attribute", "Description", "Required", "Parent", "Source", "Validation Rules",
+    "DependsOn", "DependsOn Component", "Valid Values",
+)
+
+
+def _parse_rows(f):
+    """Parse model CSV text into a list of column -> value dicts.
+
+    Binds the column indices once and projects each record onto the
+    _MODEL_COLUMNS present in the header, skipping the per-row bookkeeping
+    csv.DictReader does; blank lines are skipped. Cells are stripped and
+    short records padded with "", so every row has each kept column as a
+    clean string and readers need no None/strip guards.
+    """
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return []
+    idx = {name.strip(): i for i, name in enumerate(header)}
+    kept = [(name, idx[name]) for name in _MODEL_COLUMNS if name in idx]
+    width = len(header)
+    pad = [""] * width
+    rows = []
+    for rec in reader:
+        if not rec:
+            continue
+        if len(rec) < width:
+            rec = rec + pad
+        rows.append({name: rec[i].strip() for name, i in kept})
+    return rows
+
+
+# Bump when _parse_rows changes the shape of rows so stale pickles are ignored
+_ROWS_FORMAT = 3
+
+
+def _rows_path(cache_file):
+    return cache_file + ".pkl"
+
+
+def _read_rows_cache(st, cache_file):
+    """Return the pickled rows if they were parsed from the current CSV, else None.
+
+    The sidecar records the (mtime_ns, size) of the CSV it was built from
+    and the row format version.
+    """
+    try:
+        with open(_rows_path(cache_file), "rb") as f:
+            source, rows = pickle.load(f)
+    except Exception:
+        return None
+    if source != (st.st_mtime_ns, st.st_size, _ROWS_FORMAT):
+        return None
+    return rows
 
-    with open(CACHE_FILE, "wb") as f:
-        f.write(data)
 
-    print(f"Saved {len(rows):,} rows to {CACHE_FILE}", file=sys.stderr)
-    return CACHE_FILE
+def _write_rows_cache(rows, st, cache_file):
+    """Persist the parsed rows next to the CSV so later runs skip csv parsing."""
+    tmp = _rows_path(cache_file) + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(((st.st_mtime_ns, st.st_size, _ROWS_FORMAT), rows), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _rows_path(cache_file))
+    except OSError:
+        _remove_quietly(tmp)  # The pickle is only an optimization
 
 
-def _load_model(tag=None):
+def _load_model(tag=None, cache_file=None):
     """Load the cached model CSV. Auto-downloads on first use."""
-    if not os.path.exists(CACHE_FILE):
+    cache_file = cache_file or CACHE_FILE
+    if not os.path.exists(cache_file):
         print("Model cache not found. Downloading...", file=sys.stderr)
-        download_model(tag=tag, force=True)
+        download_model(tag=tag, force=True, cache_file=cache_file)
 
-    with open(CACHE_FILE, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    st = os.stat(cache_file)
+    rows = _read_rows_cache(st, cache_file)
+    if rows is None:
+        with open(cache_file, "r", encoding="utf-8", newline="") as f:
+            rows = _parse_rows(f)
+        _write_rows_cache(rows, st, cache_file)
 
     print(f"Loaded {len(rows):,} attributes from data model", file=sys.stderr)
     return rows
@@ -122,29 +292,34 @@ def _get_components(rows):
     components = []
     comp_names = set()
     referenced_components = set()
+    # Rows that would be components if some other component references them;
+    # kept in row order so the result matches a second full scan.
+    candidates = []
 
     for row in rows:
-        dep_comp = (row.get("DependsOn Component") or "").strip()
+        dep_comp = row.get("DependsOn Component", "")
+        depends_on = row.get("DependsOn", "")
         if dep_comp:
             name = row["Attribute"]
-            parent = (row.get("Parent") or "").strip()
-            depends_on = [a.strip() for a in (row.get("DependsOn") or "").split(",") if a.strip()]
-            dep_components = [c.strip() for c in dep_comp.split(",") if c.strip()]
+            parent = row.get("Parent", "")
+            attrs = list(_split_field(depends_on))
+            dep_components = list(_split_field(dep_comp))
             components.append({
                 "name": name, "parent": parent,
-                "attribute_count": len(depends_on), "attributes": depends_on,
+                "attribute_count": len(attrs), "attributes": attrs,
                 "depends_on_components": dep_components,
             })
             comp_names.add(name)
-            for dc in dep_components:
-                referenced_components.add(dc)
+            referenced_components.update(dep_components)
+        elif depends_on:
+            candidates.append(row)
 
-    for row in rows:
+    for row in candidates:
         name = row["Attribute"]
         if name in referenced_components and name not in comp_names:
-            depends_on = [a.strip() for a in (row.get("DependsOn") or "").split(",") if a.strip()]
+            depends_on = list(_split_field(row.get("DependsOn")))
             if depends_on:
-                parent = (row.get("Parent") or "").strip()
+                parent = row.get("Parent", "")
                 components.append({
                     "name": name, "parent": parent,
                     "attribute_count": len(depends_on), "attributes": depends_on,
@@ -155,26 +330,41 @@ def _get_components(rows):
     return components
 
 
-def _get_component_attributes(rows, component_name):
+def _index_rows(rows):
+    """Build exact and lowercased Attribute -> row maps (first row wins on a case clash)."""
+    by_name = {row["Attribute"]: row for row in rows}
+    by_name_lower = {}
+    for row in rows:
+        by_name_lower.setdefault(row["Attribute"].lower(), row)
+    return by_name, by_name_lower
+
+
+# Partial-name lookups stop scanning once this many candidates are found;
+# they are only needed to list suggestions in the ambiguity error.
+_MAX_SUGGESTIONS = 10
+
+
+def _get_component_attributes(rows, component_name, comp_name_set=None,
+                              by_name=None, by_name_lower=None):
     """Get all attributes belonging to a component."""
-    all_components = _get_components(rows)
-    comp_name_set = {c["name"].lower() for c in all_components}
+    if comp_name_set is None:
+        comp_name_set = {c["name"].lower() for c in _get_components(rows)}
+    if by_name is None or by_name_lower is None:
+        by_name, by_name_lower = _index_rows(rows)
 
     comp_row = None
-    for row in rows:
-        if row["Attribute"].lower() == component_name.lower():
-            depends_on = (row.get("DependsOn") or "").strip()
-            if depends_on and row["Attribute"].lower() in comp_name_set:
-                comp_row = row
-                break
+    key = component_name.lower()
+    row = by_name_lower.get(key)
+    if row and row.get("DependsOn", "") and key in comp_name_set:
+        comp_row = row
 
     if not comp_row:
-        matches = []
-        for row in rows:
-            depends_on = (row.get("DependsOn") or "").strip()
-            if depends_on and row["Attribute"].lower() in comp_name_set:
-                if component_name.lower() in row["Attribute"].lower():
-                    matches.append(row)
+        matches = list(islice((
+            row for row in rows
+            if key in row["Attribute"].lower()
+            and row.get("DependsOn", "")
+            and row["Attribute"].lower() in comp_name_set
+        ), _MAX_SUGGESTIONS))
         if len(matches) == 1:
             comp_row = matches[0]
         elif matches:
@@ -185,23 +375,21 @@ def _get_component_attributes(rows, component_name):
         else:
             raise ValueError(f"Component '{component_name}' not found. Use components() to list all.")
 
-    attr_names = [a.strip() for a in (comp_row.get("DependsOn") or "").split(",") if a.strip()]
-    attr_lookup = {row["Attribute"]: row for row in rows}
+    attr_names = _split_field(comp_row.get("DependsOn"))
 
     attributes = []
     for name in attr_names:
-        row = attr_lookup.get(name)
+        row = by_name.get(name)
         if row:
-            valid_values = (row.get("Valid Values") or "").strip()
-            vv_list = [v.strip() for v in valid_values.split(",") if v.strip()] if valid_values else []
+            vv_list = _split_field(row.get("Valid Values"))
             attributes.append({
                 "name": name,
-                "description": (row.get("Description") or "").strip(),
-                "required": (row.get("Required") or "").strip().upper() == "TRUE",
+                "description": row.get("Description", ""),
+                "required": row.get("Required", "").upper() == "TRUE",
                 "valid_values_count": len(vv_list),
                 "valid_values_preview": ", ".join(vv_list[:5]) + ("..." if len(vv_list) > 5 else ""),
-                "validation_rules": (row.get("Validation Rules") or "").strip(),
-                "parent": (row.get("Parent") or "").strip(),
+                "validation_rules": row.get("Validation Rules", ""),
+                "parent": row.get("Parent", ""),
             })
         else:
             attributes.append({
@@ -213,35 +401,38 @@ def _get_component_attributes(rows, component_name):
     return comp_row["Attribute"], attributes
 
 
-def _find_attribute(rows, attr_name):
+def _find_attribute(rows, attr_name, by_name_lower=None):
     """Find an attribute row by name (case-insensitive)."""
-    for row in rows:
-        if row["Attribute"].lower() == attr_name.lower():
+    if by_name_lower is not None:
+        row = by_name_lower.get(attr_name.lower())
+        if row is not None:
             return row
-    matches = [row for row in rows if attr_name.lower() in row["Attribute"].lower()]
+    else:
+        for row in rows:
+            if row["Attribute"].lower() == attr_name.lower():
+                return row
+    key = attr_name.lower()
+    matches = list(islice(
+        (row for row in rows if key in row["Attribute"].lower()), _MAX_SUGGESTIONS,
+    ))
     if len(matches) == 1:
         return matches[0]
     elif matches:
         raise ValueError(
             f"Ambiguous attribute name '{attr_name}'. Did you mean: "
-            + ", ".join(m["Attribute"] for m in matches[:10])
+            + ", ".join(m["Attribute"] for m in matches)
         )
     raise ValueError(f"Attribute '{attr_name}' not found. Use search() to find by keyword.")
 
 
-def _get_dependency_chain(rows, component_name):
+def _get_dependency_chain(rows, component_name, comp_lookup=None):
     """Trace the dependency chain for a component."""
-    all_components = _get_components(rows)
-    comp_lookup = {}
-    for comp in all_components:
-        comp_lookup[comp["name"].lower()] = {
-            "name": comp["name"],
-            "depends_on_components": comp["depends_on_components"],
-        }
+    if comp_lookup is None:
+        comp_lookup = {c["name"].lower(): c for c in _get_components(rows)}
 
     start_key = component_name.lower()
     if start_key not in comp_lookup:
-        matches = [k for k in comp_lookup if component_name.lower() in k]
+        matches = list(islice((k for k in comp_lookup if start_key in k), _MAX_SUGGESTIONS))
         if len(matches) == 1:
             start_key = matches[0]
         elif matches:
@@ -254,16 +445,19 @@ def _get_dependency_chain(rows, component_name):
 
     chain = []
     visited = set()
-    queue = [start_key]
+    queue = deque([start_key])
 
     while queue:
-        current = queue.pop(0)
+        current = queue.popleft()
         if current in visited:
             continue
         visited.add(current)
         comp = comp_lookup.get(current)
         if comp:
-            chain.append(comp)
+            chain.append({
+                "name": comp["name"],
+                "depends_on_components": comp["depends_on_components"],
+            })
             for dep in comp["depends_on_components"]:
                 dep_key = dep.lower()
                 if dep_key not in visited:
@@ -272,6 +466,27 @@ def _get_dependency_chain(rows, component_name):
     return chain
 
 
+def _match_fields(keyword_lower, name_lower, desc_lower, valid_lower):
+    """Return the list of field labels containing the (lowercased) keyword."""
+    match_in = []
+    if keyword_lower in name_lower:
+        match_in.append("name")
+    if keyword_lower in desc_lower:
+        match_in.append("description")
+    if keyword_lower in valid_lower:
+        match_in.append("valid values")
+    return match_in
+
+
+def _search_result(row, match_in):
+    return {
+        "name": row["Attribute"],
+        "parent": row.get("Parent", ""),
+        "description": row.get("Description", ""),
+        "match_in": ", ".join(match_in),
+    }
+
+
 # --- DataModel class ---
 
 class DataModel:
@@ -289,72 +504,126 @@ class DataModel:
     def __init__(self, cache_dir=None, tag=None):
         self._tag = tag
         self._rows = None
-        if cache_dir:
-            global CACHE_DIR, CACHE_FILE
-            CACHE_DIR = cache_dir
-            CACHE_FILE = os.path.join(CACHE_DIR, "HTAN.model.csv")
+        self._by_name = None
+        self._by_name_lower = None
+        self._search_index = None
+        self._components = None
+        self._comp_name_set = None
+        self._comp_lookup = None
+        # Per-instance memo for repeat lookups; the public methods return copies
+        # so callers cannot mutate the cached results
+        self._attributes_cached = functools.lru_cache(maxsize=256)(self._attributes)
+        self._describe_cached = functools.lru_cache(maxsize=256)(self._describe)
+        self._valid_values_cached = functools.lru_cache(maxsize=256)(self._valid_values)
+        # None falls back to the module-level CACHE_FILE at load time
+        self._cache_file = os.path.join(cache_dir, "HTAN.model.csv") if cache_dir else None
 
     def _load(self):
         if self._rows is None:
-            self._rows = _load_model(tag=self._tag)
+            self._rows = _load_model(tag=self._tag, cache_file=self._cache_file)
+            self._by_name, self._by_name_lower = _index_rows(self._rows)
+            self._search_index = [
+                (
+                    row["Attribute"].lower(),
+                    row.get("Description", "").lower(),
+                    row.get("Valid Values", "").lower(),
+                    row,
+                )
+                for row in self._rows
+            ]
         return self._rows
 
+    def reload(self):
+        """Drop the loaded rows and derived caches so the next query re-reads the model."""
+        self._rows = None
+        self._by_name = None
+        self._by_name_lower = None
+        self._search_index = None
+        self._components = None
+        self._comp_name_set = None
+        self._comp_lookup = None
+        self._attributes_cached.cache_clear()
+        self._describe_cached.cache_clear()
+        self._valid_values_cached.cache_clear()
+
+    def _components_cached(self):
+        if self._components is None:
+            self._components = _get_components(self._load())
+            self._comp_lookup = {c["name"].lower(): c for c in self._components}
+            self._comp_name_set = set(self._comp_lookup)
+        return self._components
+
     def components(self):
         """List all manifest components. Returns list of component dicts."""
-        return _get_components(self._load())
+        return list(self._components_cached())
 
     def attributes(self, component):
         """List attributes for a component. Returns (component_name, list of attr dicts)."""
-        return _get_component_attributes(self._load(), component)
+        name, attrs = self._attributes_cached(component)
+        return name, [dict(a) for a in attrs]
+
+    def _attributes(self, component):
+        self._components_cached()
+        return _get_component_attributes(
+            self._rows, component, self._comp_name_set, self._by_name, self._by_name_lower,
+        )
 
     def describe(self, attribute):
         """Get full details for one attribute. Returns dict."""
-        row = _find_attribute(self._load(), attribute)
-        valid_values = (row.get("Valid Values") or "").strip()
-        vv_list = [v.strip() for v in valid_values.split(",") if v.strip()] if valid_values else []
-        depends_on = (row.get("DependsOn") or "").strip()
-        dep_list = [d.strip() for d in depends_on.split(",") if d.strip()] if depends_on else []
+        detail = dict(self._describe_cached(attribute))
+        detail["depends_on"] = list(detail["depends_on"])
+        detail["valid_values"] = list(detail["valid_values"])
+        return detail
+
+    def _describe(self, attribute):
+        row = _find_attribute(self._load(), attribute, self._by_name_lower)
         return {
             "attribute": row["Attribute"],
-            "description": (row.get("Description") or "").strip(),
-            "required": (row.get("Required") or "").strip().upper() == "TRUE",
-            "parent": (row.get("Parent") or "").strip(),
-            "source": (row.get("Source") or "").strip(),
-            "validation_rules": (row.get("Validation Rules") or "").strip(),
-            "depends_on": dep_list,
-            "depends_on_component": (row.get("DependsOn Component") or "").strip(),
-            "valid_values": vv_list,
+            "description": row.get("Description", ""),
+            "required": row.get("Required", "").upper() == "TRUE",
+            "parent": row.get("Parent", ""),
+            "source": row.get("Source", ""),
+            "validation_rules": row.get("Validation Rules", ""),
+            "depends_on": _split_field(row.get("DependsOn")),
+            "depends_on_component": row.get("DependsOn Component", ""),
+            "valid_values": _split_field(row.get("Valid Values")),
         }
 
     def valid_values(self, attribute):
         """List valid values for an attribute. Returns list of strings."""
-        row = _find_attribute(self._load(), attribute)
-        valid_values = (row.get("Valid Values") or "").strip()
-        return [v.strip() for v in valid_values.split(",") if v.strip()] if valid_values else []
+        return list(self._valid_values_cached(attribute))
+
+    def _valid_values(self, attribute):
+        row = _find_attribute(self._load(), attribute, self._by_name_lower)
+        return _split_field(row.get("Valid Values"))
 
     def search(self, keyword):
         """Search attributes by keyword. Returns list of match dicts."""
         keyword_lower = keyword.lower()
+        self._load()
         results = []
-        for row in self._load():
-            name = row["Attribute"]
-            desc = (row.get("Description") or "").strip()
-            valid = (row.get("Valid Values") or "").strip()
-            parent = (row.get("Parent") or "").strip()
-
-            match_in = []
-            if keyword_lower in name.lower():
-                match_in.append("name")
-            if keyword_lower in desc.lower():
-                match_in.append("description")
-            if keyword_lower in valid.lower():
-                match_in.append("valid values")
-
+        for name_lower, desc_lower, valid_lower, row in self._search_index:
+            match_in = _match_fields(keyword_lower, name_lower, desc_lower, valid_lower)
             if match_in:
-                results.append({
-                    "name": name, "parent": parent, "description": desc,
-                    "match_in": ", ".join(match_in),
-                })
+                results.append(_search_result(row, match_in))
+        return results
+
+    def search_many(self, keywords):
+        """Search several keywords in one pass. Returns {keyword: list of match dicts}."""
+        results = {kw: [] for kw in keywords}
+        lowered = [(kw, kw.lower()) for kw in results]
+        if not lowered:
+            return results
+        self._load()
+        any_keyword = re.compile("|".join(re.escape(kw_lower) for _, kw_lower in lowered))
+        for name_lower, desc_lower, valid_lower, row in self._search_index:
+            if not (any_keyword.search(name_lower) or any_keyword.search(desc_lower)
+                    or any_keyword.search(valid_lower)):
+                continue
+            for kw, kw_lower in lowered:
+                match_in = _match_fields(kw_lower, name_lower, desc_lower, valid_lower)
+                if match_in:
+                    results[kw].append(_search_result(row, match_in))
         return results
 
     def required(self, component):
@@ -364,62 +633,73 @@ class DataModel:
 
     def deps(self, component):
         """Show dependency chain for a component. Returns list of component dicts."""
-        return _get_dependency_chain(self._load(), component)
+        self._components_cached()
+        return _get_dependency_chain(self._load(), component, self._comp_lookup)
 
 
 # --- Formatting helpers ---
 
+# Component category match tables (lowercase substrings), checked in order
+_CLINICAL_RE = re.compile(
+    r"demographics|diagnosis|exposure|follow|therapy|molecular test|family history"
+    r"|patient|clinical"
+)
+_SPATIAL_RE = re.compile(r"visium|merfish|slide-seq|geomx|nanostring|xenium|spatial")
+_IMAGING_RE = re.compile(
+    r"imaging|cycif|codex|mibi|ihc|h&e|hematoxylin|electron microscopy|imc|saber"
+)
+_SEQUENCING_RE = re.compile(
+    r"scrna|scatac|snrna|cite-seq|bulkrna|bulkwes|bulkwgs|hi-c|methylation|scdna"
+    r"|rna-seq|atac-seq|wes|wgs"
+)
+_PROTEOMICS_RE = re.compile(r"mass spec|rppa|label free|isobaric")
+
+
+@functools.lru_cache(maxsize=2048)
 def _categorize_component(name, parent):
     name_lower = name.lower()
     parent_lower = parent.lower() if parent else ""
 
-    if any(x in name_lower for x in ["demographics", "diagnosis", "exposure", "follow",
-                                       "therapy", "molecular test", "family history",
-                                       "patient", "clinical"]):
+    if _CLINICAL_RE.search(name_lower):
         return "Clinical"
     if "biospecimen" in name_lower:
         return "Biospecimen"
-    if any(x in name_lower for x in ["visium", "merfish", "slide-seq", "geomx",
-                                       "nanostring", "xenium", "spatial"]):
+    if _SPATIAL_RE.search(name_lower):
         return "Spatial Transcriptomics"
-    if any(x in name_lower for x in ["imaging", "cycif", "codex", "mibi", "ihc",
-                                       "h&e", "hematoxylin", "electron microscopy",
-                                       "imc", "saber"]):
+    if _IMAGING_RE.search(name_lower):
         return "Imaging"
-    if any(x in name_lower for x in ["scrna", "scatac", "snrna", "cite-seq",
-                                       "bulkrna", "bulkwes", "bulkwgs", "hi-c",
-                                       "methylation", "scdna", "rna-seq", "atac-seq",
-                                       "wes", "wgs"]):
+    if _SEQUENCING_RE.search(name_lower):
         return "Sequencing"
-    if any(x in name_lower for x in ["mass spec", "rppa", "label free", "isobaric"]):
+    if _PROTEOMICS_RE.search(name_lower):
         return "Proteomics"
     if "sequencing" in parent_lower or "assay" in parent_lower:
         return "Sequencing"
     return "Other"
 
 
+_CATEGORY_ORDER = ("Clinical", "Biospecimen", "Sequencing", "Imaging",
+                   "Spatial Transcriptomics", "Proteomics", "Other")
+
+
 def _format_components_text(components):
     categorized = {}
     for comp in components:
         cat = _categorize_component(comp["name"], comp["parent"])
         categorized.setdefault(cat, []).append(comp)
 
-    lines = []
-    cat_order = ["Clinical", "Biospecimen", "Sequencing", "Imaging",
-                 "Spatial Transcriptomics", "Proteomics", "Other"]
-    for cat in cat_order:
-        comps = categorized.get(cat, [])
-        if not comps:
-            continue
-        lines.append(f"\n=== {cat} ({len(comps)} components) ===")
-        lines.append(f"{'Component':<45} {'Attrs':>5}  {'Parent'}")
-        lines.append(f"{'-'*45} {'-'*5}  {'-'*30}")
-        for comp in sorted(comps, key=lambda c: c["name"]):
-            name = comp["name"][:45]
-            lines.append(f"{name:<45} {comp['attribute_count']:>5}  {comp['parent']}")
-
-    lines.append(f"\nTotal: {len(components)} components")
-    return "\n".join(lines)
+    def iter_lines():
+        for cat in _CATEGORY_ORDER:
+            comps = categorized.get(cat)
+            if not comps:
+                continue
+            yield f"\n=== {cat} ({len(comps)} components) ==="
+            yield f"{'Component':<45} {'Attrs':>5}  {'Parent'}"
+            yield f"{'-'*45} {'-'*5}  {'-'*30}"
+            for comp in sorted(comps, key=itemgetter("name")):
+                yield f"{comp['name'][:45]:<45} {comp['attribute_count']:>5}  {comp['parent']}"
+        yield f"\nTotal: {len(components)} components"
+
+    return "\n".join(iter_lines())
 
 
 def _format_attributes_text(component_name, attributes):
@@ -514,6 +794,8 @@ def cli_main(argv=None):
     sp_fetch.add_argument("--tag", default=None)
     sp_fetch.add_argument("--format", choices=["text", "json"], default="text", help=argparse.SUPPRESS)
     sp_fetch.add_argument("--dry-run", action="store_true")
+    sp_fetch.add_argument("--check-updates", action="store_true",
+                          help="Keep the cached CSV if the server reports it unchanged")
 
     sp_comp = subparsers.add_parser("components", help="List all manifest components")
     add_common_args(sp_comp)
@@ -546,7 +828,8 @@ def cli_main(argv=None):
     dm = DataModel(tag=args.tag if hasattr(args, "tag") else None)
 
     if args.command == "fetch":
-        download_model(tag=args.tag, force=True, dry_run=args.dry_run)
+        download_model(tag=args.tag, force=True, dry_run=args.dry_run,
+                       check_updates=args.check_updates)
         if not args.dry_run:
             print(f"Model version: {args.tag or MODEL_TAG}", file=sys.stderr)
     elif args.command == "components":
@@ -569,7 +852,7 @@ def cli_main(argv=None):
             print(_format_describe_text(detail))
     elif args.command == "valid-values":
         vv = dm.valid_values(args.attribute)
-        row = _find_attribute(dm._load(), args.attribute)
+        row = _find_attribute(dm._load(), args.attribute, dm._by_name_lower)
         attr_name = row["Attribute"]
         if args.format == "json":
             print(json.dumps({"attribute": attr_name, "valid_values": vv}, indent=2))
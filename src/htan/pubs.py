@@ -1,6 +1,7 @@
 """Search HTAN publications on PubMed and PubMed Central.
 
-Uses NCBI E-utilities REST API — no external dependencies required (stdlib only).
+Uses NCBI E-utilities REST API — no external dependencies required (stdlib only;
+lxml is used for XML parsing when installed).
 
 Usage as library:
     from htan.pubs import search, fetch, fulltext
@@ -14,13 +15,26 @@ Usage as CLI:
 """
 
 import argparse
-import json
+import gzip
+import http.client
+import io
+import random
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from htan import _fastjson, _http
+
+# libxml2-backed parsing when installed (pip install htan[fast]); the stdlib
+# ElementTree exposes the same find/findall/itertext API used below.
+try:
+    from lxml import etree as ET
+    _ITERPARSE_KWARGS = {"resolve_entities": False, "no_network": True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_KWARGS = {}
 
 
 EUTILS_BASE = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
@@ -28,6 +42,17 @@ TOOL_NAME = "htan_skill"
 TOOL_EMAIL = "htan-skill@example.com"
 REQUEST_DELAY = 0.34  # seconds between requests (3 req/sec limit without API key)
 DEFAULT_TIMEOUT = 60
+EFETCH_BATCH_SIZE = 200
+MAX_GET_QUERY_LENGTH = 1024  # longer parameter strings (e.g. efetch id lists) are POSTed
+MAX_CONCURRENT_REQUESTS = 3  # efetch batches in flight at once (matches the req/sec cap)
+MAX_PARSE_PROCESSES = 4  # cap on fetch(processes=N) parser worker processes
+
+MAX_RETRIES = 5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Start time of the most recent request across all threads, guarded by _RATE_LOCK
+_RATE_LOCK = threading.Lock()
+_last_request = 0.0
 
 # HTAN Phase 1 grant numbers (CA233xxx series)
 PHASE1_GRANTS = [
@@ -68,16 +93,25 @@ HTAN_AUTHORS = [
 ]
 
 
+# The grant and author lists are static; join their query clauses once
+_GRANT_QUERY = " OR ".join(f"{g}[gr]" for g in ALL_GRANTS)
+_ALL_AUTHORS_QUERY = " OR ".join(f"{a}[LASTAU]" for a in HTAN_AUTHORS)
+
+
+class EutilsError(Exception):
+    """Error from NCBI E-utilities (HTTP errors, connection failures, timeouts)."""
+
+
 def build_grant_query():
     """Build PubMed grant number query string."""
-    return " OR ".join(f"{g}[gr]" for g in ALL_GRANTS)
+    return _GRANT_QUERY
 
 
 def build_author_query(author=None):
     """Build PubMed author query. If author is given, filter to that author only."""
     if author:
         return f"{author}[LASTAU]"
-    return " OR ".join(f"{a}[LASTAU]" for a in HTAN_AUTHORS)
+    return _ALL_AUTHORS_QUERY
 
 
 def build_search_query(keyword=None, author=None, year=None):
@@ -92,87 +126,193 @@ def build_search_query(keyword=None, author=None, year=None):
     return query
 
 
+_EUTILS_URL = urllib.parse.urlsplit(EUTILS_BASE)
+
+
+def _send(path, timeout, body=None):
+    """Request path on the E-utilities host; returns (status, reason, headers, body bytes).
+
+    Sends a form-encoded POST when body is given, otherwise a GET, over the
+    shared keep-alive connection, and accepts gzip-compressed responses.
+    """
+    method = "GET" if body is None else "POST"
+    headers = {"User-Agent": f"{TOOL_NAME}/1.0", "Accept-Encoding": "gzip"}
+    if body is not None:
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+    status, reason, resp_headers, data = _http.request(
+        method, _EUTILS_URL.netloc, path, body, headers, timeout)
+    if resp_headers.get("Content-Encoding") == "gzip":
+        data = gzip.decompress(data)
+    return status, reason, resp_headers, data
+
+
+def _rate_limit():
+    """Wait until REQUEST_DELAY has passed since the previous request started.
+
+    Time already spent on the previous request counts toward the delay, and
+    the shared lock spaces request starts across threads.
+    """
+    global _last_request
+    with _RATE_LOCK:
+        wait = REQUEST_DELAY - (time.monotonic() - _last_request)
+        if wait > 0:
+            time.sleep(wait)
+        _last_request = time.monotonic()
+
+
+def _retry_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt (0-based), capped at 60.
+
+    Honors a numeric Retry-After header; otherwise exponential backoff with jitter.
+    """
+    if retry_after:
+        try:
+            return min(60.0, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(60.0, 2 ** attempt + random.random())
+
+
 def eutils_request(endpoint, params, timeout=DEFAULT_TIMEOUT):
-    """Make a rate-limited request to NCBI E-utilities."""
+    """Make a rate-limited request to NCBI E-utilities.
+
+    Transient failures (HTTP 429/5xx, timeouts, dropped connections) are
+    retried up to MAX_RETRIES times with backoff.
+
+    Raises:
+        EutilsError: If the request fails or keeps failing after retries.
+    """
     params["tool"] = TOOL_NAME
     params["email"] = TOOL_EMAIL
-    url = f"{EUTILS_BASE}/{endpoint}?{urllib.parse.urlencode(params)}"
-    time.sleep(REQUEST_DELAY)
-    try:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return response.read().decode("utf-8")
-    except urllib.error.HTTPError as e:
-        print(f"Error: HTTP {e.code} from E-utilities: {e.reason}", file=sys.stderr)
-        sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"Error: Could not connect to E-utilities: {e.reason}", file=sys.stderr)
-        sys.exit(1)
-    except TimeoutError:
-        print(f"Error: PubMed request timed out after {timeout}s.", file=sys.stderr)
-        sys.exit(1)
+    query = urllib.parse.urlencode(params)
+    path = f"{_EUTILS_URL.path}/{endpoint}"
+    body = None
+    if len(query) > MAX_GET_QUERY_LENGTH:
+        body = query.encode("ascii")
+    else:
+        path = f"{path}?{query}"
+    for attempt in range(MAX_RETRIES + 1):
+        retryable = attempt < MAX_RETRIES
+        _rate_limit()
+        try:
+            status, reason, headers, data = _send(path, timeout, body)
+        except TimeoutError:
+            if retryable:
+                time.sleep(_retry_delay(attempt))
+                continue
+            raise EutilsError(f"PubMed request timed out after {timeout}s.")
+        except ConnectionError as e:
+            if retryable:
+                time.sleep(_retry_delay(attempt))
+                continue
+            raise EutilsError(f"Could not connect to E-utilities: {e}")
+        except (OSError, http.client.HTTPException) as e:
+            raise EutilsError(f"Could not connect to E-utilities: {e}")
+        if status < 300:
+            return data.decode("utf-8")
+        if status in RETRY_STATUSES and retryable:
+            delay = _retry_delay(attempt, headers.get("Retry-After"))
+            print(f"E-utilities returned HTTP {status}; retrying in {delay:.1f}s...", file=sys.stderr)
+            time.sleep(delay)
+            continue
+        raise EutilsError(f"HTTP {status} from E-utilities: {reason}")
+
+
+def _first_children(elem):
+    """Map each child tag to its first child element, in one pass over elem.
+
+    Equivalent to calling elem.find(tag) for every tag, without re-scanning
+    the children per lookup.
+    """
+    found = {}
+    for child in elem:
+        found.setdefault(child.tag, child)
+    return found
+
+
+def _text(elem):
+    """Return all text inside elem, skipping the itertext() walk for leaf elements."""
+    if len(elem) == 0:
+        return elem.text or ""
+    return "".join(elem.itertext())
 
 
 def _parse_article_xml(article_elem):
     """Parse a PubmedArticle XML element into a dict."""
     try:
-        medline = article_elem.find("MedlineCitation")
+        top = _first_children(article_elem)
+        medline = top.get("MedlineCitation")
         if medline is None:
             return None
 
-        pmid_elem = medline.find("PMID")
+        citation = _first_children(medline)
+        pmid_elem = citation.get("PMID")
         pmid = pmid_elem.text if pmid_elem is not None else ""
 
-        article = medline.find("Article")
+        article = citation.get("Article")
         if article is None:
             return None
 
-        title_elem = article.find("ArticleTitle")
-        title = "".join(title_elem.itertext()) if title_elem is not None else ""
-
+        title = journal = year = ""
         authors = []
-        author_list = article.find("AuthorList")
-        if author_list is not None:
-            for author_elem in author_list.findall("Author"):
-                last = author_elem.find("LastName")
-                initials = author_elem.find("Initials")
-                if last is not None:
-                    name = last.text
-                    if initials is not None:
-                        name += f" {initials.text}"
-                    authors.append(name)
-
-        journal_elem = article.find("Journal/Title")
-        journal = journal_elem.text if journal_elem is not None else ""
-
-        year = ""
-        pub_date = article.find("Journal/JournalIssue/PubDate")
-        if pub_date is not None:
-            year_elem = pub_date.find("Year")
-            if year_elem is not None:
-                year = year_elem.text
-            else:
-                medline_date = pub_date.find("MedlineDate")
-                if medline_date is not None and medline_date.text:
-                    year = medline_date.text[:4]
-
         abstract_parts = []
-        abstract_elem = article.find("Abstract")
-        if abstract_elem is not None:
-            for abs_text in abstract_elem.findall("AbstractText"):
-                label = abs_text.get("Label", "")
-                text = "".join(abs_text.itertext()) or ""
-                if label:
-                    abstract_parts.append(f"{label}: {text}")
-                else:
-                    abstract_parts.append(text)
+        # Single pass over the Article children, dispatching on tag
+        seen = set()
+        for child in article:
+            tag = child.tag
+            if tag in seen:
+                continue
+            seen.add(tag)
+            if tag == "ArticleTitle":
+                title = _text(child)
+            elif tag == "AuthorList":
+                for author_elem in child:
+                    if author_elem.tag != "Author":
+                        continue
+                    name_parts = _first_children(author_elem)
+                    last = name_parts.get("LastName")
+                    initials = name_parts.get("Initials")
+                    if last is not None:
+                        name = last.text
+                        if initials is not None:
+                            name += f" {initials.text}"
+                        authors.append(name)
+            elif tag == "Journal":
+                journal_parts = _first_children(child)
+                journal_title = journal_parts.get("Title")
+                if journal_title is not None:
+                    journal = journal_title.text
+                issue = journal_parts.get("JournalIssue")
+                pub_date = _first_children(issue).get("PubDate") if issue is not None else None
+                if pub_date is not None:
+                    date_parts = _first_children(pub_date)
+                    year_elem = date_parts.get("Year")
+                    if year_elem is not None:
+                        year = year_elem.text
+                    else:
+                        medline_date = date_parts.get("MedlineDate")
+                        if medline_date is not None and medline_date.text:
+                            year = medline_date.text[:4]
+            elif tag == "Abstract":
+                for abs_text in child:
+                    if abs_text.tag != "AbstractText":
+                        continue
+                    label = abs_text.get("Label", "")
+                    text = _text(abs_text)
+                    if label:
+                        abstract_parts.append(f"{label}: {text}")
+                    else:
+                        abstract_parts.append(text)
         abstract = "\n".join(abstract_parts)
 
         doi = ""
-        article_id_list = article_elem.find("PubmedData/ArticleIdList")
+        pubmed_data = top.get("PubmedData")
+        article_id_list = (
+            _first_children(pubmed_data).get("ArticleIdList") if pubmed_data is not None else None
+        )
         if article_id_list is not None:
-            for aid in article_id_list.findall("ArticleId"):
-                if aid.get("IdType") == "doi":
+            for aid in article_id_list:
+                if aid.tag == "ArticleId" and aid.get("IdType") == "doi":
                     doi = aid.text or ""
                     break
 
@@ -206,7 +346,7 @@ def search(keyword=None, author=None, year=None, max_results=100, timeout=DEFAUL
         "retmode": "json", "sort": "pub_date",
     }
     raw = eutils_request("esearch.fcgi", params, timeout=timeout)
-    data = json.loads(raw)
+    data = _fastjson.loads(raw)
     result = data.get("esearchresult", {})
     count = int(result.get("count", 0))
     pmids = result.get("idlist", [])
@@ -218,12 +358,16 @@ def search(keyword=None, author=None, year=None, max_results=100, timeout=DEFAUL
     return fetch(pmids, timeout=timeout)
 
 
-def fetch(pmids, timeout=DEFAULT_TIMEOUT):
+def fetch(pmids, timeout=DEFAULT_TIMEOUT, processes=0):
     """Fetch article details for a list of PMIDs.
 
     Args:
         pmids: Single PMID string or list of PMIDs.
         timeout: HTTP timeout in seconds.
+        processes: Parse multi-batch fetches in up to this many worker
+            processes (at most MAX_PARSE_PROCESSES). Off by default; the
+            workers re-import the calling script, which therefore needs an
+            ``if __name__ == "__main__":`` guard.
 
     Returns:
         List of article dicts.
@@ -233,19 +377,66 @@ def fetch(pmids, timeout=DEFAULT_TIMEOUT):
     if not pmids:
         return []
 
-    articles = []
-    batch_size = 200
-    for i in range(0, len(pmids), batch_size):
-        batch = pmids[i : i + batch_size]
-        params = {"db": "pubmed", "id": ",".join(batch), "rettype": "xml", "retmode": "xml"}
-        raw = eutils_request("efetch.fcgi", params, timeout=timeout)
-        root = ET.fromstring(raw)
-        for article_elem in root.findall(".//PubmedArticle"):
-            article = _parse_article_xml(article_elem)
-            if article:
-                articles.append(article)
+    batches = [pmids[i : i + EFETCH_BATCH_SIZE] for i in range(0, len(pmids), EFETCH_BATCH_SIZE)]
+    if len(batches) == 1:
+        return _fetch_batch(batches[0], timeout)
+
+    # Batches are I/O-bound; overlap them while eutils_request keeps the
+    # request starts spaced by REQUEST_DELAY. map() preserves batch order.
+    workers = min(MAX_CONCURRENT_REQUESTS, len(batches))
+    if processes > 0:
+        procs = min(processes, MAX_PARSE_PROCESSES, len(batches))
+        return _fetch_parse_in_processes(batches, workers, procs, timeout)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        results = ex.map(lambda batch: _fetch_batch(batch, timeout), batches)
+        return [article for batch_articles in results for article in batch_articles]
+
+
+def _fetch_parse_in_processes(batches, workers, procs, timeout):
+    """Fetch batches on threads and parse each in one of procs worker processes.
+
+    XML parsing holds the GIL, so each download is handed to the process
+    pool as it completes, overlapping parsing with the remaining requests.
+    """
+    import multiprocessing
+
+    # spawn: forking while the fetch threads are running is unsafe
+    with ThreadPoolExecutor(max_workers=workers) as io_pool, ProcessPoolExecutor(
+        max_workers=procs, mp_context=multiprocessing.get_context("spawn")
+    ) as cpu_pool:
+        raws = io_pool.map(lambda batch: _fetch_raw(batch, timeout), batches)
+        parsed = [cpu_pool.submit(_parse_batch, raw) for raw in raws]
+        return [article for future in parsed for article in future.result()]
 
-    return articles
+
+def _fetch_raw(pmids, timeout):
+    """Fetch one efetch batch of PMIDs. Returns the XML as UTF-8 bytes."""
+    params = {"db": "pubmed", "id": ",".join(pmids), "rettype": "xml", "retmode": "xml"}
+    return eutils_request("efetch.fcgi", params, timeout=timeout).encode("utf-8")
+
+
+def _parse_batch(data):
+    """Parse efetch XML bytes into a list of article dicts."""
+    return list(_iter_articles(data))
+
+
+def _fetch_batch(pmids, timeout):
+    """Fetch and parse one efetch batch of PMIDs."""
+    return _parse_batch(_fetch_raw(pmids, timeout))
+
+
+def _iter_articles(data):
+    """Yield parsed articles from efetch XML bytes.
+
+    Parses incrementally and clears each PubmedArticle once converted, so
+    only one article's element tree is alive at a time.
+    """
+    for _, elem in ET.iterparse(io.BytesIO(data), events=("end",), **_ITERPARSE_KWARGS):
+        if elem.tag == "PubmedArticle":
+            article = _parse_article_xml(elem)
+            elem.clear()
+            if article:
+                yield article
 
 
 def fulltext(query, max_results=50, timeout=DEFAULT_TIMEOUT):
@@ -267,7 +458,7 @@ def fulltext(query, max_results=50, timeout=DEFAULT_TIMEOUT):
         "retmode": "json", "sort": "pub_date",
     }
     raw = eutils_request("esearch.fcgi", params, timeout=timeout)
-    data = json.loads(raw)
+    data = _fastjson.loads(raw)
     result = data.get("esearchresult", {})
     count = int(result.get("count", 0))
     pmc_ids = result.get("idlist", [])
@@ -278,7 +469,7 @@ def fulltext(query, max_results=50, timeout=DEFAULT_TIMEOUT):
 
     params = {"db": "pmc", "id": ",".join(pmc_ids), "retmode": "json"}
     raw = eutils_request("esummary.fcgi", params, timeout=timeout)
-    data = json.loads(raw)
+    data = _fastjson.loads(raw)
     summaries = data.get("result", {})
 
     articles = []
@@ -356,6 +547,8 @@ def cli_main(argv=None):
     sp_fetch.add_argument("pmids", nargs="+", help="PubMed IDs to fetch")
     sp_fetch.add_argument("--format", "-f", choices=["text", "json"], default="text", help="Output format")
     sp_fetch.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT)
+    sp_fetch.add_argument("--processes", type=int, default=0,
+                          help=f"Parse large fetches in N worker processes (max {MAX_PARSE_PROCESSES})")
     sp_fetch.add_argument("--dry-run", action="store_true")
 
     sp_full = subparsers.add_parser("fulltext", help="Search HTAN articles in PubMed Central")
@@ -367,6 +560,15 @@ def cli_main(argv=None):
 
     args = parser.parse_args(argv)
 
+    try:
+        _run_command(args)
+    except EutilsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _run_command(args):
+    """Dispatch a parsed pubs subcommand."""
     if args.command == "search":
         query = build_search_query(keyword=args.keyword, author=args.author, year=args.year)
         if args.dry_run:
@@ -382,7 +584,7 @@ def cli_main(argv=None):
             print("No articles found.", file=sys.stderr)
             return
         if args.format == "json":
-            print(json.dumps(articles, indent=2))
+            print(_fastjson.dumps_indented(articles))
         else:
             for a in articles:
                 print(format_article_text(a))
@@ -392,12 +594,12 @@ def cli_main(argv=None):
         if args.dry_run:
             print(f"Dry run — would fetch PMIDs: {', '.join(args.pmids)}", file=sys.stderr)
             return
-        articles = fetch(args.pmids, timeout=args.timeout)
+        articles = fetch(args.pmids, timeout=args.timeout, processes=args.processes)
         if not articles:
             print("No articles found.", file=sys.stderr)
             return
         if args.format == "json":
-            print(json.dumps(articles, indent=2))
+            print(_fastjson.dumps_indented(articles))
         else:
             for a in articles:
                 print(format_article_text(a))
@@ -418,7 +620,7 @@ def cli_main(argv=None):
             print("No PMC articles found.", file=sys.stderr)
             return
         if args.format == "json":
-            print(json.dumps(articles, indent=2))
+            print(_fastjson.dumps_indented(articles))
         else:
             for a in articles:
                 print(format_article_text(a))
@@ -16,11 +16,12 @@ Usage as CLI:
 """
 
 import argparse
-import csv
-import io
+import functools
 import json
+import os
 import re
 import sys
+import time
 
 
 HTAN_DATASET = "isb-cgc-bq.HTAN"
@@ -32,7 +33,15 @@ BLOCKED_SQL_KEYWORDS = [
     "ALTER", "TRUNCATE", "MERGE", "GRANT", "REVOKE",
 ]
 ALLOWED_SQL_STARTS = ["SELECT", "WITH", "SHOW", "EXPLAIN"]
+_BLOCKED_SQL_RE = re.compile(r"\b(?:" + "|".join(BLOCKED_SQL_KEYWORDS) + r")\b")
+_ALLOWED_SQL_START_SET = frozenset(ALLOWED_SQL_STARTS)
 TABLE_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_]+$")
+# LIMIT followed by a row count or a query parameter
+_LIMIT_RE = re.compile(r"\bLIMIT\s+(?:\d|@)", re.IGNORECASE)
+
+# Table lists and schemas only change between HTAN releases
+BQ_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "htan-skill", "bq")
+BQ_CACHE_TTL = 24 * 60 * 60
 
 # Key table schemas for natural language query context
 TABLE_SCHEMAS_SUMMARY = """
@@ -90,33 +99,187 @@ Table: scRNAseq_level1_metadata_current (also level2, level3, level4)
 """.strip()
 
 
+# Standard SQL type names (INFORMATION_SCHEMA) -> SchemaField.field_type names (get_table)
+_LEGACY_TYPE_NAMES = {"INT64": "INTEGER", "FLOAT64": "FLOAT", "BOOL": "BOOLEAN", "STRUCT": "RECORD"}
+
+
+def _schema_field_type(data_type):
+    """Map an INFORMATION_SCHEMA data_type to (SchemaField type, mode-is-REPEATED).
+
+    ``ARRAY<INT64>`` becomes ``("INTEGER", True)``; type parameters and
+    nested field lists (``STRING(10)``, ``STRUCT<a INT64>``) are dropped, as
+    ``SchemaField.field_type`` carries only the base name.
+    """
+    repeated = data_type.startswith("ARRAY<")
+    if repeated:
+        data_type = data_type[len("ARRAY<"):-1]
+    base = re.match(r"[A-Z0-9_]+", data_type.strip().upper()).group(0)
+    return _LEGACY_TYPE_NAMES.get(base, base), repeated
+
+
 class BigQueryError(Exception):
     """BigQuery operation error."""
     pass
 
 
+# sqlglot expression class names that write or change state -> keyword to report
+_WRITE_EXPRESSIONS = {
+    "Delete": "DELETE", "Drop": "DROP", "Update": "UPDATE", "Insert": "INSERT",
+    "Create": "CREATE", "Alter": "ALTER", "AlterTable": "ALTER", "Merge": "MERGE",
+    "TruncateTable": "TRUNCATE", "Grant": "GRANT", "Revoke": "REVOKE",
+}
+_READ_ROOTS = ("Select", "Union", "Intersect", "Except", "Subquery", "Show")
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_sql(sql):
+    """Parse SQL with sqlglot (BigQuery dialect), shared by the safety and LIMIT checks.
+
+    Returns a tuple of statement trees, or None if sqlglot is not installed
+    or cannot parse the SQL.
+    """
+    try:
+        import sqlglot
+    except ImportError:
+        return None
+    import logging
+    # sqlglot logs a warning for statements it keeps as raw commands (EXPLAIN, SHOW)
+    logger = logging.getLogger("sqlglot")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        return tuple(s for s in sqlglot.parse(sql, read="bigquery") if s is not None)
+    except Exception:
+        return None
+    finally:
+        logger.setLevel(level)
+
+
+def _validate_sql_ast(sql):
+    """Check SQL statement types with sqlglot, if installed.
+
+    Returns (safe, reason), or None when sqlglot is unavailable or cannot
+    fully classify the SQL (parse errors, raw commands such as EXPLAIN);
+    the caller then falls back to the keyword check.
+    """
+    statements = _parse_sql(sql)
+    if not statements:
+        return None
+    from sqlglot import exp
+
+    write_types = tuple(
+        cls for cls in (getattr(exp, name, None) for name in _WRITE_EXPRESSIONS) if cls
+    )
+    read_types = tuple(cls for cls in (getattr(exp, name, None) for name in _READ_ROOTS) if cls)
+    for stmt in statements:
+        if isinstance(stmt, exp.Command) or stmt.find(exp.Command):
+            return None
+        write = stmt if isinstance(stmt, write_types) else stmt.find(*write_types)
+        if write is not None:
+            return False, f"Blocked SQL keyword: {_WRITE_EXPRESSIONS[type(write).__name__]}"
+        if not isinstance(stmt, read_types):
+            return False, f"SQL must start with one of: {', '.join(ALLOWED_SQL_STARTS)}"
+    return True, "OK"
+
+
 def validate_sql_safety(sql):
-    """Validate that SQL is read-only. Returns (safe, reason)."""
-    normalized = " ".join(sql.upper().split())
-    for keyword in BLOCKED_SQL_KEYWORDS:
-        pattern = r"\b" + keyword + r"\b"
-        if re.search(pattern, normalized):
-            return False, f"Blocked SQL keyword: {keyword}"
-    first_word = normalized.split()[0] if normalized.split() else ""
-    if first_word not in ALLOWED_SQL_STARTS:
+    """Validate that SQL is read-only. Returns (safe, reason).
+
+    Uses a sqlglot parse when available, so keywords inside string literals
+    or identifiers are not mistaken for statements; otherwise (or when the
+    parse is inconclusive) rejects any blocked keyword appearing as a word.
+    """
+    result = _validate_sql_ast(sql)
+    if result is not None:
+        return result
+    upper = sql.upper()
+    match = _BLOCKED_SQL_RE.search(upper)
+    if match:
+        return False, f"Blocked SQL keyword: {match.group(0)}"
+    words = upper.split(None, 1)
+    first_word = words[0] if words else ""
+    if first_word not in _ALLOWED_SQL_START_SET:
         return False, f"SQL must start with one of: {', '.join(ALLOWED_SQL_STARTS)}"
     return True, "OK"
 
 
+def _needs_limit(sql):
+    """Whether sql is a query whose outermost SELECT has no LIMIT.
+
+    With sqlglot, a LIMIT inside a CTE or subquery does not count; without
+    it (or if parsing fails), any LIMIT clause in the text does. Statements
+    other than SELECT/WITH queries never need one.
+    """
+    statements = _parse_sql(sql)
+    if statements and len(statements) == 1:
+        from sqlglot import exp
+        query_type = getattr(exp, "Query", None) or exp.Subqueryable
+        root = statements[0]
+        return isinstance(root, query_type) and root.args.get("limit") is None
+    words = sql.split(None, 1)
+    if not words or words[0].upper() not in ("SELECT", "WITH"):
+        return False
+    return not _LIMIT_RE.search(sql)
+
+
 def _ensure_limit(sql, limit=DEFAULT_LIMIT):
-    normalized = " ".join(sql.upper().split())
-    if "LIMIT" not in normalized:
+    if _needs_limit(sql):
         sql = sql.rstrip().rstrip(";")
         sql += f"\nLIMIT {limit}"
         print(f"Auto-applied LIMIT {limit}", file=sys.stderr)
     return sql
 
 
+def _checked_sql(sql, limit=DEFAULT_LIMIT):
+    """Reject unsafe SQL and apply the default LIMIT. Returns the SQL to run."""
+    safe, reason = validate_sql_safety(sql)
+    if not safe:
+        raise BigQueryError(reason)
+    return _ensure_limit(sql, limit)
+
+
+def _resolve_table(table, versioned=False):
+    """Validate a table name and apply the default suffix. Returns (dataset, table)."""
+    if not TABLE_NAME_PATTERN.match(table):
+        raise BigQueryError(f"Invalid table name '{table}'.")
+    dataset = HTAN_DATASET_VERSIONED if versioned else HTAN_DATASET
+    if not versioned and not re.search(r"_(current|r\d+(_v\d+)?)$", table):
+        table = f"{table}_current"
+    return dataset, table
+
+
+def _cache_path(kind, name):
+    return os.path.join(BQ_CACHE_DIR, f"{kind}-{name}.json")
+
+
+def _read_cached(kind, name):
+    """Return a cached metadata result younger than BQ_CACHE_TTL, or None."""
+    path = _cache_path(kind, name)
+    try:
+        if time.time() - os.path.getmtime(path) >= BQ_CACHE_TTL:
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached(kind, name, value):
+    """Store a metadata result on disk; failures are ignored."""
+    path = _cache_path(kind, name)
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(BQ_CACHE_DIR, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
 def _get_bq_module():
     try:
         from google.cloud import bigquery
@@ -137,13 +300,14 @@ class BigQueryClient:
         tables = client.list_tables()
     """
 
-    def __init__(self, project=None):
+    def __init__(self, project=None, use_cache=True):
         """Initialize BigQuery client.
 
         Args:
             project: Google Cloud project ID for billing. If None, uses default.
+            use_cache: Reuse table lists and schemas cached under BQ_CACHE_DIR
+                for up to BQ_CACHE_TTL seconds.
         """
-        import os
         bq = _get_bq_module()
         project = project or os.environ.get("GOOGLE_CLOUD_PROJECT")
         try:
@@ -153,14 +317,13 @@ class BigQueryClient:
                 f"Could not create BigQuery client: {e}\n"
                 "Run 'gcloud auth application-default login' or set GOOGLE_APPLICATION_CREDENTIALS"
             )
+        self._tables = {}
+        self._use_cache = use_cache
 
     def query(self, sql, limit=DEFAULT_LIMIT, dry_run=False):
         """Execute a read-only SQL query. Returns pandas DataFrame."""
         bq = _get_bq_module()
-        safe, reason = validate_sql_safety(sql)
-        if not safe:
-            raise BigQueryError(reason)
-        sql = _ensure_limit(sql, limit)
+        sql = _checked_sql(sql, limit)
 
         if dry_run:
             job_config = bq.QueryJobConfig(dry_run=True, use_query_cache=False)
@@ -169,26 +332,45 @@ class BigQueryClient:
 
         return self._client.query(sql).to_dataframe()
 
+    def query_rows(self, sql, limit=DEFAULT_LIMIT):
+        """Execute a read-only SQL query without materializing the result.
+
+        Returns the BigQuery RowIterator; use ``total_rows``, ``schema`` and
+        ``to_arrow_iterable()`` to consume it page by page.
+        """
+        sql = _checked_sql(sql, limit)
+        return self._client.query(sql).result()
+
     def list_tables(self, versioned=False):
-        """List available HTAN tables. Returns list of table name strings."""
-        dataset = HTAN_DATASET_VERSIONED if versioned else HTAN_DATASET
-        sql = f"SELECT table_name FROM `{dataset}.INFORMATION_SCHEMA.TABLES` ORDER BY table_name"
-        df = self._client.query(sql).to_dataframe()
-        return df["table_name"].tolist()
+        """List available HTAN tables. Returns list of table name strings.
+
+        The result is kept for the lifetime of the client and, unless caching
+        is disabled, on disk for BQ_CACHE_TTL seconds.
+        """
+        if versioned not in self._tables:
+            dataset = HTAN_DATASET_VERSIONED if versioned else HTAN_DATASET
+            tables = _read_cached("tables", dataset) if self._use_cache else None
+            if tables is None:
+                sql = f"SELECT table_name FROM `{dataset}.INFORMATION_SCHEMA.TABLES` ORDER BY table_name"
+                df = self._client.query(sql).to_dataframe()
+                tables = df["table_name"].tolist()
+                _write_cached("tables", dataset, tables)
+            self._tables[versioned] = tables
+        return list(self._tables[versioned])
 
     def describe_table(self, table, versioned=False):
         """Describe table schema. Returns dict with table info and schema."""
-        if not TABLE_NAME_PATTERN.match(table):
-            raise BigQueryError(f"Invalid table name '{table}'.")
-        dataset = HTAN_DATASET_VERSIONED if versioned else HTAN_DATASET
-        if not versioned and not re.search(r"_(current|r\d+(_v\d+)?)$", table):
-            table = f"{table}_current"
+        dataset, table = _resolve_table(table, versioned)
         full_table = f"{dataset}.{table}"
+        if self._use_cache:
+            cached = _read_cached("describe", full_table)
+            if cached is not None:
+                return cached
         try:
             tbl = self._client.get_table(full_table)
         except Exception as e:
             raise BigQueryError(f"Could not access table '{full_table}': {e}")
-        return {
+        info = {
             "table": full_table,
             "num_rows": tbl.num_rows,
             "num_bytes": tbl.num_bytes,
@@ -198,10 +380,93 @@ class BigQueryClient:
                 for f in tbl.schema
             ],
         }
+        _write_cached("describe", full_table, info)
+        return info
+
+    def describe_many(self, tables, versioned=False):
+        """Describe the schemas of several tables with a single query.
+
+        Reads ``INFORMATION_SCHEMA.COLUMNS`` once for all requested tables
+        instead of one ``get_table`` call each. Row and byte counts are not
+        available there; use describe_table() when those are needed. Column
+        types are reported with the same names describe_table() uses
+        (``INTEGER``, ``FLOAT``, ``BOOLEAN``, ``RECORD``; arrays as the
+        element type with mode ``REPEATED``).
+
+        Returns:
+            Dict mapping fully-qualified table name to a dict with
+            ``table`` and ``schema`` keys, in the order requested.
+        """
+        bq = _get_bq_module()
+        resolved = [_resolve_table(t, versioned)[1] for t in tables]
+        if not resolved:
+            return {}
+        dataset = HTAN_DATASET_VERSIONED if versioned else HTAN_DATASET
+        sql = (
+            "SELECT c.table_name, c.column_name, c.data_type, c.is_nullable, p.description\n"
+            f"FROM `{dataset}.INFORMATION_SCHEMA.COLUMNS` AS c\n"
+            f"LEFT JOIN `{dataset}.INFORMATION_SCHEMA.COLUMN_FIELD_PATHS` AS p\n"
+            "  ON p.table_name = c.table_name AND p.field_path = c.column_name\n"
+            "WHERE c.table_name IN UNNEST(@tables)\n"
+            "ORDER BY c.table_name, c.ordinal_position"
+        )
+        job_config = bq.QueryJobConfig(
+            query_parameters=[bq.ArrayQueryParameter("tables", "STRING", resolved)]
+        )
+        try:
+            rows = self._client.query(sql, job_config=job_config).result()
+        except Exception as e:
+            raise BigQueryError(f"Could not read schemas from '{dataset}': {e}")
+
+        schemas = {}
+        for row in rows:
+            field_type, repeated = _schema_field_type(row["data_type"])
+            if repeated:
+                mode = "REPEATED"
+            else:
+                mode = "NULLABLE" if row["is_nullable"] == "YES" else "REQUIRED"
+            schemas.setdefault(row["table_name"], []).append({
+                "name": row["column_name"],
+                "type": field_type,
+                "mode": mode,
+                "description": row["description"] or "",
+            })
+
+        missing = [t for t in resolved if t not in schemas]
+        if missing:
+            raise BigQueryError(f"Could not access table(s) in '{dataset}': {', '.join(missing)}")
+        return {
+            f"{dataset}.{t}": {"table": f"{dataset}.{t}", "schema": schemas[t]}
+            for t in resolved
+        }
 
 
 # --- CLI ---
 
+def _print_csv_stream(rows):
+    """Write a RowIterator to stdout as CSV one Arrow batch at a time.
+
+    Skips pandas entirely; strings are quoted and numbers are not, as with
+    csv.QUOTE_NONNUMERIC.
+    """
+    import pyarrow.csv as pacsv
+
+    if not rows.total_rows:
+        print("Query returned no results.", file=sys.stderr)
+        return
+    print(f"Returned {rows.total_rows} rows, {len(rows.schema)} columns", file=sys.stderr)
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    writer = None
+    for batch in rows.to_arrow_iterable():
+        if writer is None:
+            writer = pacsv.CSVWriter(out, batch.schema)
+        writer.write_batch(batch)
+    if writer is not None:
+        writer.close()
+    out.flush()
+
+
 def cli_main(argv=None):
     """CLI entry point for BigQuery queries."""
     parser = argparse.ArgumentParser(
@@ -230,12 +495,14 @@ def cli_main(argv=None):
     sp_tables.add_argument("--project", "-p", help="Google Cloud project ID")
     sp_tables.add_argument("--dry-run", action="store_true")
     sp_tables.add_argument("--versioned", action="store_true")
+    sp_tables.add_argument("--no-cache", action="store_true", help="Ignore cached metadata and refresh it")
 
     sp_desc = subparsers.add_parser("describe", help="Describe table schema")
     sp_desc.add_argument("table_name", help="Table name")
     sp_desc.add_argument("--project", "-p", help="Google Cloud project ID")
     sp_desc.add_argument("--dry-run", action="store_true")
     sp_desc.add_argument("--versioned", action="store_true")
+    sp_desc.add_argument("--no-cache", action="store_true", help="Ignore cached metadata and refresh it")
 
     args = parser.parse_args(argv)
 
@@ -253,7 +520,10 @@ def cli_main(argv=None):
         return
 
     try:
-        client = BigQueryClient(project=getattr(args, "project", None))
+        client = BigQueryClient(
+            project=getattr(args, "project", None),
+            use_cache=not getattr(args, "no_cache", False),
+        )
     except BigQueryError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -273,6 +543,10 @@ def cli_main(argv=None):
                 print(f"SQL:\n{result['sql']}", file=sys.stderr)
                 return
 
+            if args.format == "csv":
+                _print_csv_stream(client.query_rows(args.sql))
+                return
+
             df = client.query(args.sql)
             if df.empty:
                 print("Query returned no results.", file=sys.stderr)
@@ -280,10 +554,6 @@ def cli_main(argv=None):
             print(f"Returned {len(df)} rows, {len(df.columns)} columns", file=sys.stderr)
             if args.format == "json":
                 print(df.to_json(orient="records", indent=2))
-            elif args.format == "csv":
-                output = io.StringIO()
-                df.to_csv(output, index=False, quoting=csv.QUOTE_NONNUMERIC)
-                print(output.getvalue())
             else:
                 print(df.to_string(index=False))
         except BigQueryError as e:
@@ -19,16 +19,19 @@ Usage as CLI:
 import argparse
 import base64
 import csv
+import functools
+import gzip
+import http.client
 import io
 import json
 import os
 import re
-import ssl
 import sys
-import urllib.error
+import time
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
+from htan import _fastjson, _http
 from htan.config import (
     ConfigError,
     get_clickhouse_url,
@@ -39,6 +42,11 @@ from htan.config import (
 DEFAULT_LIMIT = 100
 SQL_DEFAULT_LIMIT = 1000
 
+# Latest discovered database, reused for DB_CACHE_TTL seconds to skip the
+# SHOW DATABASES round-trip on every CLI invocation
+DB_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "htan-skill", "latest_db.json")
+DB_CACHE_TTL = 60 * 60
+
 # SQL keywords that indicate write/destructive operations — block these
 BLOCKED_SQL_KEYWORDS = [
     "DELETE", "DROP", "UPDATE", "INSERT", "CREATE",
@@ -48,6 +56,12 @@ BLOCKED_SQL_KEYWORDS = [
 # SQL keywords that indicate read operations — allow these
 ALLOWED_SQL_STARTS = ["SELECT", "WITH", "SHOW", "DESCRIBE", "EXPLAIN", "EXISTS"]
 
+_BLOCKED_SQL_RE = re.compile(r"\b(?:" + "|".join(BLOCKED_SQL_KEYWORDS) + r")\b", re.IGNORECASE)
+_ALLOWED_SQL_START_SET = frozenset(ALLOWED_SQL_STARTS)
+_LIMIT_RE = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+# != and the shell-escaped \!= form
+_NOT_EQUAL_RE = re.compile(r"\\?!=")
+
 TABLE_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_]+$")
 
 # Columns that are Array(String) in the files table — need arrayExists() instead of ILIKE.
@@ -73,22 +87,18 @@ def normalize_sql(sql):
     ClickHouse doesn't support the != operator — use <> instead.
     Also handles \\!= which occurs when shells escape ! inside double-quoted strings.
     """
-    sql = sql.replace('\\!=', '<>')
-    sql = sql.replace('!=', '<>')
-    return sql
+    return _NOT_EQUAL_RE.sub("<>", sql)
 
 
 def validate_sql_safety(sql):
     """Validate that SQL is read-only. Returns (safe, reason)."""
-    normalized = " ".join(sql.upper().split())
+    match = _BLOCKED_SQL_RE.search(sql)
+    if match:
+        return False, f"Blocked SQL keyword: {match.group(0).upper()}"
 
-    for keyword in BLOCKED_SQL_KEYWORDS:
-        pattern = r"\b" + keyword + r"\b"
-        if re.search(pattern, normalized):
-            return False, f"Blocked SQL keyword: {keyword}"
-
-    first_word = normalized.split()[0] if normalized.split() else ""
-    if first_word not in ALLOWED_SQL_STARTS:
+    words = sql.split(None, 1)
+    first_word = words[0].upper() if words else ""
+    if first_word not in _ALLOWED_SQL_START_SET:
         return False, f"SQL must start with one of: {', '.join(ALLOWED_SQL_STARTS)}"
 
     return True, "OK"
@@ -106,10 +116,14 @@ def escape_sql_string(s):
     return s.replace("\\", "\\\\").replace("'", "\\'")
 
 
+def array_param(values):
+    """Format strings as an Array(String) literal for a server-side {name:Array(String)} parameter."""
+    return "[" + ",".join(f"'{escape_sql_string(v)}'" for v in values) + "]"
+
+
 def ensure_limit(sql, limit=DEFAULT_LIMIT):
     """Add LIMIT clause if none present."""
-    normalized = " ".join(sql.upper().split())
-    if "LIMIT" not in normalized:
+    if not _LIMIT_RE.search(sql):
         sql = sql.rstrip().rstrip(";")
         sql += f"\nLIMIT {limit}"
         print(f"Auto-applied LIMIT {limit}", file=sys.stderr)
@@ -141,24 +155,63 @@ def build_where_clauses(filters, array_columns=None):
 
 # --- Low-level query functions ---
 
-def _make_ssl_context():
-    """Create an SSL context, trying certifi first."""
+def _http_error(status, error_body):
+    """Build a PortalError (with hints) from a ClickHouse HTTP error response."""
+    clean_msg = error_body[:500]
+    if error_body.startswith("{"):
+        try:
+            err_json = json.loads(error_body)
+            clean_msg = err_json.get("exception", clean_msg)
+        except (json.JSONDecodeError, KeyError):
+            pass
+    hints = []
+    if "Unrecognized token" in clean_msg and "!=" in clean_msg:
+        hints.append("Use <> instead of != for not-equal comparisons in ClickHouse")
+    if "UNKNOWN_IDENTIFIER" in clean_msg or "Missing columns" in clean_msg:
+        hints.append("Run 'describe <table>' to see available column names")
+    if "CANNOT_PARSE_TEXT" in clean_msg or "CANNOT_PARSE_INPUT" in clean_msg:
+        hints.append("Use toInt32OrNull() or toFloat64OrNull() for columns with non-numeric values")
+    if "Array" in clean_msg and ("ILLEGAL_TYPE" in clean_msg or "argument of function" in clean_msg):
+        hints.append("Use arrayExists() or arrayJoin() for Array(String) columns like organType, Gender, Race")
+    return PortalError(f"ClickHouse HTTP {status}: {clean_msg}", hints=hints)
+
+
+@functools.cache
+def _accept_encoding():
+    """Response encodings to request; zstd only when the zstandard package is installed."""
     try:
-        import certifi
-        return ssl.create_default_context(cafile=certifi.where())
+        import zstandard  # noqa: F401
     except ImportError:
-        return ssl.create_default_context()
+        return "gzip"
+    return "zstd, gzip"
+
 
+def _decompress(body, encoding):
+    """Undo the response Content-Encoding (gzip or zstd)."""
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
 
-def clickhouse_query(sql, fmt="JSONEachRow", database=None, timeout=60, config=None):
+
+def clickhouse_query(sql, fmt="JSONEachRow", database=None, timeout=60, config=None, params=None):
     """Execute a read-only SQL query against the ClickHouse HTTP interface.
 
+    Connections are kept alive and reused by later queries on the same thread
+    (see htan._http).
+    Responses are requested compressed and decompressed transparently.
+
     Args:
         sql: SQL query string
         fmt: ClickHouse output format (JSONEachRow, TabSeparated, CSV, etc.)
         database: Database name to query against (None = use config default)
         timeout: HTTP request timeout in seconds (default: 60)
         config: Portal config dict. If None, loads from default config file.
+        params: Values for {name:Type} placeholders in sql, bound server-side.
+            Each value is sent as text in ClickHouse's format for that type.
 
     Returns:
         Raw response body as string.
@@ -170,76 +223,64 @@ def clickhouse_query(sql, fmt="JSONEachRow", database=None, timeout=60, config=N
 
     cfg = config if config is not None else load_portal_config()
 
-    params = {"default_format": fmt}
+    query = {"default_format": fmt, "enable_http_compression": "1"}
     if database is not None:
-        params["database"] = database
+        query["database"] = database
+    for name, value in (params or {}).items():
+        query[f"param_{name}"] = value
 
-    url = get_clickhouse_url(cfg) + "?" + urllib.parse.urlencode(params)
+    url = urllib.parse.urlsplit(get_clickhouse_url(cfg))
+    path = (url.path or "/") + "?" + urllib.parse.urlencode(query)
 
     credentials = base64.b64encode(f"{cfg['user']}:{cfg['password']}".encode()).decode()
-
-    req = urllib.request.Request(
-        url,
-        data=sql.encode("utf-8"),
-        headers={"Authorization": f"Basic {credentials}"},
-        method="POST",
-    )
-
-    ctx = _make_ssl_context()
+    headers = {"Authorization": f"Basic {credentials}", "Accept-Encoding": _accept_encoding()}
 
     try:
-        with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
-            return resp.read().decode("utf-8")
-    except urllib.error.HTTPError as e:
-        error_body = ""
-        try:
-            error_body = e.read().decode("utf-8")
-        except Exception:
-            pass
-        clean_msg = error_body[:500]
-        if error_body.startswith("{"):
-            try:
-                err_json = json.loads(error_body)
-                clean_msg = err_json.get("exception", clean_msg)
-            except (json.JSONDecodeError, KeyError):
-                pass
-        hints = []
-        if "Unrecognized token" in clean_msg and "!=" in clean_msg:
-            hints.append("Use <> instead of != for not-equal comparisons in ClickHouse")
-        if "UNKNOWN_IDENTIFIER" in clean_msg or "Missing columns" in clean_msg:
-            hints.append("Run 'describe <table>' to see available column names")
-        if "CANNOT_PARSE_TEXT" in clean_msg or "CANNOT_PARSE_INPUT" in clean_msg:
-            hints.append("Use toInt32OrNull() or toFloat64OrNull() for columns with non-numeric values")
-        if "Array" in clean_msg and ("ILLEGAL_TYPE" in clean_msg or "argument of function" in clean_msg):
-            hints.append("Use arrayExists() or arrayJoin() for Array(String) columns like organType, Gender, Race")
-        raise PortalError(f"ClickHouse HTTP {e.code}: {clean_msg}", hints=hints)
-    except urllib.error.URLError as e:
+        status, reason, resp_headers, body = _http.request(
+            "POST", url.netloc, path, sql.encode("utf-8"), headers, timeout)
+        body = _decompress(body, resp_headers.get("Content-Encoding"))
+    except TimeoutError:
+        raise PortalError(f"Query timed out after {timeout}s. Try a simpler query or add a LIMIT clause.")
+    except (OSError, http.client.HTTPException) as e:
         raise PortalError(
-            f"Could not connect to HTAN portal ClickHouse: {e.reason}\n"
+            f"Could not connect to HTAN portal ClickHouse: {e}\n"
             "The portal endpoint may be temporarily unavailable."
         )
-    except TimeoutError:
-        raise PortalError(f"Query timed out after {timeout}s. Try a simpler query or add a LIMIT clause.")
-    except PortalError:
-        raise
     except Exception as e:
         raise PortalError(str(e))
 
+    if status >= 400:
+        raise _http_error(status, body.decode("utf-8", errors="replace"))
+    return body.decode("utf-8")
+
 
 def parse_json_rows(response_text):
-    """Parse JSONEachRow response into a list of dicts."""
+    """Parse JSONEachRow response into a list of dicts.
+
+    The rows are decoded as one JSON array in a single call; if any line is
+    not JSON (blank lines, server error text), falls back to line by line.
+    """
     if not response_text or not response_text.strip():
         return []
 
+    text = response_text.strip()
+    # JSONEachRow escapes newlines inside strings, so every raw newline separates rows
+    try:
+        rows = _fastjson.loads("[" + text.replace("\n", ",") + "]")
+    except ValueError:
+        rows = None
+    if rows is not None and len(rows) == text.count("\n") + 1:
+        return rows
+
     rows = []
     error_lines = []
-    for line in response_text.strip().split("\n"):
+    for line in text.split("\n"):
         line = line.strip()
         if not line:
             continue
         try:
-            rows.append(json.loads(line))
-        except json.JSONDecodeError:
+            rows.append(_fastjson.loads(line))
+        except ValueError:
             error_lines.append(line)
 
     if not rows and error_lines:
@@ -252,15 +293,46 @@ def parse_json_rows(response_text):
     return rows
 
 
-def discover_database(config=None):
+def _read_db_cache(host, ttl):
+    """Return the database discovered for host within the last ttl seconds, or None."""
+    try:
+        with open(DB_CACHE_FILE, "r") as f:
+            entry = json.load(f)
+        if entry["host"] == host and time.time() - entry["ts"] < ttl:
+            return entry["db"] or None
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_db_cache(host, db):
+    """Record a discovered database name; failures are ignored."""
+    tmp = DB_CACHE_FILE + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(DB_CACHE_FILE), exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump({"host": host, "db": db, "ts": time.time()}, f)
+        os.replace(tmp, DB_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def discover_database(config=None, cache_ttl=None):
     """Discover the latest HTAN database by querying SHOW DATABASES.
 
     Args:
         config: Portal config dict. If None, loads from default config file.
+        cache_ttl: If set, reuse a database discovered on this host within the
+            last cache_ttl seconds (stored in DB_CACHE_FILE) instead of querying.
     """
     cfg = config if config is not None else load_portal_config()
     config_default = get_default_database(cfg)
 
+    if cache_ttl:
+        cached = _read_db_cache(cfg.get("host"), cache_ttl)
+        if cached:
+            return cached
+
     try:
         resp = clickhouse_query("SHOW DATABASES LIKE 'htan_%'", fmt="TabSeparated", database="", config=cfg)
         if not resp.strip():
@@ -272,6 +344,8 @@ def discover_database(config=None):
             latest = htan_dbs[0]
             if config_default and latest != config_default:
                 print(f"Discovered newer database: {latest} (config default was {config_default})", file=sys.stderr)
+            if cache_ttl:
+                _write_db_cache(cfg.get("host"), latest)
             return latest
     except Exception:
         pass
@@ -279,6 +353,122 @@ def discover_database(config=None):
     return config_default
 
 
+# Column schema plus the table's row count in one round-trip; the table name
+# is bound server-side as {table:String}
+_DESCRIBE_SQL = """
+SELECT name, type, default_expression, comment,
+    (SELECT any(total_rows) FROM system.tables
+     WHERE database = currentDatabase() AND name = {table:String}) AS row_count
+FROM system.columns
+WHERE database = currentDatabase() AND table = {table:String}
+ORDER BY position
+""".strip()
+
+
+def _describe(table, database, config=None):
+    """Fetch a table's columns and row count. Returns (column rows, row_count).
+
+    row_count comes from system.tables; for engines that do not track it,
+    falls back to a count() query, and is None if that fails too.
+    """
+    cfg = config if config is not None else load_portal_config()
+    resp = clickhouse_query(_DESCRIBE_SQL, database=database, config=cfg,
+                            params={"table": table})
+    rows = parse_json_rows(resp)
+    if not rows:
+        return [], None
+    row_count = rows[0].get("row_count")
+    if row_count is None:
+        try:
+            count_resp = clickhouse_query(f"SELECT count() as cnt FROM {validate_table_name(table)}",
+                                          database=database, config=cfg)
+            count_rows = parse_json_rows(count_resp)
+            row_count = count_rows[0].get("cnt") if count_rows else None
+        except PortalError:
+            pass
+    return rows, row_count
+
+
+def _run_queries(queries, database, config=None):
+    """Run independent read queries concurrently, one thread each.
+
+    Returns {label: rows} in the order of queries; a query that fails with
+    PortalError yields [].
+    """
+    cfg = config if config is not None else load_portal_config()
+
+    def run(sql):
+        try:
+            return parse_json_rows(clickhouse_query(sql, database=database, config=cfg))
+        except PortalError:
+            return []
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as ex:
+        return dict(zip(queries, ex.map(run, queries.values())))
+
+
+# Overview queries shared by PortalClient.summary() and the summary command
+_SUMMARY_QUERIES = {
+    "files_by_atlas": "SELECT atlas_name, count() as file_count FROM files GROUP BY atlas_name ORDER BY file_count DESC",
+    "files_by_assay": "SELECT assayName, count() as file_count FROM files GROUP BY assayName ORDER BY file_count DESC",
+    "files_by_organ": "SELECT arrayJoin(organType) as organ, count() as file_count FROM files GROUP BY organ ORDER BY file_count DESC",
+    "participants_by_atlas": "SELECT atlas_name, count() as participant_count FROM demographics GROUP BY atlas_name ORDER BY participant_count DESC",
+    "total_files": "SELECT count() as total FROM files",
+    "total_participants": "SELECT count() as total FROM demographics",
+}
+# The same six aggregates fused into one round-trip; each row is tagged with
+# its bucket, and the per-bucket ORDER BY is re-applied client-side
+_SUMMARY_SQL = """
+SELECT 'files_by_atlas' AS bucket, atlas_name AS bucket_key, count() AS n FROM files GROUP BY atlas_name
+UNION ALL SELECT 'files_by_assay', assayName, count() FROM files GROUP BY assayName
+UNION ALL SELECT 'files_by_organ', arrayJoin(organType) AS organ, count() FROM files GROUP BY organ
+UNION ALL SELECT 'participants_by_atlas', atlas_name, count() FROM demographics GROUP BY atlas_name
+UNION ALL SELECT 'total_files', '', count() FROM files
+UNION ALL SELECT 'total_participants', '', count() FROM demographics
+""".strip()
+# bucket -> (key column, count column) in the row shape of _SUMMARY_QUERIES
+_SUMMARY_COLUMNS = {
+    "files_by_atlas": ("atlas_name", "file_count"),
+    "files_by_assay": ("assayName", "file_count"),
+    "files_by_organ": ("organ", "file_count"),
+    "participants_by_atlas": ("atlas_name", "participant_count"),
+    "total_files": (None, "total"),
+    "total_participants": (None, "total"),
+}
+_SUMMARY_LABELS = {
+    "files_by_atlas": "Files by atlas",
+    "files_by_assay": "Files by assay",
+    "files_by_organ": "Files by organ",
+    "participants_by_atlas": "Participants by atlas",
+    "total_files": "Total files",
+    "total_participants": "Total participants",
+}
+
+
+def _summary_results(database, config=None):
+    """Run the overview aggregates. Returns {bucket: rows} keyed as _SUMMARY_QUERIES.
+
+    Sends the single fused _SUMMARY_SQL query; if that fails, falls back to
+    the separate queries so one failing aggregate only empties its own bucket.
+    """
+    cfg = config if config is not None else load_portal_config()
+    try:
+        fused = parse_json_rows(clickhouse_query(_SUMMARY_SQL, database=database, config=cfg))
+    except PortalError:
+        return _run_queries(_SUMMARY_QUERIES, database, config=cfg)
+
+    results = {bucket: [] for bucket in _SUMMARY_QUERIES}
+    for row in fused:
+        key_col, count_col = _SUMMARY_COLUMNS[row["bucket"]]
+        out = {key_col: row["bucket_key"]} if key_col else {}
+        out[count_col] = row["n"]
+        results[row["bucket"]].append(out)
+    for bucket, (key_col, count_col) in _SUMMARY_COLUMNS.items():
+        if key_col:
+            results[bucket].sort(key=lambda r: int(r[count_col]), reverse=True)
+    return results
+
+
 # --- Output formatting ---
 
 def _format_cell_value(val):
@@ -392,7 +582,7 @@ class PortalClient:
 
     def _db(self):
         if self._database is None:
-            self._database = discover_database(config=self._cfg())
+            self._database = discover_database(config=self._cfg(), cache_ttl=DB_CACHE_TTL)
         return self._database
 
     def query(self, sql, limit=SQL_DEFAULT_LIMIT):
@@ -421,17 +611,18 @@ class PortalClient:
 
         where = build_where_clauses(filters, array_columns=FILES_ARRAY_COLUMNS)
 
+        params = None
         if data_file_id:
             ids = [data_file_id] if isinstance(data_file_id, str) else data_file_id
-            escaped_ids = ", ".join(f"'{escape_sql_string(fid)}'" for fid in ids)
-            where.append(f"DataFileID IN ({escaped_ids})")
+            where.append("DataFileID IN {ids:Array(String)}")
+            params = {"ids": array_param(ids)}
 
         sql = f"SELECT {', '.join(columns)} FROM files"
         if where:
             sql += " WHERE " + " AND ".join(where)
         sql += f"\nLIMIT {limit}"
 
-        resp = clickhouse_query(sql, database=self._db(), config=self._cfg())
+        resp = clickhouse_query(sql, database=self._db(), config=self._cfg(), params=params)
         return parse_json_rows(resp)
 
     def list_tables(self):
@@ -443,18 +634,10 @@ class PortalClient:
     def describe_table(self, table):
         """Describe the schema of a table. Returns list of column dicts."""
         validate_table_name(table)
-        resp = clickhouse_query(f"DESCRIBE {table}", fmt="JSONEachRow",
-                                database=self._db(), config=self._cfg())
-        schema = parse_json_rows(resp)
-
-        row_count = None
-        try:
-            count_resp = clickhouse_query(f"SELECT count() as cnt FROM {table}",
-                                          database=self._db(), config=self._cfg())
-            count_rows = parse_json_rows(count_resp)
-            row_count = count_rows[0].get("cnt") if count_rows else None
-        except PortalError:
-            pass
+        schema, row_count = _describe(table, self._db(), config=self._cfg())
+        if not schema:
+            raise PortalError(f"Table '{table}' not found in database '{self._db()}'",
+                              hints=["Run 'tables' to list available tables"])
 
         columns = [
             {
@@ -481,35 +664,20 @@ class PortalClient:
         """Look up files and return download coordinates (synapseId, drs_uri)."""
         if not file_ids:
             return []
-        escaped_ids = ", ".join(f"'{escape_sql_string(fid)}'" for fid in file_ids)
         sql = (
             "SELECT DataFileID, Filename, synapseId, "
             "JSONExtractString(viewers, 'crdcGc', 'drs_uri') as drs_uri, "
             "downloadSource "
             "FROM files "
-            f"WHERE DataFileID IN ({escaped_ids})"
+            "WHERE DataFileID IN {ids:Array(String)}"
         )
-        resp = clickhouse_query(sql, database=self._db(), config=self._cfg())
+        resp = clickhouse_query(sql, database=self._db(), config=self._cfg(),
+                                params={"ids": array_param(file_ids)})
         return parse_json_rows(resp)
 
     def summary(self):
         """Get overview statistics (file/participant counts by atlas, assay, organ)."""
-        queries = {
-            "files_by_atlas": "SELECT atlas_name, count() as file_count FROM files GROUP BY atlas_name ORDER BY file_count DESC",
-            "files_by_assay": "SELECT assayName, count() as file_count FROM files GROUP BY assayName ORDER BY file_count DESC",
-            "files_by_organ": "SELECT arrayJoin(organType) as organ, count() as file_count FROM files GROUP BY organ ORDER BY file_count DESC",
-            "participants_by_atlas": "SELECT atlas_name, count() as participant_count FROM demographics GROUP BY atlas_name ORDER BY participant_count DESC",
-            "total_files": "SELECT count() as total FROM files",
-            "total_participants": "SELECT count() as total FROM demographics",
-        }
-
-        results = {}
-        for label, sql in queries.items():
-            try:
-                resp = clickhouse_query(sql, database=self._db(), config=self._cfg())
-                results[label] = parse_json_rows(resp)
-            except PortalError:
-                results[label] = []
+        results = _summary_results(self._db(), config=self._cfg())
 
         total_files = results.get("total_files", [{}])
         total_participants = results.get("total_participants", [{}])
@@ -681,24 +849,27 @@ def _cmd_files(args):
         "level": args.level, "FileFormat": args.file_format, "Filename": args.filename,
     }
     where = build_where_clauses(filters, array_columns=FILES_ARRAY_COLUMNS)
+    params = None
     if args.data_file_id:
         ids = [args.data_file_id] if isinstance(args.data_file_id, str) else args.data_file_id
-        escaped_ids = ", ".join(f"'{escape_sql_string(fid)}'" for fid in ids)
-        where.append(f"DataFileID IN ({escaped_ids})")
+        where.append("DataFileID IN {ids:Array(String)}")
+        params = {"ids": array_param(ids)}
 
     sql = f"SELECT {', '.join(columns)} FROM files"
     if where:
         sql += " WHERE " + " AND ".join(where)
     sql += f"\nLIMIT {args.limit}"
 
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}", file=sys.stderr)
         print(f"SQL:\n{sql}", file=sys.stderr)
+        if params:
+            print(f"Parameters: ids={params['ids']}", file=sys.stderr)
         return
 
     print(f"Querying files in {database}...", file=sys.stderr)
-    resp = clickhouse_query(sql, database=database)
+    resp = clickhouse_query(sql, database=database, params=params)
     rows = parse_json_rows(resp)
     print(f"Returned {len(rows)} rows", file=sys.stderr)
     format_output(rows, args.output)
@@ -711,7 +882,7 @@ def _cmd_demographics(args):
     if where:
         sql += " WHERE " + " AND ".join(where)
     sql += f"\nLIMIT {args.limit}"
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}\nSQL:\n{sql}", file=sys.stderr)
         return
@@ -729,7 +900,7 @@ def _cmd_diagnosis(args):
     if where:
         sql += " WHERE " + " AND ".join(where)
     sql += f"\nLIMIT {args.limit}"
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}\nSQL:\n{sql}", file=sys.stderr)
         return
@@ -747,7 +918,7 @@ def _cmd_cases(args):
     if where:
         sql += " WHERE " + " AND ".join(where)
     sql += f"\nLIMIT {args.limit}"
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}\nSQL:\n{sql}", file=sys.stderr)
         return
@@ -765,7 +936,7 @@ def _cmd_specimen(args):
     if where:
         sql += " WHERE " + " AND ".join(where)
     sql += f"\nLIMIT {args.limit}"
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}\nSQL:\n{sql}", file=sys.stderr)
         return
@@ -777,28 +948,15 @@ def _cmd_specimen(args):
 
 
 def _cmd_summary(args):
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}", file=sys.stderr)
         print("Would run summary aggregation queries", file=sys.stderr)
         return
 
     print(f"Querying summary from {database}...", file=sys.stderr)
-    queries = {
-        "Files by atlas": "SELECT atlas_name, count() as file_count FROM files GROUP BY atlas_name ORDER BY file_count DESC",
-        "Files by assay": "SELECT assayName, count() as file_count FROM files GROUP BY assayName ORDER BY file_count DESC",
-        "Files by organ": "SELECT arrayJoin(organType) as organ, count() as file_count FROM files GROUP BY organ ORDER BY file_count DESC",
-        "Participants by atlas": "SELECT atlas_name, count() as participant_count FROM demographics GROUP BY atlas_name ORDER BY participant_count DESC",
-        "Total files": "SELECT count() as total FROM files",
-        "Total participants": "SELECT count() as total FROM demographics",
-    }
-    results = {}
-    for label, sql in queries.items():
-        try:
-            resp = clickhouse_query(sql, database=database)
-            results[label] = parse_json_rows(resp)
-        except PortalError:
-            results[label] = []
+    rows = _summary_results(database)
+    results = {_SUMMARY_LABELS[key]: value for key, value in rows.items()}
 
     if args.output == "json":
         print(json.dumps(results, indent=2))
@@ -827,7 +985,7 @@ def _cmd_sql(args):
     limit = args.limit if hasattr(args, "limit") else SQL_DEFAULT_LIMIT
     if not no_limit:
         sql = ensure_limit(sql, limit)
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}\nSQL:\n{sql}", file=sys.stderr)
         return
@@ -841,7 +999,7 @@ def _cmd_sql(args):
 
 
 def _cmd_tables(args):
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
         print(f"Database: {database}\nSQL: SHOW TABLES", file=sys.stderr)
         return
@@ -855,20 +1013,18 @@ def _cmd_tables(args):
 
 def _cmd_describe(args):
     table_name = validate_table_name(args.table_name)
-    database = args.database or discover_database()
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
     if args.dry_run:
-        print(f"Database: {database}\nSQL: DESCRIBE {table_name}", file=sys.stderr)
+        print(f"Database: {database}\nSQL: {_DESCRIBE_SQL}\nParameters: table={table_name}",
+              file=sys.stderr)
         return
     print(f"Describing {table_name} in {database}...", file=sys.stderr)
-    resp = clickhouse_query(f"DESCRIBE {table_name}", fmt="JSONEachRow", database=database)
-    rows = parse_json_rows(resp)
+    rows, row_count = _describe(table_name, database)
     if not rows:
         print(f"No schema found for table '{table_name}'.", file=sys.stderr)
         sys.exit(1)
-
-    count_resp = clickhouse_query(f"SELECT count() as cnt FROM {table_name}", database=database)
-    count_rows = parse_json_rows(count_resp)
-    row_count = count_rows[0].get("cnt", "?") if count_rows else "?"
+    if row_count is None:
+        row_count = "?"
 
     print(f"Table: {database}.{table_name}")
     print(f"Rows: {row_count:,}" if isinstance(row_count, int) else f"Rows: {row_count}")
@@ -903,21 +1059,21 @@ def _cmd_manifest(args):
         print("Error: No file IDs provided.", file=sys.stderr)
         sys.exit(1)
 
-    database = args.database or discover_database()
-    escaped_ids = ", ".join(f"'{escape_sql_string(fid)}'" for fid in file_ids)
-    sql = f"""SELECT DataFileID, Filename, synapseId,
+    database = args.database or discover_database(cache_ttl=DB_CACHE_TTL)
+    params = {"ids": array_param(file_ids)}
+    sql = """SELECT DataFileID, Filename, synapseId,
        JSONExtractString(viewers, 'crdcGc', 'drs_uri') as drs_uri,
        downloadSource
 FROM files
-WHERE DataFileID IN ({escaped_ids})"""
+WHERE DataFileID IN {ids:Array(String)}"""
 
     if args.dry_run:
-        print(f"Database: {database}\nSQL:\n{sql}", file=sys.stderr)
+        print(f"Database: {database}\nSQL:\n{sql}\nParameters: ids={params['ids']}", file=sys.stderr)
         print(f"Would generate manifests in: {args.output_dir}", file=sys.stderr)
         return
 
     print(f"Looking up {len(file_ids)} file(s) in {database}...", file=sys.stderr)
-    resp = clickhouse_query(sql, database=database)
+    resp = clickhouse_query(sql, database=database, params=params)
     rows = parse_json_rows(resp)
 
     if not rows:
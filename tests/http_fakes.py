@@ -0,0 +1,56 @@
+"""Fake HTTP objects shared by the tests: http.client connections and urlopen responses."""
+
+import http.client
+import io
+
+
+class FakeHTTPResponse:
+    def __init__(self, body, will_close=False, headers=None):
+        self.status, self.reason = 200, "OK"
+        self.headers = headers or {}
+        self._body = body
+        self.will_close = will_close
+
+    def read(self):
+        return self._body
+
+
+class FakeConnection:
+    def __init__(self, fail_first=False, response=None):
+        self.sock = None
+        self.timeout = None
+        self.requests = []
+        self.closed = False
+        self._fail_first = fail_first
+        self._response = response or FakeHTTPResponse(b"ok")
+
+    def request(self, method, path, body=None, headers=None):
+        self.requests.append(path)
+        self.sent = (method, body, headers)
+        if self._fail_first:
+            self._fail_first = False
+            raise http.client.RemoteDisconnected("closed")
+
+    def getresponse(self):
+        return self._response
+
+    def close(self):
+        self.closed = True
+
+
+class FakeURLResponse:
+    """Stand-in for the object urllib.request.urlopen returns."""
+
+    def __init__(self, body, headers=None, status=200):
+        self._buf = io.BytesIO(body)
+        self.headers = headers or {}
+        self.status = status
+
+    def read(self, n=-1):
+        return self._buf.read(n)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
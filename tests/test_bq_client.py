@@ -15,9 +15,17 @@ from htan.query.bq import (
     HTAN_DATASET,
     HTAN_DATASET_VERSIONED,
     TABLE_NAME_PATTERN,
+    cli_main,
 )
 
 
+@pytest.fixture(autouse=True)
+def _bq_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk metadata cache out of the real home directory."""
+    monkeypatch.setattr("htan.query.bq.BQ_CACHE_DIR", str(tmp_path / "bq"))
+    return tmp_path / "bq"
+
+
 # ===========================================================================
 # validate_sql_safety — expanded tests
 # ===========================================================================
@@ -100,12 +108,42 @@ def test_ensure_limit_preserves_existing():
     assert result == sql
 
 
+def test_ensure_limit_detects_lowercase_and_multiline_limit():
+    sql = "select *\nfrom t\nlimit\n  25"
+    assert _ensure_limit(sql, limit=500) == sql
+    sql = "SELECT * FROM t LIMIT @n"
+    assert _ensure_limit(sql, limit=500) == sql
+
+
+def test_ensure_limit_ignores_limit_inside_identifiers():
+    result = _ensure_limit("SELECT rate_limit, limit_value FROM t", limit=100)
+    assert result.endswith("LIMIT 100")
+
+
 def test_ensure_limit_strips_semicolon():
     result = _ensure_limit("SELECT * FROM t;", limit=100)
     assert "LIMIT 100" in result
     assert not result.rstrip().endswith(";")
 
 
+def test_ensure_limit_skips_non_query_statements():
+    assert _ensure_limit("SHOW TABLES", limit=100) == "SHOW TABLES"
+    assert _ensure_limit("EXPLAIN SELECT 1", limit=100) == "EXPLAIN SELECT 1"
+
+
+def test_ensure_limit_after_trailing_comment():
+    result = _ensure_limit("SELECT * FROM t -- all rows", limit=100)
+    assert result.splitlines()[-1] == "LIMIT 100"
+
+
+def test_ensure_limit_ignores_limit_in_cte():
+    pytest.importorskip("sqlglot")
+    sql = "WITH top AS (SELECT * FROM t LIMIT 5) SELECT * FROM top JOIN u USING (id)"
+    assert _ensure_limit(sql, limit=100).endswith("LIMIT 100")
+    sql = "SELECT * FROM t ORDER BY n LIMIT 10 OFFSET 20"
+    assert _ensure_limit(sql, limit=100) == sql
+
+
 # ===========================================================================
 # BigQueryClient — with mocked google.cloud.bigquery
 # ===========================================================================
@@ -159,6 +197,32 @@ def test_bq_client_query_dry_run(monkeypatch):
     assert "SELECT" in result["sql"]
 
 
+def test_bq_client_query_rows_unsafe_raises(monkeypatch):
+    bq, mock_client = _make_fake_bq_module()
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+    client = BigQueryClient(project="test-project")
+    with pytest.raises(BigQueryError):
+        client.query_rows("DELETE FROM t")
+    mock_client.query.assert_not_called()
+
+
+def test_cli_sql_csv_streams_arrow_batches(monkeypatch, capsys):
+    pa = pytest.importorskip("pyarrow")
+    bq, mock_client = _make_fake_bq_module()
+    batch = pa.record_batch([pa.array(["HTA1", None]), pa.array([3, 4])], names=["center", "n"])
+    rows = MagicMock(total_rows=4, schema=["center", "n"])
+    rows.to_arrow_iterable.return_value = iter([batch, batch])
+    mock_client.query.return_value.result.return_value = rows
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+
+    cli_main(["sql", "SELECT center, n FROM t", "--format", "csv"])
+    out, err = capsys.readouterr()
+    assert out.splitlines() == ['"center","n"', '"HTA1",3', ',4', '"HTA1",3', ',4']
+    assert "Returned 4 rows, 2 columns" in err
+    mock_client.query.return_value.to_dataframe.assert_not_called()
+    assert "LIMIT" in mock_client.query.call_args[0][0]
+
+
 def test_bq_client_list_tables(monkeypatch):
     bq, mock_client = _make_fake_bq_module()
     mock_df = MagicMock()
@@ -235,3 +299,205 @@ def test_table_name_pattern_invalid():
     assert not TABLE_NAME_PATTERN.match("files; DROP")
     assert not TABLE_NAME_PATTERN.match("files--comment")
     assert not TABLE_NAME_PATTERN.match("")
+
+
+def test_bq_client_list_tables_cached(monkeypatch):
+    bq, mock_client = _make_fake_bq_module()
+    mock_df = MagicMock()
+    mock_df.__getitem__ = lambda self, key: MagicMock(tolist=lambda: ["table_a"])
+    mock_client.query.return_value.to_dataframe.return_value = mock_df
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+    client = BigQueryClient(project="test-project")
+    assert client.list_tables() == ["table_a"]
+    assert client.list_tables() == ["table_a"]
+    assert mock_client.query.call_count == 1
+    client.list_tables(versioned=True)
+    assert mock_client.query.call_count == 2
+
+
+def _make_tables_client(monkeypatch, tables=("table_a",), **kwargs):
+    bq, mock_client = _make_fake_bq_module()
+    mock_df = MagicMock()
+    mock_df.__getitem__ = lambda self, key: MagicMock(tolist=lambda: list(tables))
+    mock_client.query.return_value.to_dataframe.return_value = mock_df
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+    return BigQueryClient(project="test-project", **kwargs), mock_client
+
+
+def test_list_tables_disk_cache_shared_across_clients(monkeypatch, _bq_cache_dir):
+    client, first = _make_tables_client(monkeypatch)
+    assert client.list_tables() == ["table_a"]
+    assert (_bq_cache_dir / f"tables-{HTAN_DATASET}.json").exists()
+
+    client, second = _make_tables_client(monkeypatch, tables=["other"])
+    assert client.list_tables() == ["table_a"]
+    second.query.assert_not_called()
+
+
+def test_list_tables_disk_cache_expires(monkeypatch, _bq_cache_dir):
+    import os
+    client, _ = _make_tables_client(monkeypatch)
+    client.list_tables()
+    path = _bq_cache_dir / f"tables-{HTAN_DATASET}.json"
+    os.utime(path, (0, 0))
+
+    client, second = _make_tables_client(monkeypatch, tables=["table_b"])
+    assert client.list_tables() == ["table_b"]
+    second.query.assert_called_once()
+
+
+def test_list_tables_no_cache_refreshes(monkeypatch):
+    _make_tables_client(monkeypatch)[0].list_tables()
+    client, second = _make_tables_client(monkeypatch, tables=["table_b"], use_cache=False)
+    assert client.list_tables() == ["table_b"]
+    second.query.assert_called_once()
+    # The refreshed result replaces the stale entry for later runs
+    client, third = _make_tables_client(monkeypatch, tables=["unused"])
+    assert client.list_tables() == ["table_b"]
+
+
+def test_describe_table_disk_cache(monkeypatch):
+    bq, mock_client = _make_fake_bq_module()
+    mock_table = MagicMock(num_rows=5, num_bytes=50, description=None)
+    mock_field = MagicMock(field_type="STRING", mode="NULLABLE", description=None)
+    mock_field.name = "HTAN_Center"
+    mock_table.schema = [mock_field]
+    mock_client.get_table.return_value = mock_table
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+
+    first = BigQueryClient(project="test-project").describe_table("biospecimen")
+    second = BigQueryClient(project="test-project").describe_table("biospecimen_current")
+    assert first == second
+    assert second["schema"][0]["name"] == "HTAN_Center"
+    mock_client.get_table.assert_called_once()
+
+
+def test_cli_no_cache_flag(monkeypatch):
+    seen = {}
+
+    class FakeClient:
+        def __init__(self, project=None, use_cache=True):
+            seen["use_cache"] = use_cache
+
+        def list_tables(self, versioned=False):
+            return []
+
+    monkeypatch.setattr("htan.query.bq.BigQueryClient", FakeClient)
+    cli_main(["tables", "--no-cache"])
+    assert seen["use_cache"] is False
+    cli_main(["tables"])
+    assert seen["use_cache"] is True
+
+
+def _column_row(table, column, data_type="STRING", nullable="YES", description=None):
+    return {
+        "table_name": table, "column_name": column, "data_type": data_type,
+        "is_nullable": nullable, "description": description,
+    }
+
+
+def test_bq_client_describe_many(monkeypatch):
+    bq, mock_client = _make_fake_bq_module()
+    mock_client.query.return_value.result.return_value = [
+        _column_row("biospecimen_current", "HTAN_Biospecimen_ID", nullable="NO"),
+        _column_row("clinical_tier1_demographics_current", "HTAN_Participant_ID",
+                    description="Participant ID"),
+        _column_row("clinical_tier1_demographics_current", "Tags", data_type="ARRAY<STRING>"),
+    ]
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+    client = BigQueryClient(project="test-project")
+    info = client.describe_many(["clinical_tier1_demographics", "biospecimen_current"])
+
+    assert mock_client.query.call_count == 1
+    assert "INFORMATION_SCHEMA.COLUMNS" in mock_client.query.call_args[0][0]
+    bq.ArrayQueryParameter.assert_called_once_with(
+        "tables", "STRING", ["clinical_tier1_demographics_current", "biospecimen_current"]
+    )
+    assert list(info) == [
+        f"{HTAN_DATASET}.clinical_tier1_demographics_current",
+        f"{HTAN_DATASET}.biospecimen_current",
+    ]
+    demo = info[f"{HTAN_DATASET}.clinical_tier1_demographics_current"]["schema"]
+    assert demo[0] == {"name": "HTAN_Participant_ID", "type": "STRING",
+                       "mode": "NULLABLE", "description": "Participant ID"}
+    assert demo[1] == {"name": "Tags", "type": "STRING", "mode": "REPEATED", "description": ""}
+    bio = info[f"{HTAN_DATASET}.biospecimen_current"]["schema"]
+    assert bio[0]["mode"] == "REQUIRED"
+
+
+@pytest.mark.parametrize("data_type, expected", [
+    ("INT64", ("INTEGER", False)),
+    ("FLOAT64", ("FLOAT", False)),
+    ("BOOL", ("BOOLEAN", False)),
+    ("STRING(10)", ("STRING", False)),
+    ("NUMERIC(10, 2)", ("NUMERIC", False)),
+    ("TIMESTAMP", ("TIMESTAMP", False)),
+    ("ARRAY<INT64>", ("INTEGER", True)),
+    ("STRUCT<a INT64, b STRING>", ("RECORD", False)),
+    ("ARRAY<STRUCT<a INT64>>", ("RECORD", True)),
+])
+def test_schema_field_type_matches_get_table_names(data_type, expected):
+    from htan.query.bq import _schema_field_type
+    assert _schema_field_type(data_type) == expected
+
+
+def test_bq_client_describe_many_missing_table(monkeypatch):
+    bq, mock_client = _make_fake_bq_module()
+    mock_client.query.return_value.result.return_value = [
+        _column_row("biospecimen_current", "HTAN_Biospecimen_ID"),
+    ]
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+    client = BigQueryClient(project="test-project")
+    with pytest.raises(BigQueryError, match="no_such_table_current"):
+        client.describe_many(["biospecimen", "no_such_table"])
+
+
+def test_bq_client_describe_many_invalid_name(monkeypatch):
+    bq, mock_client = _make_fake_bq_module()
+    monkeypatch.setattr("htan.query.bq._get_bq_module", lambda: bq)
+    client = BigQueryClient(project="test-project")
+    with pytest.raises(BigQueryError, match="Invalid table name"):
+        client.describe_many(["biospecimen", "bad; DROP TABLE"])
+    mock_client.query.assert_not_called()
+
+
+# ===========================================================================
+# validate_sql_safety — sqlglot AST path
+# ===========================================================================
+
+def test_ast_check_skipped_without_sqlglot(monkeypatch):
+    import builtins
+    from htan.query.bq import _validate_sql_ast
+    real_import = builtins.__import__
+
+    def no_sqlglot(name, *args, **kwargs):
+        if name.startswith("sqlglot"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_sqlglot)
+    assert _validate_sql_ast("SELECT 1") is None
+    safe, reason = validate_sql_safety("SELECT * FROM t WHERE note = 'DELETE'")
+    assert safe is False and "DELETE" in reason
+
+
+def test_ast_check_allows_keyword_in_string_literal():
+    pytest.importorskip("sqlglot")
+    safe, _ = validate_sql_safety("SELECT * FROM t WHERE note = 'please DELETE me'")
+    assert safe is True
+
+
+def test_ast_check_blocks_nested_write():
+    pytest.importorskip("sqlglot")
+    safe, reason = validate_sql_safety("SELECT 1; DELETE FROM t WHERE id = 1")
+    assert safe is False
+    assert "DELETE" in reason
+
+
+@pytest.mark.parametrize("sql", ["DESCRIBE t", "DESC t"])
+def test_describe_rejected_with_and_without_sqlglot(sql):
+    with patch("htan.query.bq._parse_sql", return_value=None):
+        fallback = validate_sql_safety(sql)
+    assert fallback[0] is False
+    pytest.importorskip("sqlglot")
+    assert validate_sql_safety(sql) == fallback
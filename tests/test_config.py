@@ -44,6 +44,14 @@ def test_validate_config_empty_dict():
     assert set(missing) == set(REQUIRED_KEYS)
 
 
+def test_validate_config_missing_keys_keep_order():
+    assert _validate_config({"user": "u"}) == ["host", "port", "password"]
+
+
+def test_validate_config_non_dict():
+    assert _validate_config(["host"]) == ["port", "user", "password"]
+
+
 # --- _load_from_env ---
 
 def test_load_from_env_valid(monkeypatch):
@@ -164,3 +172,42 @@ def test_check_setup_returns_all_keys():
     assert "bigquery" in status
     assert "python" in status
     assert status["python"]["sufficient"] is True
+
+
+def test_check_setup_gen3_env_path(monkeypatch, tmp_path):
+    creds = tmp_path / "credentials.json"
+    creds.write_text("{}")
+    monkeypatch.setenv("GEN3_API_KEY", str(creds))
+    assert check_setup()["gen3"]["method"] == "GEN3_API_KEY"
+
+
+def test_check_setup_gen3_env_missing_file(monkeypatch):
+    monkeypatch.setenv("GEN3_API_KEY", "/nonexistent/credentials.json")
+    assert check_setup()["gen3"]["method"] != "GEN3_API_KEY"
+
+
+def test_check_synapse_token_skips_config_stat(monkeypatch):
+    from htan import config
+    monkeypatch.setenv("SYNAPSE_AUTH_TOKEN", "token")
+    stat_paths = []
+    monkeypatch.setattr(config, "_exists", lambda p: stat_paths.append(p) or True)
+    assert config.check_synapse() == {"configured": True, "method": "SYNAPSE_AUTH_TOKEN"}
+    assert stat_paths == []
+
+
+def test_load_from_env_parses_once_and_copies(monkeypatch):
+    from htan.config import _parse_env_json
+    _parse_env_json.cache_clear()
+    monkeypatch.setenv("HTAN_PORTAL_CREDENTIALS", json.dumps(VALID_CREDS))
+    first = _load_from_env()
+    first["host"] = "mutated"
+    second = _load_from_env()
+    assert second["host"] == "example.com"
+    assert _parse_env_json.cache_info().hits == 1
+
+
+def test_keychain_unsupported_platform(monkeypatch):
+    from htan.config import _load_from_keychain, save_to_keychain
+    monkeypatch.setattr("htan.config._system", lambda: "Windows")
+    assert _load_from_keychain() is None
+    assert save_to_keychain(VALID_CREDS) is False
@@ -61,6 +61,24 @@ def test_extract_guid_passthrough():
     assert _extract_guid("just-a-guid") == "just-a-guid"
 
 
+def test_extract_guid_invalid_passthrough():
+    with pytest.raises(ValueError, match="Invalid GUID"):
+        _extract_guid("guid;rm -rf /")
+
+
+@pytest.mark.parametrize("uri", [
+    "drs://dg.4DFC/..",
+    "drs://dg.4DFC/../../etc",
+    "drs://dg.4DFC/abc/./def",
+    "drs://dg.4DFC/abc//def",
+    "drs://dg.4DFC/abc/",
+])
+def test_extract_guid_rejects_dot_and_empty_segments(uri):
+    _validate_drs_uri(uri)  # the URI pattern alone lets these through
+    with pytest.raises(ValueError, match="Path segments"):
+        _extract_guid(uri)
+
+
 # --- find_credentials ---
 
 def test_find_credentials_env_valid(monkeypatch, tmp_path):
@@ -103,3 +121,12 @@ def test_guid_pattern():
     assert GUID_PATTERN.match("abc.def/ghi")
     assert not GUID_PATTERN.match("")
     assert not GUID_PATTERN.match("abc;rm")
+
+
+
+def test_patterns_compiled_lazily(monkeypatch):
+    import htan.download.gen3 as gen3
+    monkeypatch.delitem(vars(gen3), "DRS_URI_PATTERN", raising=False)
+    assert "DRS_URI_PATTERN" not in vars(gen3)
+    gen3._validate_drs_uri("drs://dg.4DFC/abc-123")
+    assert "DRS_URI_PATTERN" in vars(gen3)
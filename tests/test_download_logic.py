@@ -1,6 +1,7 @@
 """Tests for htan.download.synapse and htan.download.gen3 — download/resolve
 logic beyond validation (which is already tested)."""
 
+import json
 import os
 from unittest.mock import patch, MagicMock
 
@@ -17,6 +18,7 @@ from htan.download.synapse import (
     _validate_synapse_id,
     _get_synapse_client,
 )
+from tests.http_fakes import FakeURLResponse
 
 
 # ===========================================================================
@@ -91,6 +93,113 @@ def test_get_synapse_client_no_package():
             _get_synapse_client()
 
 
+# ===========================================================================
+# synapse — download_many
+# ===========================================================================
+
+def test_synapse_download_many_logs_in_once(tmp_path):
+    from htan.download.synapse import download_many
+    fake_syn = object()
+    with patch("htan.download.synapse._make_session", return_value="session"), \
+         patch("htan.download.synapse._get_synapse_client", return_value=fake_syn) as get_client, \
+         patch("htan.download.synapse._download_one",
+               side_effect=lambda syn, sid, out, dry: f"{out}/{sid}") as dl_one:
+        paths = download_many(["syn1", "syn2", "syn3"], output_dir=str(tmp_path))
+    get_client.assert_called_once_with(session="session")
+    assert dl_one.call_count == 3
+    assert all(call.args[0] is fake_syn for call in dl_one.call_args_list)
+    assert paths == [f"{tmp_path}/syn1", f"{tmp_path}/syn2", f"{tmp_path}/syn3"]
+
+
+def test_synapse_download_many_validates_all_ids_first():
+    from htan.download.synapse import download_many
+    with patch("htan.download.synapse._get_synapse_client") as get_client:
+        with pytest.raises(ValueError, match="Invalid Synapse ID"):
+            download_many(["syn1", "bad"])
+    get_client.assert_not_called()
+
+
+def test_synapse_download_many_parallel_keeps_order(tmp_path):
+    import threading
+    from htan.download.synapse import download_many
+    threads = set()
+
+    def fake_one(syn, sid, out, dry):
+        threads.add(threading.get_ident())
+        return f"{out}/{sid}"
+
+    ids = [f"syn{i}" for i in range(8)]
+    with patch("htan.download.synapse._make_session", return_value="session"), \
+         patch("htan.download.synapse._get_synapse_client", return_value=object()) as get_client, \
+         patch("htan.download.synapse._download_one", side_effect=fake_one):
+        paths = download_many(ids, output_dir=str(tmp_path), max_workers=4)
+    get_client.assert_called_once()
+    assert threading.get_ident() not in threads
+    assert paths == [f"{tmp_path}/{sid}" for sid in ids]
+
+
+def test_synapse_download_many_rejects_zero_workers():
+    from htan.download.synapse import download_many
+    with pytest.raises(ValueError, match="max_workers"):
+        download_many(["syn1"], max_workers=0)
+
+
+def test_synapse_dry_run_many_batches_headers(capsys):
+    from htan.download import synapse
+    ids = [f"syn{i}" for i in range(5)]
+    syn = MagicMock()
+    syn.restPOST.side_effect = lambda uri, body: {"results": [
+        {"id": ref["targetId"], "name": f"{ref['targetId']}.bam",
+         "type": "org.sagebionetworks.repo.model.FileEntity"}
+        for ref in json.loads(body)["references"] if ref["targetId"] != "syn3"
+    ]}
+    with patch.object(synapse, "HEADER_BATCH_SIZE", 2):
+        headers = synapse.dry_run_many(ids, syn, "/out")
+    assert syn.restPOST.call_count == 3
+    assert syn.restPOST.call_args.args[0] == "/entity/header"
+    assert sorted(headers) == ["syn0", "syn1", "syn2", "syn4"]
+    err = capsys.readouterr().err
+    assert "syn0: syn0.bam (FileEntity)" in err
+    assert "syn3: not found or not accessible" in err
+
+
+def test_synapse_download_many_dry_run_uses_batch(tmp_path):
+    from htan.download.synapse import download_many
+    with patch("htan.download.synapse._make_session"), \
+         patch("htan.download.synapse._get_synapse_client", return_value="syn"), \
+         patch("htan.download.synapse.dry_run_many") as batch, \
+         patch("htan.download.synapse._download_one") as dl_one:
+        assert download_many(["syn1", "syn2"], output_dir=str(tmp_path), dry_run=True) == []
+    batch.assert_called_once_with(["syn1", "syn2"], "syn", os.path.realpath(tmp_path))
+    dl_one.assert_not_called()
+
+
+def test_synapse_cli_ids_file(tmp_path):
+    from htan.download.synapse import cli_main
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("# comment\nsyn1\n\nsyn2\n")
+    with patch("htan.download.synapse.download_many", return_value=[]) as dl_many:
+        cli_main(["--ids-file", str(ids_file), "--dry-run"])
+    assert dl_many.call_args.args[0] == ["syn1", "syn2"]
+    assert dl_many.call_args.kwargs["dry_run"] is True
+    assert dl_many.call_args.kwargs["max_workers"] == 1
+
+
+def test_synapse_cli_parallel(tmp_path):
+    from htan.download.synapse import cli_main
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("syn1\nsyn2\n")
+    with patch("htan.download.synapse.download_many", return_value=[]) as dl_many:
+        cli_main(["--ids-file", str(ids_file), "--parallel", "4"])
+    assert dl_many.call_args.kwargs["max_workers"] == 4
+
+
+def test_synapse_cli_requires_id():
+    from htan.download.synapse import cli_main
+    with pytest.raises(SystemExit):
+        cli_main([])
+
+
 # ===========================================================================
 # gen3 CLI — dry run paths
 # ===========================================================================
@@ -114,3 +223,35 @@ def test_synapse_cli_help():
     with pytest.raises(SystemExit) as exc_info:
         cli_main(["--help"])
     assert exc_info.value.code == 0
+
+
+# ===========================================================================
+# gen3 — download resume
+# ===========================================================================
+
+def test_gen3_download_resumes_partial_file(tmp_path):
+    (tmp_path / "abc-123.part").write_bytes(b"hello ")
+    captured = {}
+
+    def fake_urlopen(req):
+        captured["range"] = req.get_header("Range")
+        return FakeURLResponse(b"world", {"Content-Length": "5"}, status=206)
+
+    with patch("htan.download.gen3.resolve", return_value="https://signed"), \
+         patch("htan.download.gen3.urllib.request.urlopen", side_effect=fake_urlopen):
+        path = gen3_download("drs://dg.4DFC/abc-123", output_dir=str(tmp_path))
+
+    assert captured["range"] == "bytes=6-"
+    assert open(path, "rb").read() == b"hello world"
+    assert not os.path.exists(path + ".part")
+
+
+def test_gen3_download_range_ignored_replaces_partial(tmp_path):
+    (tmp_path / "abc-123.part").write_bytes(b"stale")
+
+    with patch("htan.download.gen3.resolve", return_value="https://signed"), \
+         patch("htan.download.gen3.urllib.request.urlopen",
+               return_value=FakeURLResponse(b"full body", {"Content-Length": "9"})):
+        path = gen3_download("drs://dg.4DFC/abc-123", output_dir=str(tmp_path))
+
+    assert open(path, "rb").read() == b"full body"
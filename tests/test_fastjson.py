@@ -0,0 +1,36 @@
+"""Tests for htan._fastjson — orjson-backed JSON helpers with a stdlib fallback."""
+
+from unittest.mock import patch
+
+from htan import _fastjson
+
+
+def test_json_helpers_match_stdlib_fallback():
+    articles = [{"pmid": "1", "title": "Tumour α-SMA", "authors": ["Doe J"], "year": 2024},
+                {"pmid": "2", "authors": []}]
+    fast = _fastjson.dumps_indented(articles)
+    with patch("htan._fastjson.orjson", None):
+        slow = _fastjson.dumps_indented(articles)
+        assert _fastjson.loads(slow) == articles
+    assert fast == slow
+    assert _fastjson.loads(fast) == articles
+
+
+def test_backend_resolved_once_at_import():
+    import builtins
+    real_import = builtins.__import__
+
+    def guarded(name, *args, **kwargs):
+        assert name != "orjson", "orjson re-imported per call"
+        return real_import(name, *args, **kwargs)
+
+    with patch("builtins.__import__", side_effect=guarded):
+        _fastjson.loads("[1]")
+        _fastjson.dumps_indented([1])
+    with patch("htan._fastjson.orjson", None), patch("builtins.__import__", side_effect=guarded):
+        assert _fastjson.loads("[1]") == [1]
+        assert _fastjson.dumps_indented([1]) == "[\n  1\n]"
+
+
+def test_loads_accepts_str_and_bytes():
+    assert _fastjson.loads('{"a": 1}') == _fastjson.loads(b'{"a": 1}') == {"a": 1}
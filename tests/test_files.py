@@ -56,3 +56,11 @@ def test_valid_file_id():
 def test_invalid_file_id():
     assert not FILE_ID_PATTERN.match("INVALID_ID")
     assert not FILE_ID_PATTERN.match("syn12345")
+
+
+def test_level1_non_seq_is_unknown():
+    assert infer_access_tier("HTA1_1_1", level="Level 1", assay="H&E") == "unknown"
+
+
+def test_level2_snrnaseq_is_gen3():
+    assert infer_access_tier("HTA1_1_1", level="Level 2", assay="snRNA-seq") == "gen3"
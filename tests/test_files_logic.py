@@ -10,9 +10,11 @@ from htan.files import (
     lookup,
     stats,
     _load_mapping,
+    _clear_cache,
     _format_text_output,
     _format_json_output,
 )
+from tests.http_fakes import FakeURLResponse
 
 
 SAMPLE_MAPPING = [
@@ -52,6 +54,7 @@ def mock_mapping(tmp_path):
     cache_file.write_text(json.dumps(SAMPLE_MAPPING))
     with patch("htan.files.CACHE_FILE", str(cache_file)):
         yield str(cache_file)
+    _clear_cache()
 
 
 # ===========================================================================
@@ -73,6 +76,39 @@ def test_load_mapping_skips_records_without_id(mock_mapping):
         assert key.startswith("HTA")
 
 
+def test_load_mapping_memoized(mock_mapping, capsys):
+    first = _load_mapping()
+    capsys.readouterr()
+    assert _load_mapping() is first
+    assert "Loaded" not in capsys.readouterr().err
+
+
+def test_load_mapping_reloads_when_file_changes(mock_mapping):
+    first = _load_mapping()
+    with open(mock_mapping, "w") as f:
+        json.dump(SAMPLE_MAPPING[:1], f)
+    os.utime(mock_mapping, ns=(0, 0))
+    second = _load_mapping()
+    assert second is not first
+    assert list(second) == ["HTA9_1_19512"]
+
+
+def test_load_mapping_writes_index_sidecar(mock_mapping):
+    _load_mapping()
+    assert os.path.exists(mock_mapping + ".idx.pkl")
+    _clear_cache()
+    with patch("htan.files._iter_records", side_effect=AssertionError("re-parsed")):
+        assert len(_load_mapping()) == 3
+
+
+def test_load_mapping_ignores_stale_index(mock_mapping):
+    _load_mapping()
+    _clear_cache()
+    with open(mock_mapping, "w") as f:
+        json.dump(SAMPLE_MAPPING[2:], f)
+    assert list(_load_mapping()) == ["HTA1_1_100"]
+
+
 # ===========================================================================
 # lookup
 # ===========================================================================
@@ -102,6 +138,19 @@ def test_lookup_all_missing(mock_mapping, capsys):
     assert "Not found" in captured.err
 
 
+def test_lookup_deduplicates_in_order(mock_mapping):
+    results = lookup(["HTA1_1_100", "HTA9_1_19512", "HTA1_1_100"])
+    assert [r["HTAN_Data_File_ID"] for r in results] == ["HTA1_1_100", "HTA9_1_19512"]
+
+
+def test_lookup_caps_not_found_message(mock_mapping, capsys):
+    lookup([f"HTA_NOPE{i}" for i in range(25)])
+    err = capsys.readouterr().err
+    assert "Not found in mapping (25)" in err
+    assert "(+5 more)" in err
+    assert "HTA_NOPE24" not in err
+
+
 # ===========================================================================
 # stats
 # ===========================================================================
@@ -118,6 +167,25 @@ def test_stats_files_per_center(mock_mapping):
     fpc = s["files_per_center"]
     assert fpc["HTAN OHSU"] == 2
     assert fpc["HTAN HMS"] == 1
+    assert list(fpc) == ["HTAN OHSU", "HTAN HMS"]
+
+
+def test_stats_without_pyarrow(mock_mapping):
+    with patch.dict("sys.modules", {"pyarrow": None}):
+        s = stats()
+    assert s["total_files"] == 3
+    assert not os.path.exists(mock_mapping + ".feather")
+
+
+def test_stats_arrow_matches_dict_path(mock_mapping):
+    pytest.importorskip("pyarrow")
+    with patch.dict("sys.modules", {"pyarrow": None}):
+        expected = stats()
+    assert stats() == expected
+    assert os.path.exists(mock_mapping + ".feather")
+    # Second call reads the sidecar instead of rebuilding from records
+    with patch("htan.files._load_mapping", side_effect=AssertionError("rebuilt")):
+        assert stats() == expected
 
 
 # ===========================================================================
@@ -174,3 +242,222 @@ def test_format_json_output_no_entity_id():
     out = json.loads(_format_json_output(results))
     assert "synapse_download_cmd" not in out[0]
     assert "gen3_download_cmd" in out[0]
+
+
+# ===========================================================================
+# _count_records / _iter_records
+# ===========================================================================
+
+def test_count_records_array():
+    import io
+    from htan.files import _count_records
+    assert _count_records(io.BytesIO(json.dumps(SAMPLE_MAPPING).encode())) == 4
+
+
+def test_count_records_rejects_object():
+    import io
+    from htan.files import _count_records
+    with pytest.raises(ValueError):
+        _count_records(io.BytesIO(b'{"a": 1}'))
+
+
+def test_count_records_rejects_invalid_json():
+    import io
+    from htan.files import _count_records
+    with pytest.raises(ValueError):
+        _count_records(io.BytesIO(b"[{"))
+
+
+def test_count_records_without_ijson():
+    import io
+    from htan.files import _count_records
+    with patch.dict("sys.modules", {"ijson": None}):
+        assert _count_records(io.BytesIO(json.dumps(SAMPLE_MAPPING).encode())) == 4
+        with pytest.raises(ValueError):
+            _count_records(io.BytesIO(b'{"a": 1}'))
+
+
+def test_iter_records_stdlib_fallback(mock_mapping):
+    from htan.files import _iter_records
+    with patch.dict("sys.modules", {"ijson": None, "orjson": None}), \
+            patch("htan._fastjson.orjson", None):
+        assert list(_iter_records(mock_mapping)) == SAMPLE_MAPPING
+
+
+def test_iter_records_ijson(mock_mapping):
+    pytest.importorskip("ijson")
+    from htan.files import _iter_records
+    with patch.dict("sys.modules", {"orjson": None}):
+        assert list(_iter_records(mock_mapping)) == SAMPLE_MAPPING
+
+
+def test_iter_records_orjson(mock_mapping):
+    pytest.importorskip("orjson")
+    from htan.files import _iter_records
+    assert list(_iter_records(mock_mapping)) == SAMPLE_MAPPING
+
+
+def test_loads_mapped_empty_file(tmp_path):
+    orjson = pytest.importorskip("orjson")
+    from htan.files import _loads_mapped
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    with open(path, "rb") as f, pytest.raises(orjson.JSONDecodeError):
+        _loads_mapped(f)
+
+
+# ===========================================================================
+# _download_mapping — conditional GET
+# ===========================================================================
+
+def test_download_mapping_stores_etag(tmp_path):
+    from htan.files import _download_mapping, _read_meta
+    cache_file = tmp_path / "mapping.json"
+    resp = FakeURLResponse(json.dumps(SAMPLE_MAPPING).encode(), {"ETag": '"abc"'})
+    with patch("htan.files.CACHE_FILE", str(cache_file)), \
+         patch("htan.files.CACHE_DIR", str(tmp_path)), \
+         patch("urllib.request.urlopen", return_value=resp):
+        _download_mapping(force=True)
+        assert _read_meta()["etag"] == '"abc"'
+
+
+def test_download_mapping_not_modified_keeps_cache(mock_mapping, tmp_path):
+    import urllib.error
+    from htan.files import _download_mapping, _write_meta
+    _write_meta({"etag": '"abc"', "last_modified": None})
+    captured = {}
+
+    def fake_urlopen(req, timeout=None):
+        captured["etag"] = req.get_header("If-none-match")
+        raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+
+    with patch("htan.files.CACHE_DIR", str(tmp_path)), \
+         patch("urllib.request.urlopen", side_effect=fake_urlopen):
+        assert _download_mapping(force=True) == mock_mapping
+
+    assert captured["etag"] == '"abc"'
+    assert json.loads(open(mock_mapping).read()) == SAMPLE_MAPPING
+
+
+def test_download_mapping_identical_bytes_skip_replace(mock_mapping, tmp_path):
+    import hashlib
+    from htan.files import _download_mapping, _read_meta, _write_meta
+    body = open(mock_mapping, "rb").read()
+    _write_meta({"etag": None, "last_modified": None,
+                 "sha256": hashlib.sha256(body).hexdigest()})
+    before = os.stat(mock_mapping).st_mtime_ns
+    with patch("htan.files.CACHE_DIR", str(tmp_path)), \
+         patch("htan.files._count_records", side_effect=AssertionError("revalidated")), \
+         patch("urllib.request.urlopen", return_value=FakeURLResponse(body, {"ETag": '"new"'})):
+        assert _download_mapping(force=True) == mock_mapping
+    assert os.stat(mock_mapping).st_mtime_ns == before
+    assert not os.path.exists(mock_mapping + ".tmp")
+    assert _read_meta()["etag"] == '"new"'
+
+
+def test_download_mapping_stores_sha256(tmp_path):
+    import hashlib
+    from htan.files import _download_mapping, _read_meta
+    cache_file = tmp_path / "mapping.json"
+    body = json.dumps(SAMPLE_MAPPING).encode()
+    with patch("htan.files.CACHE_FILE", str(cache_file)), \
+         patch("htan.files.CACHE_DIR", str(tmp_path)), \
+         patch("urllib.request.urlopen", return_value=FakeURLResponse(body)):
+        _download_mapping(force=True)
+        assert _read_meta()["sha256"] == hashlib.sha256(body).hexdigest()
+
+
+# ===========================================================================
+# cli_main — lookup ID validation
+# ===========================================================================
+
+def test_cli_lookup_aggregates_format_warnings(mock_mapping, capsys):
+    from htan.files import cli_main
+    ids = ["HTA9_1_19512"] + [f"bad{i}" for i in range(7)]
+    cli_main(["lookup", *ids])
+    err = capsys.readouterr().err
+    assert err.count("Warning") == 1
+    assert "7 of 8 IDs" in err
+    assert "(+2 more)" in err
+
+
+def test_cli_lookup_counts_distinct_ids(mock_mapping, capsys):
+    from htan.files import cli_main
+    cli_main(["lookup", "HTA9_1_19512", "HTA9_1_19512"])
+    assert "Found 1/1 files" in capsys.readouterr().err
+
+
+def test_format_text_output_truncates_long_drs():
+    results = [
+        {"HTAN_Data_File_ID": "HTA9_1_1", "name": "n" * 60, "entityId": None,
+         "drs_uri": "dg.4DFC/" + "x" * 80, "HTAN_Center": None},
+    ]
+    header, sep, row = _format_text_output(results).split("\n")
+    assert sep.split("  ")[3] == "-" * 45
+    assert "x" * 34 + "..." in row
+    assert "n" * 41 not in row
+
+
+def _wide_rows(n):
+    return [(f"HTA9_1_{i}", "n" * (i % 40), "syn" + "1" * (i % 9), "", "HTAN WUSTL")
+            for i in range(n)]
+
+
+def test_column_widths():
+    from htan.files import _column_widths
+    widths = _column_widths(_wide_rows(1500))
+    assert widths == [len("HTAN_Data_File_ID"), 39, 11, len("drs_uri"), len("HTAN WUSTL")]
+
+
+def test_download_mapping_gunzips_stream(tmp_path):
+    import gzip
+    from htan.files import _download_mapping
+    cache_file = tmp_path / "mapping.json"
+    body = gzip.compress(json.dumps(SAMPLE_MAPPING).encode())
+    resp = FakeURLResponse(body, {"Content-Encoding": "gzip"})
+    with patch("htan.files.CACHE_FILE", str(cache_file)), \
+         patch("htan.files.CACHE_DIR", str(tmp_path)), \
+         patch("urllib.request.urlopen", return_value=resp) as urlopen:
+        _download_mapping(force=True)
+    assert urlopen.call_args.args[0].get_header("Accept-encoding") == "gzip"
+    assert json.loads(cache_file.read_text()) == SAMPLE_MAPPING
+
+
+def test_download_mapping_invalid_keeps_old_cache(mock_mapping, tmp_path):
+    from htan.files import _download_mapping
+    with patch("htan.files.CACHE_DIR", str(tmp_path)), \
+         patch("urllib.request.urlopen", return_value=FakeURLResponse(b"{}")):
+        with pytest.raises(SystemExit):
+            _download_mapping(force=True)
+    assert json.loads(open(mock_mapping).read()) == SAMPLE_MAPPING
+    assert not os.path.exists(mock_mapping + ".tmp")
+
+
+def test_write_json_output_matches_format_json_output():
+    import io
+    from htan.files import _write_json_output
+    results = [r for r in SAMPLE_MAPPING if "HTAN_Data_File_ID" in r]
+    for subset in ([], results[:1], results):
+        buf = io.StringIO()
+        _write_json_output(subset, out=buf)
+        assert buf.getvalue() == _format_json_output(subset) + "\n"
+
+
+def test_atomic_writer_keeps_old_file_on_error(tmp_path):
+    from htan.files import _atomic_writer
+    target = tmp_path / "out.json"
+    target.write_text("old")
+    with pytest.raises(RuntimeError):
+        with _atomic_writer(str(target), "w") as f:
+            f.write("partial")
+            raise RuntimeError("killed")
+    assert target.read_text() == "old"
+    assert not (tmp_path / "out.json.tmp").exists()
+
+
+def test_build_parser_only_requested_command():
+    from htan.files import _build_parser
+    parser = _build_parser("lookup")
+    assert parser.parse_args(["lookup", "HTA9_1_1"]).ids == ["HTA9_1_1"]
+    with pytest.raises(SystemExit):
+        parser.parse_args(["stats"])
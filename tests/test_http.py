@@ -0,0 +1,72 @@
+"""Tests for htan._http — the keep-alive HTTPS client shared by pubs and portal."""
+
+from unittest.mock import patch
+
+import pytest
+
+from htan import _http
+from tests.http_fakes import FakeConnection, FakeHTTPResponse
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    _http.drop_connection("h:1")
+    yield
+    _http.drop_connection("h:1")
+
+
+# ===========================================================================
+# request
+# ===========================================================================
+
+def test_request_reuses_connection():
+    conn = FakeConnection()
+    with patch("htan._http._new_connection", return_value=conn) as new_conn:
+        assert _http.request("POST", "h:1", "/a", b"", {}, 5)[::3] == (200, b"ok")
+        assert _http.request("GET", "h:1", "/b", timeout=5)[::3] == (200, b"ok")
+    assert new_conn.call_count == 1
+    assert conn.requests == ["/a", "/b"]
+
+
+def test_request_reconnects_after_stale_keepalive():
+    stale, fresh = FakeConnection(fail_first=True), FakeConnection()
+    with patch("htan._http._new_connection", side_effect=[stale, fresh]):
+        assert _http.request("POST", "h:1", "/a", b"", {}, 5)[3] == b"ok"
+    assert stale.closed
+    assert fresh.requests == ["/a"]
+
+
+def test_request_drops_connection_server_will_close():
+    first = FakeConnection(response=FakeHTTPResponse(b"ok", will_close=True))
+    second = FakeConnection()
+    with patch("htan._http._new_connection", side_effect=[first, second]):
+        _http.request("GET", "h:1", "/a", timeout=5)
+        _http.request("GET", "h:1", "/b", timeout=5)
+    assert first.closed
+    assert second.requests == ["/b"]
+
+
+def test_ssl_context_built_once():
+    assert _http.make_ssl_context() is _http.make_ssl_context()
+
+
+# ===========================================================================
+# proxies
+# ===========================================================================
+
+@pytest.mark.parametrize("proxy, expected", [
+    ("http://proxy.example.org", ("proxy.example.org", 80)),
+    ("https://proxy.example.org", ("proxy.example.org", 443)),
+    ("http://proxy.example.org:3128", ("proxy.example.org", 3128)),
+    ("proxy.example.org:3128", ("proxy.example.org", 3128)),
+])
+def test_proxy_address_default_port(proxy, expected):
+    assert _http._proxy_address(proxy) == expected
+
+
+def test_new_connection_tunnels_through_proxy():
+    with patch("htan._http.urllib.request.getproxies", return_value={"https": "http://proxy.example.org"}), \
+         patch("htan._http.urllib.request.proxy_bypass", return_value=False):
+        conn = _http._new_connection("ch.example.com:8443", 5)
+    assert (conn.host, conn.port) == ("proxy.example.org", 80)
+    assert (conn._tunnel_host, conn._tunnel_port) == ("ch.example.com", 8443)
@@ -55,3 +55,43 @@ def test_import_files():
 
 def test_import_cli():
     from htan.cli import main
+
+
+def test_lazy_submodule_attribute():
+    import htan
+    assert htan.pubs.search is not None
+    assert "pubs" in vars(htan)
+
+
+def test_unknown_attribute_raises():
+    import htan
+    import pytest
+    with pytest.raises(AttributeError):
+        htan.not_a_module
+
+
+def test_files_import_skips_network_stack():
+    import subprocess
+    import sys
+    code = "import sys, htan.files; print('urllib.request' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_pubs_import_skips_bigquery():
+    import subprocess
+    import sys
+    code = ("import sys, htan.cli, htan.pubs; "
+            "print(any(m in sys.modules for m in ('htan.query.bq', 'pandas', 'google.cloud')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_bq_import_defers_heavy_dependencies():
+    import subprocess
+    import sys
+    code = ("import sys, htan.query.bq; "
+            "print([m for m in ('pandas', 'pyarrow', 'sqlglot', 'google.cloud.bigquery') "
+            "if m in sys.modules])")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
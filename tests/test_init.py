@@ -1,5 +1,6 @@
 """Tests for htan.init — the interactive setup wizard."""
 
+import json
 import os
 import sys
 from unittest import mock
@@ -26,6 +27,14 @@ def test_import_init_module():
     assert INIT_ORDER[0] == "synapse"  # synapse before portal
 
 
+def test_import_init_skips_network_modules():
+    import subprocess
+    code = ("import sys, htan.init; "
+            "print(sorted(m for m in ('ssl', 'urllib.request', 'tempfile') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
 def test_import_ui_helpers():
     from htan.init import _status_icon, _print_header, _prompt, _print_status
 
@@ -119,6 +128,25 @@ def test_show_status_prints_to_stderr(capsys):
     assert "Synapse" in captured.err
 
 
+def test_show_status_formats_snapshot(capsys):
+    from htan.init import show_status
+    setup = {
+        "portal": {"configured": True, "source": "keychain", "path": None},
+        "synapse": {"configured": False, "method": None},
+        "bigquery": {"configured": True, "method": "application_default_credentials"},
+        "gen3": {"configured": False, "method": None},
+    }
+    result = show_status(setup=setup)
+    assert result == {"portal": True, "synapse": False, "bigquery": True, "gen3": False}
+    lines = capsys.readouterr().err.splitlines()
+    assert lines == [
+        "  \u2713 Portal (ClickHouse): Configured (keychain)",
+        "  \u2717 Synapse: Not configured",
+        "  \u2713 BigQuery (ISB-CGC): Configured (application_default_credentials)",
+        "  \u2717 Gen3/CRDC: Not configured",
+    ]
+
+
 # ---------------------------------------------------------------------------
 # _verify_portal
 # ---------------------------------------------------------------------------
@@ -139,6 +167,22 @@ def test_verify_portal_network_error():
         assert _verify_portal() is False
 
 
+def test_basic_auth_header():
+    from htan.init import _basic_auth_header
+    _basic_auth_header.cache_clear()
+    assert _basic_auth_header("user", "pass") == "Basic dXNlcjpwYXNz"
+    _basic_auth_header("user", "pass")
+    assert _basic_auth_header.cache_info().hits == 1
+
+
+def test_get_ssl_ctx_is_cached():
+    from htan import init
+    with mock.patch.object(init, "_SSL_CTX", None), \
+         mock.patch("ssl.create_default_context", return_value=object()) as m:
+        assert init._get_ssl_ctx() is init._get_ssl_ctx()
+    m.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # _init_synapse (non-interactive)
 # ---------------------------------------------------------------------------
@@ -168,6 +212,26 @@ def test_init_synapse_has_token_but_no_synapseclient(capsys):
     assert client is None
 
 
+def test_get_synapseclient_remembers_missing_module():
+    from htan import init
+    with mock.patch.object(init, "_SYNAPSECLIENT", None), \
+         mock.patch.dict(sys.modules, {"synapseclient": None}):
+        assert init._get_synapseclient() is None
+        assert init._SYNAPSECLIENT is False
+        assert init._get_synapseclient() is None
+
+
+def test_init_synapse_failed_login_shows_instructions_once(capsys):
+    """A failed login with existing creds prompts instead of logging in again."""
+    from htan.init import _init_synapse
+    with mock.patch.dict(os.environ, {"SYNAPSE_AUTH_TOKEN": "bad-token"}), \
+         mock.patch("htan.init._synapse_login", return_value=(False, None)) as m_login, \
+         mock.patch("htan.init._prompt", return_value="skip"):
+        assert _init_synapse() == (False, None)
+    m_login.assert_called_once()
+    assert "To set up Synapse auth" in capsys.readouterr().err
+
+
 # ---------------------------------------------------------------------------
 # _init_portal (non-interactive)
 # ---------------------------------------------------------------------------
@@ -177,18 +241,27 @@ def test_init_portal_already_configured(capsys):
     from htan.init import _init_portal
     with mock.patch("htan.init.detect_source", return_value="keychain"):
         with mock.patch("htan.init._verify_portal", return_value=True):
-            result = _init_portal(non_interactive=True)
+            result = _init_portal(non_interactive=True, verify=True)
     assert result is True
     captured = capsys.readouterr()
     assert "keychain" in captured.err
 
 
+def test_init_portal_already_configured_skips_verify_by_default(capsys):
+    from htan.init import _init_portal
+    with mock.patch("htan.init.detect_source", return_value="keychain"), \
+         mock.patch("htan.init._verify_portal") as m_verify:
+        assert _init_portal(non_interactive=True) is True
+    m_verify.assert_not_called()
+    assert "use --verify" in capsys.readouterr().err
+
+
 def test_init_portal_configured_but_connectivity_fails(capsys):
     """Returns False if configured but connectivity fails."""
     from htan.init import _init_portal
     with mock.patch("htan.init.detect_source", return_value="file"):
         with mock.patch("htan.init._verify_portal", return_value=False):
-            result = _init_portal(non_interactive=True)
+            result = _init_portal(non_interactive=True, verify=True)
     assert result is False
 
 
@@ -258,6 +331,15 @@ def test_init_gen3_has_config(capsys):
     assert result is True
 
 
+def test_init_gen3_interactive_prints_steps(capsys):
+    from htan.init import _init_gen3
+    setup = {"gen3": {"configured": False, "method": None}}
+    assert _init_gen3(setup=setup) is False
+    err = capsys.readouterr().err
+    assert "\n  Steps when you are ready:\n    1. Apply for dbGaP access" in err
+    assert err.index("credentials.json") < err.index("cannot automate")
+
+
 # ---------------------------------------------------------------------------
 # run_init
 # ---------------------------------------------------------------------------
@@ -318,6 +400,172 @@ def test_run_init_portal_triggers_synapse_first(capsys):
     assert call_order == ["synapse", "portal"]
 
 
+def _fake_setup(synapse=None, portal=None, bigquery=None, gen3=None):
+    return {
+        "synapse": {"configured": synapse is not None, "method": synapse},
+        "portal": {"configured": portal is not None, "source": portal, "path": None},
+        "bigquery": {"configured": bigquery is not None, "method": bigquery},
+        "gen3": {"configured": gen3 is not None, "method": gen3},
+    }
+
+
+def test_run_init_probes_once(capsys):
+    """One _snapshot() feeds show_status and every _init_* call."""
+    from htan.init import run_init
+    setup = _fake_setup(portal="keychain", gen3="~/.gen3/credentials.json")
+    with mock.patch("htan.init._snapshot", return_value=setup) as m_setup, \
+         mock.patch("htan.init.detect_source", side_effect=AssertionError("re-probed")), \
+         mock.patch("htan.init.os.path.exists", side_effect=AssertionError("re-probed")), \
+         mock.patch("htan.init._verify_portal", return_value=True):
+        result = run_init(services=["portal", "gen3"], non_interactive=True)
+    m_setup.assert_called_once()
+    assert result == {"portal": True, "gen3": True}
+
+
+def test_status_display_probes_portal_source_once(capsys):
+    """The portal source comes from the snapshot; no second detect_source()."""
+    from htan.init import run_init
+    with mock.patch("htan.config.detect_source", return_value="file") as m_detect, \
+         mock.patch("htan.init.detect_source", side_effect=AssertionError("re-probed")):
+        result = run_init(status_only=True)
+    m_detect.assert_called_once()
+    assert result["portal"] is True
+
+
+def test_snapshot_runs_checks_concurrently():
+    """All four probes are in flight at once (each waits for the others)."""
+    import threading
+    from htan.init import _snapshot
+    barrier = threading.Barrier(4, timeout=5)
+
+    def probe(value):
+        def run():
+            barrier.wait()
+            return value
+        return run
+
+    with mock.patch("htan.init.check_portal", probe({"source": None})), \
+         mock.patch("htan.init.check_synapse", probe({"method": None})), \
+         mock.patch("htan.init.check_bigquery", probe({"method": "bq"})), \
+         mock.patch("htan.init.check_gen3", probe({"method": "g"})):
+        setup = _snapshot()
+    assert list(setup) == ["portal", "synapse", "bigquery", "gen3"]
+    assert setup["bigquery"] == {"method": "bq"}
+
+
+def test_init_portal_updates_snapshot_after_save(capsys):
+    from htan.init import _init_portal
+    setup = _fake_setup(synapse="SYNAPSE_AUTH_TOKEN")
+    creds = {"host": "h", "port": "8443", "user": "u", "password": "p"}
+    syn = mock.Mock()
+    with mock.patch("htan.init._fetch_portal_credentials", return_value=creds), \
+         mock.patch("htan.init.save_to_keychain", return_value=True), \
+         mock.patch("htan.init._verify_portal_with_creds", return_value=True):
+        assert _init_portal(non_interactive=True, synapse_client=syn, setup=setup)
+    assert setup["portal"]["source"] == "keychain"
+    assert setup["portal"]["configured"] is True
+
+
+def test_fetch_portal_credentials_reads_in_memory():
+    import io
+    from htan.init import _fetch_portal_credentials, PORTAL_CREDENTIALS_SYNAPSE_ID
+    syn = mock.Mock()
+    syn.restGET.return_value = "https://s3.example/creds.json?sig=x\n"
+    body = io.BytesIO(b'{"host": "h", "user": "u"}')
+    with mock.patch("urllib.request.urlopen", return_value=body) as urlopen:
+        creds = _fetch_portal_credentials(syn)
+    assert creds == {"host": "h", "user": "u"}
+    assert PORTAL_CREDENTIALS_SYNAPSE_ID in syn.restGET.call_args.args[0]
+    assert urlopen.call_args.args[0] == "https://s3.example/creds.json?sig=x"
+    syn.get.assert_not_called()
+
+
+def test_init_portal_verifies_while_saving(capsys):
+    """The connectivity probe runs while the keychain save is in progress."""
+    import threading
+    from htan.init import _init_portal
+    creds = {"host": "h", "port": "8443", "user": "u", "password": "p"}
+    verifying = threading.Event()
+    syn = mock.Mock()
+
+    def fake_verify(cfg):
+        assert cfg == creds
+        verifying.set()
+        return True
+
+    with mock.patch("htan.init._fetch_portal_credentials", return_value=creds), \
+         mock.patch("htan.init.save_to_keychain", side_effect=lambda c: verifying.wait(5)), \
+         mock.patch("htan.init._verify_portal_with_creds", side_effect=fake_verify):
+        assert _init_portal(non_interactive=True, synapse_client=syn) is True
+    err = capsys.readouterr().err
+    assert err.index("Saved to OS keychain") < err.index("SELECT 1 OK")
+
+
+def test_run_init_summary_block(capsys):
+    from htan.init import run_init
+    with mock.patch("htan.init._init_bigquery", return_value=True):
+        run_init(services=["bigquery"], non_interactive=True)
+    err = capsys.readouterr().err
+    assert err.endswith(
+        "\n=== Setup Summary ===\n  \u2713 BigQuery (ISB-CGC): Ready (optional)\n\n"
+    )
+
+
+def test_run_init_menu_choice(capsys):
+    from htan.init import run_init
+    with mock.patch("htan.init._snapshot", return_value=_fake_setup()), \
+         mock.patch("htan.init._prompt", return_value="3"), \
+         mock.patch("htan.init._init_bigquery", return_value=True) as m_bq:
+        assert run_init() == {"bigquery": True}
+    m_bq.assert_called_once()
+
+
+def test_run_init_menu_enter_quits(capsys):
+    from htan.init import run_init
+    current = {"portal": False, "synapse": False, "bigquery": False, "gen3": False}
+    with mock.patch("htan.init._snapshot", return_value=_fake_setup()), \
+         mock.patch("builtins.input", return_value=""):
+        assert run_init() == current
+    assert "No changes made" in capsys.readouterr().err
+
+
+def test_run_init_non_interactive_overlaps_independent_steps(capsys):
+    """portal/bigquery/gen3 run together; their output is replayed in order."""
+    import threading
+    from htan.init import run_init
+    barrier = threading.Barrier(3, timeout=5)
+    stderr = sys.stderr
+
+    def step(name):
+        def run(out, **kwargs):
+            barrier.wait()
+            assert sys.stderr is stderr  # the global stream is never swapped
+            print(f"[{name} output]", file=out)
+            return True
+        return run
+
+    with mock.patch("htan.init._snapshot", return_value=_fake_setup()), \
+         mock.patch("htan.init._init_synapse", return_value=(True, None)), \
+         mock.patch("htan.init._init_portal", side_effect=step("portal")), \
+         mock.patch("htan.init._init_bigquery", side_effect=step("bigquery")), \
+         mock.patch("htan.init._init_gen3", side_effect=step("gen3")):
+        result = run_init(non_interactive=True)
+    assert result == {"synapse": True, "portal": True, "bigquery": True, "gen3": True}
+    err = capsys.readouterr().err
+    assert err.index("[portal output]") < err.index("[bigquery output]") < err.index("[gen3 output]")
+
+
+def test_init_steps_write_to_out_stream(capsys):
+    import io
+    from htan.init import _init_gen3
+    buf = io.StringIO()
+    with mock.patch.dict(os.environ, {}, clear=True), \
+         mock.patch("htan.init.os.path.exists", return_value=False):
+        assert _init_gen3(non_interactive=True, out=buf) is False
+    assert "Gen3/CRDC" in buf.getvalue()
+    assert capsys.readouterr().err == ""
+
+
 # ---------------------------------------------------------------------------
 # cli_main
 # ---------------------------------------------------------------------------
@@ -330,6 +578,13 @@ def test_cli_main_status(capsys):
     assert "Welcome" in captured.err
 
 
+def test_cli_main_passes_verify():
+    from htan.init import cli_main
+    with mock.patch("htan.init.run_init", return_value={"portal": True}) as m_run:
+        cli_main(["portal", "--verify"])
+    assert m_run.call_args.kwargs["verify"] is True
+
+
 def test_cli_main_help(capsys):
     """cli_main --help prints usage."""
     from htan.init import cli_main
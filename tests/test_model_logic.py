@@ -20,6 +20,7 @@ from htan.model import (
     DataModel,
     MODEL_TAG,
 )
+from tests.http_fakes import FakeURLResponse
 
 
 # ---------------------------------------------------------------------------
@@ -293,7 +294,7 @@ def test_categorize_other():
 # ===========================================================================
 
 def test_datamodel_components(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     comps = dm.components()
     names = {c["name"] for c in comps}
@@ -302,7 +303,7 @@ def test_datamodel_components(monkeypatch):
 
 
 def test_datamodel_attributes(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     name, attrs = dm.attributes("Biospecimen")
     assert name == "Biospecimen"
@@ -310,7 +311,7 @@ def test_datamodel_attributes(monkeypatch):
 
 
 def test_datamodel_describe(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     detail = dm.describe("File Format")
     assert detail["attribute"] == "File Format"
@@ -320,7 +321,7 @@ def test_datamodel_describe(monkeypatch):
 
 
 def test_datamodel_valid_values(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     vv = dm.valid_values("Gender")
     assert "male" in vv
@@ -328,14 +329,14 @@ def test_datamodel_valid_values(monkeypatch):
 
 
 def test_datamodel_valid_values_empty(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     vv = dm.valid_values("Barcode")
     assert vv == []
 
 
 def test_datamodel_search(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     results = dm.search("barcode")
     assert len(results) >= 1
@@ -344,28 +345,28 @@ def test_datamodel_search(monkeypatch):
 
 
 def test_datamodel_search_in_description(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     results = dm.search("identifier")
     assert any("description" in r["match_in"] for r in results)
 
 
 def test_datamodel_search_in_valid_values(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     results = dm.search("fastq")
     assert any("valid values" in r["match_in"] for r in results)
 
 
 def test_datamodel_search_no_results(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     results = dm.search("zzz_nothing_matches")
     assert results == []
 
 
 def test_datamodel_required(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     req = dm.required("Biospecimen")
     names = [a["name"] for a in req]
@@ -376,7 +377,7 @@ def test_datamodel_required(monkeypatch):
 
 
 def test_datamodel_deps(monkeypatch):
-    monkeypatch.setattr("htan.model._load_model", lambda tag=None: FIXTURE_ROWS)
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
     dm = DataModel()
     chain = dm.deps("scRNA-seq Level 1")
     names = [c["name"] for c in chain]
@@ -454,3 +455,335 @@ def test_format_deps_text():
 def test_format_deps_text_empty():
     text = _format_deps_text([])
     assert "No dependency" in text
+
+
+# ===========================================================================
+# DataModel caching
+# ===========================================================================
+
+def test_datamodel_components_built_once(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    calls = []
+    real = _get_components
+
+    def counting(rows):
+        calls.append(1)
+        return real(rows)
+
+    monkeypatch.setattr("htan.model._get_components", counting)
+    dm = DataModel()
+    dm.components()
+    dm.attributes("Biospecimen")
+    dm.deps("scRNA-seq Level 1")
+    assert len(calls) == 1
+
+
+def test_datamodel_reload_clears_caches(monkeypatch):
+    loads = []
+
+    def fake_load(tag=None, cache_file=None):
+        loads.append(1)
+        return FIXTURE_ROWS
+
+    monkeypatch.setattr("htan.model._load_model", fake_load)
+    dm = DataModel()
+    dm.components()
+    dm.reload()
+    assert dm._components is None
+    dm.components()
+    assert len(loads) == 2
+
+
+def test_find_attribute_uses_lowercase_index():
+    from htan.model import _index_rows
+    _, by_lower = _index_rows(FIXTURE_ROWS)
+    row = _find_attribute([], "file format", by_lower)
+    assert row["Attribute"] == "File Format"
+    # Substring fallback still scans rows on an index miss
+    assert _find_attribute(FIXTURE_ROWS, "Barcod", by_lower)["Attribute"] == "Barcode"
+
+
+def test_datamodel_load_builds_name_index(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    dm = DataModel()
+    dm._load()
+    assert dm._by_name["Gender"]["Parent"] == "Clinical"
+    assert dm._by_name_lower["gender"] is dm._by_name["Gender"]
+
+
+def test_datamodel_search_uses_precomputed_index(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    dm = DataModel()
+    dm._load()
+    assert len(dm._search_index) == len(FIXTURE_ROWS)
+    name_lower, desc_lower, valid_lower, row = dm._search_index[0]
+    assert name_lower == "biospecimen"
+    results = dm.search("FASTQ")
+    assert [r["name"] for r in results] == ["File Format"]
+    assert results[0]["description"] == "Format of the data file"
+
+
+def test_datamodel_search_many_matches_single_searches(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    dm = DataModel()
+    keywords = ["barcode", "Identifier", "fastq", "zzz_nothing", "a.b"]
+    batch = dm.search_many(keywords)
+    assert list(batch) == keywords
+    for kw in keywords:
+        assert batch[kw] == dm.search(kw)
+    assert batch["zzz_nothing"] == []
+
+
+def test_datamodel_search_many_empty(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    assert DataModel().search_many([]) == {}
+
+
+# ===========================================================================
+# _load_model pickle cache
+# ===========================================================================
+
+_CSV_TEXT = "Attribute,Description,Parent\nFile Format,Format of the data file,Assay\n"
+
+
+def test_load_model_writes_and_reuses_pickle(tmp_path, monkeypatch):
+    from htan import model
+    csv_path = tmp_path / "HTAN.model.csv"
+    csv_path.write_text(_CSV_TEXT)
+    monkeypatch.setattr(model, "CACHE_FILE", str(csv_path))
+
+    rows = model._load_model()
+    assert rows[0]["Attribute"] == "File Format"
+    assert (tmp_path / "HTAN.model.csv.pkl").exists()
+
+    def fail(*a, **kw):
+        raise AssertionError("CSV should not be re-parsed")
+
+    monkeypatch.setattr(model, "_parse_rows", fail)
+    assert model._load_model() == rows
+
+
+def test_load_model_reparses_when_csv_changes(tmp_path, monkeypatch):
+    from htan import model
+    csv_path = tmp_path / "HTAN.model.csv"
+    csv_path.write_text(_CSV_TEXT)
+    monkeypatch.setattr(model, "CACHE_FILE", str(csv_path))
+    model._load_model()
+
+    csv_path.write_text(_CSV_TEXT + "Barcode,Sample barcode sequence,Assay\n")
+    rows = model._load_model()
+    assert [r["Attribute"] for r in rows] == ["File Format", "Barcode"]
+
+
+def test_parse_rows_matches_dictreader():
+    import csv
+    import io
+    from htan.model import _parse_rows
+    text = ('Attribute,Description,Valid Values\n'
+            'File Format,"Format, of the data file","fastq,bam"\n'
+            '\n'
+            'Barcode,Sample barcode sequence,\n')
+    assert _parse_rows(io.StringIO(text)) == list(csv.DictReader(io.StringIO(text)))
+    assert _parse_rows(io.StringIO("")) == []
+
+
+def test_parse_rows_strips_and_pads_cells():
+    import io
+    from htan.model import _parse_rows
+    rows = _parse_rows(io.StringIO("Attribute, Parent,Required\n Gender , Clinical \n"))
+    assert rows == [{"Attribute": "Gender", "Parent": "Clinical", "Required": ""}]
+
+
+def test_parse_rows_drops_unused_columns():
+    import io
+    from htan.model import _parse_rows
+    rows = _parse_rows(io.StringIO("Attribute,Properties,Parent\nGender,x,Clinical\n"))
+    assert rows == [{"Attribute": "Gender", "Parent": "Clinical"}]
+
+
+# ===========================================================================
+# download_model conditional GET
+# ===========================================================================
+
+def test_download_model_stores_validators(tmp_path, monkeypatch):
+    from unittest.mock import patch
+    from htan import model
+    monkeypatch.setattr(model, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(model, "CACHE_FILE", str(tmp_path / "HTAN.model.csv"))
+    resp = FakeURLResponse(_CSV_TEXT.encode(), {"ETag": '"v1"', "Last-Modified": "Mon"})
+    with patch("htan.model.urllib.request.urlopen", return_value=resp):
+        model.download_model(force=True)
+    meta = model._read_meta(model.CACHE_FILE)
+    assert meta == {"url": model._get_model_url(), "etag": '"v1"', "last_modified": "Mon"}
+
+
+def test_download_model_check_updates_not_modified(tmp_path, monkeypatch):
+    import urllib.error
+    from unittest.mock import patch
+    from htan import model
+    cache = tmp_path / "HTAN.model.csv"
+    cache.write_text(_CSV_TEXT)
+    monkeypatch.setattr(model, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(model, "CACHE_FILE", str(cache))
+    model._write_meta({"url": model._get_model_url(), "etag": '"v1"', "last_modified": None},
+                      str(cache))
+    captured = {}
+
+    def fake_urlopen(req, timeout=None, context=None):
+        captured["etag"] = req.get_header("If-none-match")
+        raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+
+    with patch("htan.model.urllib.request.urlopen", side_effect=fake_urlopen):
+        assert model.download_model(force=True, check_updates=True) == str(cache)
+    assert captured["etag"] == '"v1"'
+    assert cache.read_text() == _CSV_TEXT
+
+
+def test_download_model_unconditional_without_flag(tmp_path, monkeypatch):
+    from unittest.mock import patch
+    from htan import model
+    cache = tmp_path / "HTAN.model.csv"
+    cache.write_text(_CSV_TEXT)
+    monkeypatch.setattr(model, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(model, "CACHE_FILE", str(cache))
+    model._write_meta({"url": model._get_model_url(), "etag": '"v1"'}, str(cache))
+    resp = FakeURLResponse(_CSV_TEXT.encode())
+    with patch("htan.model.urllib.request.urlopen", return_value=resp) as urlopen:
+        model.download_model(force=True)
+    assert urlopen.call_args.args[0].get_header("If-none-match") is None
+
+
+def test_ssl_contexts_built_once():
+    from htan.model import _make_ssl_context, _make_unverified_ssl_context
+    assert _make_ssl_context() is _make_ssl_context()
+    unverified = _make_unverified_ssl_context()
+    assert unverified is _make_unverified_ssl_context()
+    assert unverified.check_hostname is False
+
+
+def test_get_components_discovers_referenced_declared_earlier():
+    rows = [
+        _make_row("Clinical", depends_on="Gender"),
+        _make_row("Gender"),
+        _make_row("Biospecimen", depends_on="Biospecimen Type", dep_comp="Clinical"),
+    ]
+    assert [c["name"] for c in _get_components(rows)] == ["Biospecimen", "Clinical"]
+
+
+def test_download_model_rejects_csv_without_attribute(tmp_path, monkeypatch):
+    from unittest.mock import patch
+    from htan import model
+    cache = tmp_path / "HTAN.model.csv"
+    cache.write_text(_CSV_TEXT)
+    monkeypatch.setattr(model, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(model, "CACHE_FILE", str(cache))
+    resp = FakeURLResponse(b"Name,Description\nx,y\n")
+    with patch("htan.model.urllib.request.urlopen", return_value=resp), \
+         pytest.raises(SystemExit):
+        model.download_model(force=True)
+    assert cache.read_text() == _CSV_TEXT
+    assert not (tmp_path / "HTAN.model.csv.tmp").exists()
+
+
+def test_download_model_streams_in_chunks(tmp_path, monkeypatch):
+    from unittest.mock import patch
+    from htan import model
+    monkeypatch.setattr(model, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(model, "CACHE_FILE", str(tmp_path / "HTAN.model.csv"))
+    resp = FakeURLResponse(_CSV_TEXT.encode())
+    sizes = []
+    real_read = resp.read
+
+    def read(n=-1):
+        sizes.append(n)
+        return real_read(n)
+
+    resp.read = read
+    with patch("htan.model.urllib.request.urlopen", return_value=resp):
+        model.download_model(force=True)
+    assert sizes and all(n == 64 * 1024 for n in sizes)
+    assert (tmp_path / "HTAN.model.csv").read_text() == _CSV_TEXT
+
+
+def test_datamodel_describe_memoized_until_reload(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    calls = []
+    real = _find_attribute
+
+    def counting(*args):
+        calls.append(args[1])
+        return real(*args)
+
+    monkeypatch.setattr("htan.model._find_attribute", counting)
+    dm = DataModel()
+    first = dm.describe("File Format")
+    assert dm.describe("File Format") == first
+    dm.valid_values("Gender")
+    dm.valid_values("Gender")
+    assert calls == ["File Format", "Gender"]
+    dm.reload()
+    dm.describe("File Format")
+    assert calls[-1] == "File Format" and len(calls) == 3
+
+
+def test_datamodel_memoized_results_are_copies(monkeypatch):
+    monkeypatch.setattr("htan.model._load_model", lambda tag=None, cache_file=None: FIXTURE_ROWS)
+    dm = DataModel()
+    _, original = dm.attributes("Biospecimen")
+    dm.valid_values("Gender").append("not-a-value")
+    dm.describe("File Format")["valid_values"].clear()
+    _, attrs = dm.attributes("Biospecimen")
+    attrs[0]["name"] = "changed"
+    attrs.reverse()
+    assert "not-a-value" not in dm.valid_values("Gender")
+    assert "fastq" in dm.describe("File Format")["valid_values"]
+    assert dm.attributes("Biospecimen")[1] == original
+
+
+def test_split_field():
+    from htan.model import _split_field
+    assert _split_field(" fastq, bam ,,h5ad ") == ("fastq", "bam", "h5ad")
+    assert _split_field("") == ()
+    assert _split_field(None) == ()
+    assert _split_field("a,b") is _split_field("a,b")
+
+
+def test_datamodel_cache_dir_is_per_instance(tmp_path, monkeypatch):
+    from htan import model
+    default = model.CACHE_FILE
+    (tmp_path / "HTAN.model.csv").write_text(_CSV_TEXT)
+    dm = DataModel(cache_dir=str(tmp_path))
+    assert model.CACHE_FILE == default
+    assert dm.describe("File Format")["parent"] == "Assay"
+    assert (tmp_path / "HTAN.model.csv.pkl").exists()
+
+
+def test_find_attribute_ambiguous_stops_at_suggestion_limit():
+    rows = [_make_row(f"Sample {i}") for i in range(50)]
+    seen = []
+
+    class Spy(list):
+        def __iter__(self):
+            for row in super().__iter__():
+                seen.append(row["Attribute"])
+                yield row
+
+    with pytest.raises(ValueError, match="Sample 9") as exc:
+        _find_attribute(Spy(rows), "sample", by_name_lower={})
+    assert "Sample 10" not in str(exc.value)
+    assert len(seen) == 10
+
+
+def test_categorize_memoized():
+    _categorize_component.cache_clear()
+    _categorize_component("scRNA-seq Level 1", "Sequencing")
+    _categorize_component("scRNA-seq Level 1", "Sequencing")
+    assert _categorize_component.cache_info().hits == 1
+
+
+def test_dependency_chain_ambiguous_lists_at_most_ten():
+    lookup = {f"assay {i}": {"name": f"Assay {i}", "depends_on_components": []}
+              for i in range(30)}
+    with pytest.raises(ValueError) as exc:
+        _get_dependency_chain([], "assay", lookup)
+    assert str(exc.value).count("Assay ") == 10
@@ -1,8 +1,8 @@
 """Tests for htan.query.portal — PortalClient methods and clickhouse_query."""
 
+import gzip
 import json
 from unittest.mock import patch, MagicMock
-import urllib.error
 
 import pytest
 
@@ -69,8 +69,9 @@ def test_portal_client_find_files_with_data_file_id():
         mock_ch.return_value = '{"DataFileID":"HTA9_1_19512"}\n'
         rows = client.find_files(data_file_id="HTA9_1_19512")
     sql_sent = mock_ch.call_args[0][0]
-    assert "DataFileID IN" in sql_sent
-    assert "HTA9_1_19512" in sql_sent
+    assert "DataFileID IN {ids:Array(String)}" in sql_sent
+    assert "HTA9_1_19512" not in sql_sent
+    assert mock_ch.call_args.kwargs["params"] == {"ids": "['HTA9_1_19512']"}
 
 
 def test_portal_client_find_files_no_filters():
@@ -101,8 +102,8 @@ def test_portal_client_find_files_escapes_input():
          patch("htan.query.portal.clickhouse_query") as mock_ch:
         mock_ch.return_value = ""
         client.find_files(data_file_id="O'Brien")
-    sql_sent = mock_ch.call_args[0][0]
-    assert "\\'" in sql_sent  # single quote is escaped
+    ids_param = mock_ch.call_args.kwargs["params"]["ids"]
+    assert ids_param == "['O\\'Brien']"  # single quote is escaped
 
 
 # ===========================================================================
@@ -124,16 +125,39 @@ def test_portal_client_list_tables():
 
 def test_portal_client_describe_table():
     client = PortalClient(config=FAKE_CONFIG)
-    schema_resp = '{"name":"DataFileID","type":"String","default_expression":"","comment":""}\n'
-    count_resp = '{"cnt":"1234"}\n'
+    schema_resp = ('{"name":"DataFileID","type":"String","default_expression":"","comment":"","row_count":"1234"}\n'
+                   '{"name":"Filename","type":"String","default_expression":"","comment":"","row_count":"1234"}\n')
     with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
          patch("htan.query.portal.clickhouse_query") as mock_ch:
-        mock_ch.side_effect = [schema_resp, count_resp]
+        mock_ch.return_value = schema_resp
         info = client.describe_table("files")
+    mock_ch.assert_called_once()
+    assert mock_ch.call_args.kwargs["params"] == {"table": "files"}
+    assert "{table:String}" in mock_ch.call_args[0][0]
     assert info["table"] == "files"
     assert info["row_count"] == "1234"
-    assert len(info["columns"]) == 1
-    assert info["columns"][0]["name"] == "DataFileID"
+    assert len(info["columns"]) == 2
+    assert info["columns"][0] == {"name": "DataFileID", "type": "String",
+                                  "default_expression": "", "comment": ""}
+
+
+def test_portal_client_describe_table_count_fallback():
+    client = PortalClient(config=FAKE_CONFIG)
+    schema_resp = '{"name":"DataFileID","type":"String","default_expression":"","comment":"","row_count":null}\n'
+    with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
+         patch("htan.query.portal.clickhouse_query") as mock_ch:
+        mock_ch.side_effect = [schema_resp, '{"cnt":"42"}\n']
+        info = client.describe_table("files_view")
+    assert info["row_count"] == "42"
+    assert "count() as cnt FROM files_view" in mock_ch.call_args[0][0]
+
+
+def test_portal_client_describe_table_missing():
+    client = PortalClient(config=FAKE_CONFIG)
+    with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
+         patch("htan.query.portal.clickhouse_query", return_value=""):
+        with pytest.raises(PortalError, match="not found"):
+            client.describe_table("nope")
 
 
 def test_portal_client_describe_table_invalid_name():
@@ -175,10 +199,86 @@ def test_portal_client_get_manifest():
     with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
          patch("htan.query.portal.clickhouse_query") as mock_ch:
         mock_ch.return_value = '{"DataFileID":"HTA9_1_19512","synapseId":"syn123"}\n'
-        rows = client.get_manifest(["HTA9_1_19512"])
+        rows = client.get_manifest(["HTA9_1_19512", "HTA9_1_19513"])
     assert len(rows) == 1
     sql_sent = mock_ch.call_args[0][0]
-    assert "HTA9_1_19512" in sql_sent
+    assert "DataFileID IN {ids:Array(String)}" in sql_sent
+    assert mock_ch.call_args.kwargs["params"] == {"ids": "['HTA9_1_19512','HTA9_1_19513']"}
+
+
+# ===========================================================================
+# PortalClient.summary
+# ===========================================================================
+
+_FUSED_SUMMARY_RESPONSE = "\n".join(json.dumps(r) for r in [
+    {"bucket": "files_by_atlas", "bucket_key": "HTAN OHSU", "n": 2},
+    {"bucket": "files_by_atlas", "bucket_key": "HTAN HMS", "n": 3},
+    {"bucket": "files_by_assay", "bucket_key": "scRNA-seq", "n": 5},
+    {"bucket": "participants_by_atlas", "bucket_key": "HTAN HMS", "n": 7},
+    {"bucket": "total_files", "bucket_key": "", "n": 300},
+    {"bucket": "total_participants", "bucket_key": "", "n": 70},
+])
+
+
+def test_portal_client_summary_single_round_trip():
+    client = PortalClient(config=FAKE_CONFIG)
+    with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
+         patch("htan.query.portal.clickhouse_query", return_value=_FUSED_SUMMARY_RESPONSE) as mock_ch:
+        result = client.summary()
+    mock_ch.assert_called_once()
+    assert "UNION ALL" in mock_ch.call_args[0][0]
+    assert result == {
+        "database": "htan_v1",
+        "total_files": 300,
+        "total_participants": 70,
+        "files_by_atlas": [{"atlas_name": "HTAN HMS", "file_count": 3},
+                           {"atlas_name": "HTAN OHSU", "file_count": 2}],
+        "files_by_assay": [{"assayName": "scRNA-seq", "file_count": 5}],
+        "files_by_organ": [],
+        "participants_by_atlas": [{"atlas_name": "HTAN HMS", "participant_count": 7}],
+    }
+
+
+def _fake_summary_query(sql, **kwargs):
+    if "UNION ALL" in sql or "arrayJoin(organType)" in sql:
+        raise PortalError("boom")
+    if "GROUP BY atlas_name" in sql and "demographics" in sql:
+        return '{"atlas_name": "HTAN HMS", "participant_count": 7}\n'
+    if "GROUP BY" in sql:
+        return '{"atlas_name": "HTAN HMS", "file_count": 3}\n'
+    if "FROM demographics" in sql:
+        return '{"total": 70}\n'
+    return '{"total": 300}\n'
+
+
+def test_portal_client_summary_falls_back_to_separate_queries():
+    client = PortalClient(config=FAKE_CONFIG)
+    with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
+         patch("htan.query.portal.clickhouse_query", side_effect=_fake_summary_query) as mock_ch:
+        result = client.summary()
+    assert mock_ch.call_count == 7
+    assert all(c.kwargs["database"] == "htan_v1" for c in mock_ch.call_args_list)
+    assert result["total_files"] == 300
+    assert result["total_participants"] == 70
+    assert result["files_by_organ"] == []
+    assert result["participants_by_atlas"] == [{"atlas_name": "HTAN HMS", "participant_count": 7}]
+
+
+def test_portal_client_summary_fallback_runs_concurrently():
+    import threading
+    barrier = threading.Barrier(6, timeout=5)
+
+    def fake(sql, **kwargs):
+        if "UNION ALL" in sql:
+            raise PortalError("boom")
+        barrier.wait()  # Times out unless all six run at once
+        return '{"total": 1}\n'
+
+    client = PortalClient(config=FAKE_CONFIG)
+    with patch("htan.query.portal.discover_database", return_value="htan_v1"), \
+         patch("htan.query.portal.clickhouse_query", side_effect=fake):
+        result = client.summary()
+    assert result["total_files"] == 1
 
 
 # ===========================================================================
@@ -186,43 +286,67 @@ def test_portal_client_get_manifest():
 # ===========================================================================
 
 def test_clickhouse_query_http_error():
-    mock_resp = MagicMock()
-    mock_resp.read.return_value = b"Syntax error"
-    http_err = urllib.error.HTTPError("http://x", 400, "Bad Request", {}, mock_resp)
-    with patch("htan.query.portal.urllib.request.urlopen", side_effect=http_err), \
-         patch("htan.query.portal._make_ssl_context"):
+    with patch("htan._http.request", return_value=(400, "Bad Request", {}, b"Syntax error")):
         with pytest.raises(PortalError, match="ClickHouse HTTP 400"):
             clickhouse_query("SELECT 1", config=FAKE_CONFIG)
 
 
 def test_clickhouse_query_url_error():
-    with patch("htan.query.portal.urllib.request.urlopen",
-               side_effect=urllib.error.URLError("Connection refused")), \
-         patch("htan.query.portal._make_ssl_context"):
+    with patch("htan._http.request", side_effect=ConnectionRefusedError("Connection refused")):
         with pytest.raises(PortalError, match="Could not connect"):
             clickhouse_query("SELECT 1", config=FAKE_CONFIG)
 
 
 def test_clickhouse_query_timeout():
-    with patch("htan.query.portal.urllib.request.urlopen",
-               side_effect=TimeoutError()), \
-         patch("htan.query.portal._make_ssl_context"):
+    with patch("htan._http.request", side_effect=TimeoutError()):
         with pytest.raises(PortalError, match="timed out"):
             clickhouse_query("SELECT 1", config=FAKE_CONFIG)
 
 
 def test_clickhouse_query_hint_not_equal():
     """Error message containing != should suggest <> hint."""
-    mock_resp = MagicMock()
-    mock_resp.read.return_value = b"Unrecognized token: !="
-    http_err = urllib.error.HTTPError("http://x", 400, "Bad Request", {}, mock_resp)
-    with patch("htan.query.portal.urllib.request.urlopen", side_effect=http_err), \
-         patch("htan.query.portal._make_ssl_context"):
+    with patch("htan._http.request",
+               return_value=(400, "Bad Request", {}, b"Unrecognized token: !=")):
         with pytest.raises(PortalError) as exc_info:
             clickhouse_query("SELECT * WHERE x != 1", config=FAKE_CONFIG)
         assert any("<>" in h for h in exc_info.value.hints)
 
 
+def test_clickhouse_query_sends_auth_and_params():
+    with patch("htan._http.request", return_value=(200, "OK", {}, b'{"a":1}\n')) as mock_post:
+        assert clickhouse_query("SELECT 1", database="htan_v1", config=FAKE_CONFIG) == '{"a":1}\n'
+    method, netloc, path, body, headers, timeout = mock_post.call_args[0]
+    assert method == "POST"
+    assert netloc == f"{FAKE_CONFIG['host']}:{FAKE_CONFIG['port']}"
+    assert path.startswith("/?") and "database=htan_v1" in path
+    assert body == b"SELECT 1"
+    assert headers["Authorization"].startswith("Basic ")
+    assert "gzip" in headers["Accept-Encoding"]
+    assert "enable_http_compression=1" in path
+
+
+def test_clickhouse_query_binds_params_in_url():
+    with patch("htan._http.request", return_value=(200, "OK", {}, b"")) as mock_post:
+        clickhouse_query("SELECT {t:String}", config=FAKE_CONFIG, params={"t": "a b'c"})
+    path = mock_post.call_args[0][2]
+    assert "param_t=a+b%27c" in path
+
+
+def test_clickhouse_query_decompresses_gzip():
+    payload = gzip.compress(b'{"a":1}\n')
+    with patch("htan._http.request",
+               return_value=(200, "OK", {"Content-Encoding": "gzip"}, payload)):
+        assert clickhouse_query("SELECT 1", config=FAKE_CONFIG) == '{"a":1}\n'
+
+
+def test_clickhouse_query_decompresses_gzip_error_body():
+    payload = gzip.compress(b"Code: 62. Syntax error")
+    with patch("htan._http.request",
+               return_value=(400, "Bad Request", {"Content-Encoding": "gzip"}, payload)):
+        with pytest.raises(PortalError, match="Syntax error"):
+            clickhouse_query("SELECT", config=FAKE_CONFIG)
+
+
 # ===========================================================================
 # discover_database
 # ===========================================================================
@@ -245,3 +369,32 @@ def test_discover_database_empty_response():
         mock_ch.return_value = ""
         db = discover_database(config={**FAKE_CONFIG, "default_database": "htan_default"})
     assert db == "htan_default"
+
+
+def test_discover_database_cache_skips_query(tmp_path, monkeypatch):
+    monkeypatch.setattr("htan.query.portal.DB_CACHE_FILE", str(tmp_path / "latest_db.json"))
+    with patch("htan.query.portal.clickhouse_query", return_value="htan_v1\nhtan_v2\n") as mock_ch:
+        assert discover_database(config=FAKE_CONFIG, cache_ttl=3600) == "htan_v2"
+        assert discover_database(config=FAKE_CONFIG, cache_ttl=3600) == "htan_v2"
+    assert mock_ch.call_count == 1
+
+
+def test_discover_database_cache_expires_and_checks_host(tmp_path, monkeypatch):
+    cache_file = tmp_path / "latest_db.json"
+    monkeypatch.setattr("htan.query.portal.DB_CACHE_FILE", str(cache_file))
+    cache_file.write_text(json.dumps({"host": FAKE_CONFIG["host"], "db": "htan_old", "ts": 0}))
+    with patch("htan.query.portal.clickhouse_query", return_value="htan_v3\n"):
+        assert discover_database(config=FAKE_CONFIG, cache_ttl=3600) == "htan_v3"
+    other_host = {**FAKE_CONFIG, "host": "other.example.com"}
+    with patch("htan.query.portal.clickhouse_query", return_value="htan_v9\n") as mock_ch:
+        assert discover_database(config=other_host, cache_ttl=3600) == "htan_v9"
+    mock_ch.assert_called_once()
+
+
+def test_discover_database_cache_ignores_fallback(tmp_path, monkeypatch):
+    cache_file = tmp_path / "latest_db.json"
+    monkeypatch.setattr("htan.query.portal.DB_CACHE_FILE", str(cache_file))
+    cfg = {**FAKE_CONFIG, "default_database": "htan_fallback"}
+    with patch("htan.query.portal.clickhouse_query", side_effect=Exception("fail")):
+        assert discover_database(config=cfg, cache_ttl=3600) == "htan_fallback"
+    assert not cache_file.exists()
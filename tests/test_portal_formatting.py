@@ -29,6 +29,22 @@ def test_parse_json_rows_skips_blank_lines():
     assert len(rows) == 2
 
 
+def test_parse_json_rows_escaped_newlines_and_unicode():
+    text = '{"a": "line1\\nline2, x"}\n{"a": "Tumour α-SMA"}'
+    assert parse_json_rows(text) == [{"a": "line1\nline2, x"}, {"a": "Tumour α-SMA"}]
+
+
+def test_parse_json_rows_comma_line_not_merged():
+    rows = parse_json_rows('{"a": 1}\n1, 2\n')
+    assert rows == [{"a": 1}]
+
+
+def test_parse_json_rows_stdlib_fallback():
+    from unittest.mock import patch
+    with patch("htan._fastjson.orjson", None):
+        assert parse_json_rows('{"a": 1}\n{"a": 2}') == [{"a": 1}, {"a": 2}]
+
+
 def test_parse_json_rows_skips_error_lines():
     text = 'Code: 47. Some error\n{"a": 1}\n'
     rows = parse_json_rows(text)
@@ -13,6 +13,7 @@ from htan.pubs import (
     format_article_text,
     EUTILS_BASE,
 )
+from tests.http_fakes import FakeConnection, FakeHTTPResponse
 
 
 # ===========================================================================
@@ -20,27 +21,133 @@ from htan.pubs import (
 # ===========================================================================
 
 def test_eutils_request_success():
-    mock_resp = MagicMock()
-    mock_resp.read.return_value = b'{"result": "ok"}'
-    mock_resp.__enter__ = lambda s: s
-    mock_resp.__exit__ = MagicMock(return_value=False)
-    with patch("htan.pubs.urllib.request.urlopen", return_value=mock_resp), \
+    with patch("htan.pubs._send", return_value=(200, "OK", {}, b'{"result": "ok"}')), \
          patch("htan.pubs.time.sleep"):
         result = eutils_request("esearch.fcgi", {"db": "pubmed", "term": "test"})
     assert result == '{"result": "ok"}'
 
 
 def test_eutils_request_adds_tool_params():
-    mock_resp = MagicMock()
-    mock_resp.read.return_value = b"ok"
-    mock_resp.__enter__ = lambda s: s
-    mock_resp.__exit__ = MagicMock(return_value=False)
-    with patch("htan.pubs.urllib.request.urlopen", return_value=mock_resp) as mock_open, \
+    with patch("htan.pubs._send", return_value=(200, "OK", {}, b"ok")) as mock_get, \
          patch("htan.pubs.time.sleep"):
         eutils_request("esearch.fcgi", {"db": "pubmed"})
-    url_called = mock_open.call_args[0][0].full_url
-    assert "tool=htan_skill" in url_called
-    assert "email=" in url_called
+    path_called = mock_get.call_args[0][0]
+    assert path_called.startswith("/entrez/eutils/esearch.fcgi?")
+    assert "tool=htan_skill" in path_called
+    assert "email=" in path_called
+
+
+def test_eutils_request_http_error_raises():
+    from htan.pubs import EutilsError
+    with patch("htan.pubs._send", return_value=(404, "Not Found", {}, b"")) as mock_get, \
+         patch("htan.pubs.time.sleep"), \
+         pytest.raises(EutilsError, match="HTTP 404"):
+        eutils_request("esearch.fcgi", {"db": "pubmed"})
+    assert mock_get.call_count == 1
+
+
+def test_eutils_request_retries_transient_status():
+    responses = [(429, "Too Many Requests", {"Retry-After": "2"}, b""),
+                 (503, "Service Unavailable", {}, b""),
+                 (200, "OK", {}, b"ok")]
+    with patch("htan.pubs._send", side_effect=responses), \
+         patch("htan.pubs.time.sleep") as sleep:
+        assert eutils_request("esearch.fcgi", {"db": "pubmed"}) == "ok"
+    assert 2.0 in [c.args[0] for c in sleep.call_args_list]
+
+
+def test_eutils_request_gives_up_after_max_retries():
+    from htan import pubs
+    with patch("htan.pubs._send", return_value=(503, "Service Unavailable", {}, b"")) as mock_get, \
+         patch("htan.pubs.time.sleep"), \
+         pytest.raises(pubs.EutilsError, match="HTTP 503"):
+        eutils_request("esearch.fcgi", {"db": "pubmed"})
+    assert mock_get.call_count == pubs.MAX_RETRIES + 1
+
+
+def test_eutils_request_retries_timeout():
+    with patch("htan.pubs._send", side_effect=[TimeoutError(), (200, "OK", {}, b"ok")]), \
+         patch("htan.pubs.time.sleep"):
+        assert eutils_request("esearch.fcgi", {"db": "pubmed"}) == "ok"
+
+
+def test_retry_delay_caps_and_honors_retry_after():
+    from htan.pubs import _retry_delay
+    assert _retry_delay(0, "7") == 7.0
+    assert _retry_delay(10) == 60.0
+    assert 1.0 <= _retry_delay(0, "soon") < 2.0
+
+
+def test_cli_reports_eutils_error(capsys):
+    from htan.pubs import EutilsError, cli_main
+    with patch("htan.pubs.fetch", side_effect=EutilsError("HTTP 400 from E-utilities: Bad")), \
+         pytest.raises(SystemExit) as exc:
+        cli_main(["fetch", "123"])
+    assert exc.value.code == 1
+    assert "Error: HTTP 400 from E-utilities" in capsys.readouterr().err
+
+
+def test_rate_limit_skips_sleep_after_slow_request(monkeypatch):
+    import time as _time
+    from htan import pubs
+    monkeypatch.setattr(pubs, "_last_request", _time.monotonic() - 1.0)
+    with patch("htan.pubs.time.sleep") as sleep:
+        pubs._rate_limit()
+    sleep.assert_not_called()
+
+
+def test_rate_limit_waits_remaining_delay(monkeypatch):
+    import time as _time
+    from htan import pubs
+    monkeypatch.setattr(pubs, "_last_request", _time.monotonic())
+    with patch("htan.pubs.time.sleep") as sleep:
+        pubs._rate_limit()
+    (waited,), _ = sleep.call_args
+    assert 0 < waited <= pubs.REQUEST_DELAY
+
+
+def test_send_decompresses_gzip_response():
+    import gzip
+    from htan import _http, pubs
+    conn = FakeConnection(response=FakeHTTPResponse(
+        gzip.compress(b"<xml/>"), headers={"Content-Encoding": "gzip"}))
+    _http.drop_connection(pubs._EUTILS_URL.netloc)
+    with patch("htan._http._new_connection", return_value=conn):
+        assert pubs._send("/a", 5)[3] == b"<xml/>"
+    _http.drop_connection(pubs._EUTILS_URL.netloc)
+    method, body, headers = conn.sent
+    assert method == "GET" and body is None
+    assert headers["Accept-Encoding"] == "gzip"
+
+
+def test_send_posts_form_body():
+    from htan import pubs
+    with patch("htan._http.request", return_value=(200, "OK", {}, b"ok")) as mock_req:
+        pubs._send("/a", 5, body=b"id=1")
+    method, netloc, path, body, headers, timeout = mock_req.call_args[0]
+    assert (method, netloc, path, body) == ("POST", "eutils.ncbi.nlm.nih.gov", "/a", b"id=1")
+    assert headers["Content-Type"] == "application/x-www-form-urlencoded"
+
+
+def test_eutils_request_posts_long_id_lists():
+    from htan import pubs
+    ids = ",".join(str(30000000 + i) for i in range(pubs.EFETCH_BATCH_SIZE))
+    with patch("htan.pubs._send", return_value=(200, "OK", {}, b"ok")) as mock_send, \
+         patch("htan.pubs.time.sleep"):
+        eutils_request("efetch.fcgi", {"db": "pubmed", "id": ids})
+    path, _, body = mock_send.call_args[0]
+    assert path == "/entrez/eutils/efetch.fcgi"
+    assert b"id=30000000%2C30000001" in body
+    assert b"tool=htan_skill" in body
+
+
+def test_eutils_request_short_query_uses_get():
+    with patch("htan.pubs._send", return_value=(200, "OK", {}, b"ok")) as mock_send, \
+         patch("htan.pubs.time.sleep"):
+        eutils_request("efetch.fcgi", {"db": "pubmed", "id": "1,2"})
+    path, _, body = mock_send.call_args[0]
+    assert "id=1%2C2" in path
+    assert body is None
 
 
 # ===========================================================================
@@ -292,3 +399,192 @@ def test_format_article_text_no_abstract():
     }
     text = format_article_text(article)
     assert "Abstract" not in text
+
+
+def test_fetch_batches_run_concurrently_in_order():
+    import threading
+    import time as _time
+    from htan import pubs
+
+    pmids = [str(i) for i in range(pubs.EFETCH_BATCH_SIZE * 3)]
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_eutils(endpoint, params, timeout=60):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        _time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        first = params["id"].split(",")[0]
+        return (f"<PubmedArticleSet><PubmedArticle><MedlineCitation><PMID>{first}</PMID>"
+                "<Article><ArticleTitle>t</ArticleTitle></Article></MedlineCitation>"
+                "</PubmedArticle></PubmedArticleSet>")
+
+    with patch("htan.pubs.eutils_request", side_effect=fake_eutils):
+        articles = fetch(pmids)
+    assert [a["pmid"] for a in articles] == ["0", "200", "400"]
+    assert active["max"] > 1
+
+
+def test_fetch_concurrency_bounded_by_max_requests():
+    import threading
+    import time as _time
+    from htan import pubs
+
+    pmids = [str(i) for i in range(pubs.EFETCH_BATCH_SIZE * (pubs.MAX_CONCURRENT_REQUESTS + 2))]
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_eutils(endpoint, params, timeout=60):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        _time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return "<PubmedArticleSet></PubmedArticleSet>"
+
+    with patch("htan.pubs.eutils_request", side_effect=fake_eutils) as mock_req:
+        assert fetch(pmids) == []
+    assert mock_req.call_count == pubs.MAX_CONCURRENT_REQUESTS + 2
+    assert active["max"] <= pubs.MAX_CONCURRENT_REQUESTS
+
+
+def _fake_efetch(endpoint, params, timeout=60):
+    first = params["id"].split(",")[0]
+    return (f"<PubmedArticleSet><PubmedArticle><MedlineCitation><PMID>{first}</PMID>"
+            "<Article><ArticleTitle>t</ArticleTitle></Article></MedlineCitation>"
+            "</PubmedArticle></PubmedArticleSet>")
+
+
+def test_fetch_parses_on_threads_by_default():
+    from htan import pubs
+
+    pmids = [str(i) for i in range(pubs.EFETCH_BATCH_SIZE * 10)]
+    with patch("htan.pubs.eutils_request", side_effect=_fake_efetch), \
+            patch("htan.pubs.ProcessPoolExecutor", side_effect=AssertionError("spawned processes")):
+        articles = fetch(pmids)
+    assert [a["pmid"] for a in articles] == [str(i * 200) for i in range(10)]
+
+
+def test_fetch_parses_in_capped_process_pool():
+    from htan import pubs
+
+    sizes = []
+    real_pool = pubs.ProcessPoolExecutor
+
+    def pool(max_workers, **kwargs):
+        sizes.append(max_workers)
+        return real_pool(max_workers=max_workers, **kwargs)
+
+    pmids = [str(i) for i in range(pubs.EFETCH_BATCH_SIZE * 3)]
+    with patch("htan.pubs.eutils_request", side_effect=_fake_efetch), \
+            patch("htan.pubs.ProcessPoolExecutor", side_effect=pool), \
+            patch("htan.pubs._fetch_batch", side_effect=AssertionError("parsed in-thread")):
+        articles = fetch(pmids, processes=50)
+    assert [a["pmid"] for a in articles] == ["0", "200", "400"]
+    assert sizes == [min(pubs.MAX_PARSE_PROCESSES, 3)]
+
+
+_UNGUARDED_SCRIPT = """
+from unittest.mock import patch
+from htan import pubs
+
+def fake(endpoint, params, timeout=60):
+    first = params["id"].split(",")[0]
+    return ("<PubmedArticleSet><PubmedArticle><MedlineCitation><PMID>" + first + "</PMID>"
+            "<Article><ArticleTitle>t</ArticleTitle></Article></MedlineCitation>"
+            "</PubmedArticle></PubmedArticleSet>")
+
+with patch("htan.pubs.eutils_request", side_effect=fake):
+    articles = pubs.fetch([str(i) for i in range(pubs.EFETCH_BATCH_SIZE * 9)]{extra})
+print(",".join(a["pmid"] for a in articles))
+"""
+
+
+def _run_script(tmp_path, source):
+    import os
+    import subprocess
+    import sys
+    import htan
+
+    script = tmp_path / "script.py"
+    script.write_text(source)
+    src = os.path.dirname(os.path.dirname(htan.__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, str(script)], cwd=tmp_path, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_fetch_from_unguarded_script(tmp_path):
+    out = _run_script(tmp_path, _UNGUARDED_SCRIPT.format(extra=""))
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == ",".join(str(i * 200) for i in range(9))
+
+
+def test_fetch_processes_from_guarded_script(tmp_path):
+    body = _UNGUARDED_SCRIPT.format(extra=", processes=2").strip().splitlines()
+    # Only the module-level work needs the guard; the spawned parsers re-import this file
+    split = body.index("with patch(\"htan.pubs.eutils_request\", side_effect=fake):")
+    guarded = body[:split] + ['if __name__ == "__main__":'] + ["    " + line for line in body[split:]]
+    out = _run_script(tmp_path, "\n".join(guarded) + "\n")
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == ",".join(str(i * 200) for i in range(9))
+
+
+def test_text_leaf_and_mixed_content():
+    from htan import pubs
+    assert pubs._text(pubs.ET.fromstring(b"<T>plain</T>")) == "plain"
+    assert pubs._text(pubs.ET.fromstring(b"<T/>")) == ""
+    assert pubs._text(pubs.ET.fromstring(b"<T>a <i>b</i> c<sup>2</sup></T>")) == "a b c2"
+
+
+def test_parse_article_xml_single_pass_fields():
+    from htan import pubs
+    xml = (
+        "<PubmedArticle><MedlineCitation><PMID>42</PMID><Article>"
+        "<Journal><ISSN>1</ISSN><JournalIssue><PubDate><MedlineDate>2021 Jan-Feb</MedlineDate>"
+        "</PubDate></JournalIssue><Title>Cell</Title></Journal>"
+        "<ArticleTitle>An <i>in situ</i> atlas</ArticleTitle>"
+        "<Abstract><AbstractText Label=\"BACKGROUND\">Why.</AbstractText>"
+        "<CopyrightInformation>c</CopyrightInformation><AbstractText>How.</AbstractText></Abstract>"
+        "<AuthorList><Author><LastName>Doe</LastName><Initials>J</Initials></Author>"
+        "<Author><CollectiveName>HTAN</CollectiveName></Author></AuthorList>"
+        "</Article></MedlineCitation><PubmedData><ArticleIdList>"
+        "<ArticleId IdType=\"pubmed\">42</ArticleId><ArticleId IdType=\"doi\">10.1/x</ArticleId>"
+        "</ArticleIdList></PubmedData></PubmedArticle>"
+    )
+    article = pubs._parse_article_xml(pubs.ET.fromstring(xml.encode()))
+    assert article == {
+        "pmid": "42", "title": "An in situ atlas", "authors": ["Doe J"],
+        "journal": "Cell", "year": "2021", "doi": "10.1/x",
+        "abstract": "BACKGROUND: Why.\nHow.",
+    }
+
+
+def test_fetch_handles_encoding_declaration_and_unicode():
+    xml = ('<?xml version="1.0" encoding="UTF-8"?>\n<PubmedArticleSet><PubmedArticle>'
+           "<MedlineCitation><PMID>1</PMID><Article>"
+           "<ArticleTitle>Tumour microenvironment — α-SMA</ArticleTitle>"
+           "</Article></MedlineCitation></PubmedArticle></PubmedArticleSet>")
+    with patch("htan.pubs.eutils_request", return_value=xml):
+        articles = fetch("1")
+    assert articles[0]["title"] == "Tumour microenvironment — α-SMA"
+
+
+def test_iter_articles_clears_parsed_elements():
+    from htan import pubs
+    cleared = []
+    real_parse = pubs._parse_article_xml
+
+    def spy(elem):
+        result = real_parse(elem)
+        cleared.append(elem)
+        return result
+
+    with patch("htan.pubs._parse_article_xml", side_effect=spy):
+        pmids = [a["pmid"] for a in pubs._iter_articles(MOCK_EFETCH_XML.encode())]
+    assert pmids == ["12345678", "87654321"]
+    assert all(len(elem) == 0 for elem in cleared)
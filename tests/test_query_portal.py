@@ -6,6 +6,7 @@ from htan.query.portal import (
     validate_sql_safety,
     validate_table_name,
     escape_sql_string,
+    array_param,
     ensure_limit,
     build_where_clauses,
     FILES_ARRAY_COLUMNS,
@@ -24,6 +25,10 @@ def test_normalize_sql_replaces_escaped_ne():
     assert "<>" in normalize_sql("SELECT * FROM t WHERE x \\!= 1")
 
 
+def test_normalize_sql_replaces_all_ne_forms():
+    assert normalize_sql("a \\!= 1 AND b != 2") == "a <> 1 AND b <> 2"
+
+
 def test_normalize_sql_preserves_valid():
     sql = "SELECT * FROM t WHERE x <> 1"
     assert normalize_sql(sql) == sql
@@ -82,6 +87,17 @@ def test_reject_unknown_start():
     assert safe is False
 
 
+def test_unsafe_keyword_any_case_reports_uppercase():
+    safe, reason = validate_sql_safety("select 1;\n\tdrop table files")
+    assert safe is False
+    assert reason == "Blocked SQL keyword: DROP"
+
+
+def test_safe_lowercase_leading_whitespace():
+    safe, reason = validate_sql_safety("\n  select count() from files")
+    assert safe is True
+
+
 # --- validate_table_name ---
 
 def test_valid_table_name():
@@ -114,6 +130,16 @@ def test_escape_backslash():
     assert "\\\\" in escape_sql_string("path\\to")
 
 
+# --- array_param ---
+
+def test_array_param_formats_literal():
+    assert array_param(["a", "b"]) == "['a','b']"
+
+
+def test_array_param_escapes_quotes():
+    assert array_param(["O'Brien"]) == "['O\\'Brien']"
+
+
 # --- ensure_limit ---
 
 def test_adds_limit_when_missing():
@@ -127,6 +153,16 @@ def test_preserves_existing_limit():
     assert result == sql
 
 
+def test_preserves_lowercase_multiline_limit():
+    sql = "select *\nfrom files\nlimit\n 5"
+    assert ensure_limit(sql, limit=100) == sql
+
+
+def test_limit_inside_identifier_not_counted():
+    result = ensure_limit("SELECT rate_limit FROM files", limit=100)
+    assert result.endswith("LIMIT 100")
+
+
 def test_strips_trailing_semicolon():
     result = ensure_limit("SELECT * FROM files;", limit=100)
     assert "LIMIT 100" in result